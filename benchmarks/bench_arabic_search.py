@@ -0,0 +1,72 @@
+"""
+Benchmark building and querying the Arabic search indexes over all 6236 ayahs.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_arabic_search [path/to/corpus.db]
+
+With a corpus database that has quran-uthmani installed (see
+``python -m src.corpus_store install``) the real Uthmani text is used;
+otherwise synthetic vowelled text from the stub server is indexed, which
+has a much smaller vocabulary.
+"""
+
+import statistics
+import sys
+import time
+
+from benchmarks.stub_server import _ayah
+from src.corpus_store import CorpusStore
+from src.search_index import NGramIndex, SearchIndex
+from src.verse_keys import TOTAL_VERSES
+
+QUERIES = ("ٱلرَّحْمَٰنِ ٱلرَّحِيمِ", "الرحمن الرحيم", "رب العالمين", "قل هو الله احد",
+           "الصلوة", "يوم الدين", "الله")
+
+
+def _load_texts(db_path):
+    """Get (verse, text) pairs from a corpus database or the stub generator."""
+    if db_path is not None:
+        texts = CorpusStore(db_path).get_texts("quran-uthmani")
+        if texts:
+            print(f"Indexing quran-uthmani from {db_path}")
+            return texts
+        print(f"quran-uthmani is not installed in {db_path}; using synthetic text")
+
+    return [(number, _ayah(number, "quran-uthmani", include_surah=False)["text"])
+            for number in range(1, TOTAL_VERSES + 1)]
+
+
+def _time_queries(label, search, repeat=20):
+    """Print the median latency of each query."""
+    for query in QUERIES:
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = search(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+        print(f"{label:<10} {query:<22} median {statistics.median(latencies):7.2f} ms   "
+              f"{len(results):3d} results")
+
+
+def run(db_path=None):
+    """Run the benchmark."""
+    texts = _load_texts(db_path)
+
+    start = time.perf_counter()
+    token_index = SearchIndex()
+    token_index.add_texts("quran-uthmani", texts)
+    print(f"Token index built in {time.perf_counter() - start:.2f} s: {token_index.stats()['terms']} terms")
+
+    start = time.perf_counter()
+    ngram_index = NGramIndex()
+    ngram_index.add_texts(texts)
+    print(f"N-gram index built in {time.perf_counter() - start:.2f} s: {ngram_index.stats()['ngrams']} n-grams")
+
+    _time_queries("bm25", token_index.search)
+    _time_queries("substring", ngram_index.find)
+    _time_queries("fuzzy", ngram_index.search)
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else None)
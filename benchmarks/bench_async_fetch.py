@@ -0,0 +1,61 @@
+"""
+Benchmark serial versus concurrent bulk verse fetching.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_async_fetch
+
+Both runs fetch the same verses from a local stub server that adds a
+fixed delay per request. The rate limiter is configured generously so the
+comparison measures request overlap rather than the politeness limit
+used against the real API.
+"""
+
+import asyncio
+import random
+import time
+
+from benchmarks.stub_server import StubServer
+from src.api_service import APIService
+from src.async_api_service import AsyncAPIService
+from src.http_transport import HTTPTransport
+from src.rate_limiter import TokenBucketRateLimiter
+
+EDITIONS = "quran-uthmani,en.asad"
+
+
+def _make_service(base_url, concurrency):
+    """Create an API service suited to the stub server."""
+    api = APIService(
+        transport=HTTPTransport(pool_size=concurrency),
+        rate_limiter=TokenBucketRateLimiter(rate=1000.0, burst=concurrency)
+    )
+    api.BASE_URL = base_url
+    return api
+
+
+def run(verses=200, concurrency=16, latency=0.02):
+    """Run the benchmark."""
+    references = random.sample(range(1, APIService.TOTAL_VERSES + 1), verses)
+
+    with StubServer(latency=latency) as server:
+        api = _make_service(server.base_url, concurrency)
+        start = time.perf_counter()
+        results = [api.get_specific_verse(reference, EDITIONS) for reference in references]
+        serial = time.perf_counter() - start
+        assert all(results)
+        print(f"serial              {serial:6.2f} s   {verses / serial:7.1f} verses/s")
+
+        api = _make_service(server.base_url, concurrency)
+        async_api = AsyncAPIService(api, max_concurrency=concurrency)
+        start = time.perf_counter()
+        results = asyncio.run(async_api.get_verses(references, EDITIONS))
+        concurrent = time.perf_counter() - start
+        assert all(results)
+        async_api.close()
+        print(f"concurrent (x{concurrency:<2})   {concurrent:6.2f} s   "
+              f"{verses / concurrent:7.1f} verses/s   speed-up {serial / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,75 @@
+"""
+Benchmark verse lookups served by the offline corpus against the HTTP path.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_corpus_store
+
+The HTTP path talks to a local stub server, so the numbers exclude real
+network latency and the 1 second rate limit; they are a lower bound for
+what an API round-trip costs.
+"""
+
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.stub_server import StubServer
+from src.api_service import APIService
+from src.corpus_store import CorpusStore
+
+EDITIONS = "quran-uthmani,en.asad"
+
+
+def _time_lookups(lookup, references):
+    """Time each lookup and return the latencies in microseconds."""
+    latencies = []
+    for reference in references:
+        start = time.perf_counter()
+        result = lookup(reference)
+        latencies.append((time.perf_counter() - start) * 1e6)
+        assert result, f"lookup of {reference} failed"
+    return latencies
+
+
+def _report(label, latencies):
+    """Print summary statistics for a set of latencies."""
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<22} median {statistics.median(latencies):10.1f} us   "
+          f"p95 {p95:10.1f} us   n={len(latencies)}")
+
+
+def run(samples=500):
+    """Run the benchmark."""
+    references = [random.randint(1, APIService.TOTAL_VERSES) for _ in range(samples)]
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as directory:
+        api = APIService(corpus_store=CorpusStore(os.path.join(directory, "corpus.db")))
+        api.BASE_URL = server.base_url
+        # Measure the transport itself, not the politeness delay
+        api._rate_limit = lambda deadline=None: True
+
+        start = time.perf_counter()
+        for identifier in EDITIONS.split(","):
+            assert api.install_edition(identifier)
+        print(f"Installed {EDITIONS} in {time.perf_counter() - start:.2f} s")
+
+        _report("offline corpus", _time_lookups(
+            lambda reference: api.get_specific_verse(reference, EDITIONS), references))
+
+        http_api = APIService()
+        http_api.BASE_URL = server.base_url
+        http_api._rate_limit = lambda deadline=None: True
+
+        def fetch_uncached(reference):
+            http_api.clear_cache()
+            return http_api.get_specific_verse(reference, EDITIONS)
+
+        _report("HTTP (no cache)", _time_lookups(fetch_uncached, references[:100]))
+
+
+if __name__ == "__main__":
+    run()
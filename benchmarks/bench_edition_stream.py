@@ -0,0 +1,85 @@
+"""
+Benchmark the memory used to install a complete edition.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_edition_stream
+
+A /quran/{edition} response is installed twice per edition size: once
+buffered (``response.json()`` and CorpusStore.add_edition, as before) and
+once streamed (APIService.install_edition). Peak Python memory is measured
+with tracemalloc; SQLite's own page cache is not included. The stub server
+runs in a separate process so its allocations are not traced.
+"""
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import requests
+
+from benchmarks.stub_server import StubServer
+from src.api_service import APIService
+from src.corpus_store import CorpusStore
+
+SCALES = (1, 4, 16)
+
+
+def _serve(queue, text_scale):
+    """Run the stub server until the process is terminated."""
+    with StubServer(text_scale=text_scale) as server:
+        queue.put(server.base_url)
+        threading.Event().wait()
+
+
+def _install_buffered(api, identifier):
+    """Install an edition the way it was done before streaming."""
+    data = api._request(f"/quran/{identifier}", f"edition {identifier}")
+    return api.corpus_store.add_edition(data["edition"], data["surahs"]) > 0
+
+
+def _measure(install, base_url, directory):
+    """Install an edition into a fresh store and return (seconds, peak bytes)."""
+    api = APIService(corpus_store=CorpusStore(os.path.join(directory, f"{time.perf_counter_ns()}.db")))
+    api.BASE_URL = base_url
+    api._rate_limit = lambda deadline=None: True
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    assert install(api, "en.asad")
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    api.corpus_store.close()
+    return seconds, peak
+
+
+def run():
+    """Run the benchmark."""
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in SCALES:
+            queue = context.Queue()
+            server = context.Process(target=_serve, args=(queue, scale), daemon=True)
+            server.start()
+            try:
+                base_url = queue.get(timeout=30)
+                size = len(requests.get(f"{base_url}/quran/en.asad",
+                                        headers={"Accept-Encoding": "identity"}).content)
+                print(f"response {size / 1e6:.1f} MB")
+                for label, install in (("buffered", _install_buffered),
+                                       ("streamed", APIService.install_edition)):
+                    seconds, peak = _measure(install, base_url, directory)
+                    print(f"  {label:<9} {seconds * 1000:7.0f} ms   peak {peak / 1e6:6.1f} MB")
+            finally:
+                server.terminate()
+                server.join()
+
+
+if __name__ == "__main__":
+    run()
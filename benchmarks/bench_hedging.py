@@ -0,0 +1,61 @@
+"""
+Benchmark hedged requests against a stub API with a slow tail.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_hedging
+
+The stub server answers most requests in a few milliseconds but stalls a
+small share of them. Without hedging those stalls set the p99 latency;
+with hedging a duplicate is sent once a request exceeds the observed p95
+and the first answer is used.
+"""
+
+import random
+import time
+
+from benchmarks.stub_server import StubServer
+from src.api_service import APIService
+from src.rate_limiter import TokenBucketRateLimiter
+from src.verse_cache import VerseCache
+
+EDITIONS = "quran-uthmani,en.asad"
+
+
+def _fetch_all(base_url, references, hedge_requests):
+    """Fetch every reference with a fresh cache and return latencies and stats."""
+    api = APIService(
+        cache=VerseCache(),
+        rate_limiter=TokenBucketRateLimiter(rate=1000.0, burst=100),
+        hedge_requests=hedge_requests
+    )
+    api.BASE_URL = base_url
+
+    latencies = []
+    for reference in references:
+        start = time.perf_counter()
+        assert api.get_specific_verse(reference, EDITIONS) is not None
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return latencies, api.get_latency_stats()
+
+
+def run(samples=400, slow_rate=0.03, slow_latency=0.3):
+    """Run the benchmark."""
+    references = random.sample(range(1, APIService.TOTAL_VERSES + 1), samples)
+
+    with StubServer(latency=0.003, slow_rate=slow_rate, slow_latency=slow_latency) as server:
+        for label, hedge_requests in (("no hedging", False), ("hedged", True)):
+            latencies, stats = _fetch_all(server.base_url, references, hedge_requests)
+
+            def pick(fraction):
+                return latencies[int(fraction * (len(latencies) - 1))]
+
+            print(f"{label:<11} p50 {pick(0.5):6.1f} ms   p95 {pick(0.95):6.1f} ms   "
+                  f"p99 {pick(0.99):6.1f} ms   max {latencies[-1]:6.1f} ms   "
+                  f"{stats['hedges']:3d} hedges, {stats['hedge_wins']:3d} won")
+
+
+if __name__ == "__main__":
+    run()
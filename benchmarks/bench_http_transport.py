@@ -0,0 +1,57 @@
+"""
+Benchmark the pooled keep-alive transport against per-call requests.get.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_http_transport
+
+Both paths fetch the same verses from a local stub server with a small
+simulated server delay; the difference is the connection setup that the
+pooled session avoids.
+"""
+
+import random
+import time
+
+import requests
+
+from benchmarks.stub_server import StubServer
+from src.http_transport import HTTPTransport
+
+EDITIONS = "quran-uthmani,en.asad"
+
+
+def _fetch_all(get, base_url, references):
+    """Fetch every reference and return the mean latency in milliseconds."""
+    start = time.perf_counter()
+    for reference in references:
+        response = get(f"{base_url}/ayah/{reference}/editions/{EDITIONS}")
+        assert response.status_code == 200
+        response.json()
+    return (time.perf_counter() - start) * 1000 / len(references)
+
+
+def run(samples=300):
+    """Run the benchmark."""
+    references = [random.randint(1, 6236) for _ in range(samples)]
+
+    with StubServer(latency=0.002) as server:
+        per_call = _fetch_all(
+            lambda url: requests.get(url, headers={"Connection": "close"}),
+            server.base_url, references)
+        print(f"requests.get per call   {per_call:7.3f} ms/request   {samples} connections")
+
+        transport = HTTPTransport()
+        pooled = _fetch_all(transport.get, server.base_url, references)
+        stats = transport.stats()
+        print(f"pooled keep-alive       {pooled:7.3f} ms/request   "
+              f"{stats['connections_opened']} connections")
+        print(f"transport counters      avg {stats['average_time'] * 1000:.3f} ms, "
+              f"max {stats['max_time'] * 1000:.3f} ms, "
+              f"{stats['bytes_received'] / stats['requests']:.0f} bytes/request (gzip)")
+        print(f"saved per request       {per_call - pooled:7.3f} ms")
+        transport.close()
+
+
+if __name__ == "__main__":
+    run()
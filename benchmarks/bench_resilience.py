@@ -0,0 +1,58 @@
+"""
+Benchmark verse fetching from a flaky API with and without retries.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_resilience
+
+The stub server answers a share of requests with 503. Without retries
+each of those becomes a "Failed to retrieve verse" in the UI; with the
+default policy they are retried after a short jittered backoff.
+"""
+
+import random
+import time
+
+from benchmarks.stub_server import StubServer
+from src.api_service import APIService
+from src.resilience import CircuitBreaker, RetryPolicy
+from src.verse_cache import VerseCache
+
+EDITIONS = "quran-uthmani,en.asad"
+
+
+def _fetch_all(base_url, references, max_attempts):
+    """Fetch every reference with a fresh cache and report successes and latency."""
+    api = APIService(
+        cache=VerseCache(),
+        retry_policy=RetryPolicy(max_attempts=max_attempts, base_delay=0.05),
+        # Keep the breaker out of the way; this measures retries alone
+        breaker_factory=lambda: CircuitBreaker(failure_threshold=1000)
+    )
+    api.BASE_URL = base_url
+    api._rate_limit = lambda deadline=None: True
+
+    latencies = []
+    succeeded = 0
+    for reference in references:
+        start = time.perf_counter()
+        succeeded += api.get_specific_verse(reference, EDITIONS) is not None
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000
+    return succeeded, p95, api.get_resilience_stats()["retries"]
+
+
+def run(samples=200, failure_rate=0.2):
+    """Run the benchmark."""
+    references = random.sample(range(1, APIService.TOTAL_VERSES + 1), samples)
+
+    with StubServer(latency=0.005, failure_rate=failure_rate) as server:
+        for label, attempts in (("no retries", 1), ("3 attempts", 3)):
+            succeeded, p95, retries = _fetch_all(server.base_url, references, attempts)
+            print(f"{label:<11} {succeeded:4d}/{samples} verses   p95 {p95:7.1f} ms   {retries:4d} retries")
+
+
+if __name__ == "__main__":
+    run()
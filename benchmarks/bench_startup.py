@@ -0,0 +1,63 @@
+"""
+Benchmark application start-up with a cold and a warm persistent cache.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup
+
+A "start-up" loads the editions catalog and re-opens the verses the user
+saw in the previous session. The cold run starts with an empty data
+directory; the warm run re-creates the service on the same directory, as
+a restarted application would. The stale run does the same a day later,
+when the cached catalog has to be revalidated with the server.
+"""
+
+import random
+import tempfile
+import time
+
+from benchmarks.stub_server import StubServer
+from src.api_service import APIService
+
+EDITIONS = "quran-uthmani,en.asad"
+
+
+def _start(config, base_url, references, stale=False):
+    """Create a service and perform the start-up requests."""
+    start = time.perf_counter()
+    api = APIService.from_config(config)
+    api.BASE_URL = base_url
+    if stale:
+        api.EDITIONS_TTL = 0
+    # Each network request normally costs up to 1s of rate limiting; count them instead
+    api._rate_limit = lambda deadline=None: True
+
+    assert api.get_available_editions()
+    for reference in references:
+        assert api.get_specific_verse(reference, EDITIONS)
+
+    elapsed = time.perf_counter() - start
+    # A stale catalog is revalidated in the background; count that request too
+    api.wait_for_refreshes()
+    requests_sent = api.transport.stats()["requests"]
+    bytes_saved = api.get_revalidation_stats()["bytes_saved"]
+    api.cache.backing.close()
+    return elapsed, requests_sent, bytes_saved
+
+
+def run(verses=50):
+    """Run the benchmark."""
+    references = [random.randint(1, APIService.TOTAL_VERSES) for _ in range(verses)]
+
+    with StubServer(latency=0.02) as server, tempfile.TemporaryDirectory() as directory:
+        config = {"dataDirectory": directory}
+
+        for label, stale in (("cold start", False), ("warm start", False), ("stale start", True)):
+            elapsed, requests_sent, bytes_saved = _start(config, server.base_url, references, stale)
+            print(f"{label:<12} {elapsed * 1000:8.1f} ms   {requests_sent:3d} network requests "
+                  f"(up to {requests_sent:d} s of rate limiting in the app), "
+                  f"{bytes_saved} bytes saved by revalidation")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,102 @@
+"""
+Benchmark importing Tanzil files into the offline corpus.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_tanzil_import [quran-uthmani.xml ...]
+
+Without arguments, synthetic XML and text files with every ayah are
+generated. Each file is imported into a fresh store, once on its own and
+once while filling the search indexes. Peak Python memory is measured with
+tracemalloc and compared with parsing the whole XML tree at once.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from benchmarks.stub_server import LOCATIONS, _ayah
+from src.api_service import APIService
+from src.corpus_store import CorpusStore
+from src.search_index import NGramIndex, SearchIndex
+from src.tanzil_importer import import_edition, make_edition
+
+
+def _write_synthetic(directory):
+    """Write synthetic Tanzil XML and text files and return their paths."""
+    xml_path = os.path.join(directory, "quran-synthetic.xml")
+    text_path = os.path.join(directory, "quran-synthetic.txt")
+
+    with open(xml_path, "w", encoding="utf-8") as xml_file, \
+            open(text_path, "w", encoding="utf-8") as text_file:
+        xml_file.write('<?xml version="1.0" encoding="utf-8" ?>\n<quran>\n')
+        for number in range(1, APIService.TOTAL_VERSES + 1):
+            surah, ayah = LOCATIONS[number]
+            text = _ayah(number, "quran-uthmani", include_surah=False)["text"]
+            if ayah == 1:
+                if surah > 1:
+                    xml_file.write("</sura>\n")
+                xml_file.write(f'<sura index="{surah}" name="سورة {surah}">\n')
+            xml_file.write(f'<aya index="{ayah}" text="{text}" />\n')
+            text_file.write(f"{surah}|{ayah}|{text}\n")
+        xml_file.write("</sura>\n</quran>\n")
+
+    return [xml_path, text_path]
+
+
+def _measure(func):
+    """
+    Run a function twice: once timed, once with tracemalloc running.
+
+    Returns:
+        tuple: The result, the untraced duration and the peak traced memory.
+    """
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def _import(path, directory, indexed):
+    """Import one file into a fresh store."""
+    store = CorpusStore(os.path.join(directory, f"corpus-{time.perf_counter_ns()}.db"))
+    try:
+        if indexed:
+            return import_edition(store, path, make_edition("quran-uthmani"),
+                                  search_index=SearchIndex(), arabic_index=NGramIndex())
+        return import_edition(store, path, make_edition("quran-uthmani"))
+    finally:
+        store.close()
+
+
+def run(paths=None):
+    """Run the benchmark."""
+    with tempfile.TemporaryDirectory() as directory:
+        paths = paths or _write_synthetic(directory)
+
+        for path in paths:
+            megabytes = os.path.getsize(path) / 1e6
+            print(f"{os.path.basename(path)} ({megabytes:.1f} MB)")
+
+            for label, indexed in (("import", False), ("import + indexes", True)):
+                count, seconds, peak = _measure(lambda: _import(path, directory, indexed))
+                assert count == APIService.TOTAL_VERSES
+                print(f"  {label:<18} {seconds * 1000:8.0f} ms   {count / seconds:9.0f} ayahs/s   "
+                      f"{megabytes / seconds:6.1f} MB/s   peak {peak / 1e6:6.1f} MB")
+
+            if path.lower().endswith(".xml"):
+                _, seconds, peak = _measure(lambda: ET.parse(path))
+                print(f"  {'ET.parse (tree)':<18} {seconds * 1000:8.0f} ms   {'':27}"
+                      f"peak {peak / 1e6:6.1f} MB")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:])
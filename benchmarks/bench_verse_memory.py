@@ -0,0 +1,81 @@
+"""
+Benchmark the memory held by formatted verses.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_verse_memory
+
+Formats every ayah twice with tracemalloc running: once into the nested
+dicts VerseManager used to build, and once into slotted Verse objects.
+The API entries themselves are built beforehand, so only the memory owned
+by the formatted verses is counted (the text strings are shared with the
+entries in both cases).
+"""
+
+import gc
+import tracemalloc
+
+from benchmarks.stub_server import _ayah
+from src.verse import Verse
+from src.verse_keys import TOTAL_VERSES
+
+
+def format_as_dict(verse_data):
+    """The nested dict layout formatted verses had before Verse."""
+    formatted_verse = {
+        "number": None,
+        "surah": {"number": None, "name": None, "englishName": None},
+        "text": {"arabic": None, "translation": None},
+        "audio": {"url": None},
+        "reference": None
+    }
+
+    for entry in verse_data:
+        identifier = entry.get("edition", {}).get("identifier")
+
+        if identifier == "quran-uthmani":
+            formatted_verse["text"]["arabic"] = entry.get("text")
+            surah = entry.get("surah", {})
+            formatted_verse["surah"]["number"] = surah.get("number")
+            formatted_verse["surah"]["name"] = surah.get("name")
+            formatted_verse["surah"]["englishName"] = surah.get("englishName")
+            formatted_verse["reference"] = f"{surah.get('number')}:{entry.get('numberInSurah')}"
+            formatted_verse["number"] = entry.get("number")
+        elif identifier:
+            formatted_verse["text"]["translation"] = entry.get("text")
+
+        if entry.get("audio"):
+            formatted_verse["audio"]["url"] = entry["audio"]
+
+    return formatted_verse
+
+
+def _measure(label, formatter, verse_data):
+    """Print the memory retained by formatting every verse."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    verses = [formatter(entries) for entries in verse_data]
+
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print(f"{label:<14} {retained / 1024:9.1f} KiB total   "
+          f"{retained / len(verses):6.1f} bytes per verse")
+    return retained
+
+
+def run():
+    """Run the benchmark."""
+    verse_data = [[_ayah(number, "quran-uthmani"), _ayah(number, "en.asad")]
+                  for number in range(1, TOTAL_VERSES + 1)]
+
+    legacy = _measure("nested dicts", format_as_dict, verse_data)
+    compact = _measure("Verse", Verse.from_api, verse_data)
+    print(f"Verse objects use {compact / legacy:.0%} of the nested dict memory")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,245 @@
+"""
+Local stand-in for the AlQuran.cloud API used by the benchmarks.
+
+The server generates deterministic synthetic verses so benchmarks can run
+without network access and without depending on the real API's latency.
+"""
+
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.verse_keys import SURAH_LENGTHS
+
+ARABIC_WORDS = ("بِسْمِ", "ٱللَّهِ", "ٱلرَّحْمَٰنِ", "ٱلرَّحِيمِ", "ٱلْحَمْدُ", "لِلَّهِ",
+                "رَبِّ", "ٱلْعَٰلَمِينَ", "مَٰلِكِ", "يَوْمِ", "ٱلدِّينِ", "إِيَّاكَ")
+ENGLISH_WORDS = ("mercy", "guidance", "patience", "light", "truth", "heavens",
+                 "earth", "signs", "remember", "grateful", "believers", "path")
+
+
+def _edition(identifier):
+    """Build the metadata of a synthetic edition."""
+    arabic = identifier.startswith("quran-")
+    return {
+        "identifier": identifier,
+        "language": "ar" if arabic else identifier.split(".")[0],
+        "name": identifier,
+        "englishName": identifier.title(),
+        "format": "text",
+        "type": "quran" if arabic else "translation",
+        "direction": "rtl" if arabic else "ltr",
+    }
+
+
+def _surah(number):
+    """Build the metadata of a surah."""
+    return {
+        "number": number,
+        "name": f"سورة {number}",
+        "englishName": f"Surah-{number}",
+        "englishNameTranslation": f"Chapter {number}",
+        "numberOfAyahs": SURAH_LENGTHS[number - 1],
+        "revelationType": "Meccan" if number % 2 else "Medinan",
+    }
+
+
+def _verse_location():
+    """Map every global ayah number to its (surah, ayah) pair."""
+    locations = [None]
+    for surah, length in enumerate(SURAH_LENGTHS, start=1):
+        locations.extend((surah, ayah) for ayah in range(1, length + 1))
+    return locations
+
+
+LOCATIONS = _verse_location()
+
+
+def _ayah(number, identifier, include_surah=True):
+    """Build one ayah of an edition."""
+    surah, ayah = LOCATIONS[number]
+    words = ARABIC_WORDS if identifier.startswith("quran-") else ENGLISH_WORDS
+    text = " ".join(words[(number * 7 + i * 3) % len(words)] for i in range(6 + number % 9))
+    entry = {
+        "number": number,
+        "text": text,
+        "numberInSurah": ayah,
+        "juz": min(30, 1 + (number - 1) * 30 // 6236),
+        "manzil": min(7, 1 + (number - 1) * 7 // 6236),
+        "page": min(604, 1 + (number - 1) * 604 // 6236),
+        "ruku": min(556, 1 + (number - 1) * 556 // 6236),
+        "hizbQuarter": min(240, 1 + (number - 1) * 240 // 6236),
+        "sajda": False,
+    }
+    if include_surah:
+        entry["edition"] = _edition(identifier)
+        entry["surah"] = _surah(surah)
+    return entry
+
+
+def _resolve(reference):
+    """Resolve an ayah reference to its global number."""
+    if ":" in reference:
+        surah, ayah = (int(part) for part in reference.split(":"))
+        if not 1 <= surah <= 114 or not 1 <= ayah <= SURAH_LENGTHS[surah - 1]:
+            return None
+        return LOCATIONS.index((surah, ayah))
+    number = int(reference)
+    return number if 1 <= number <= 6236 else None
+
+
+class StubAPIHandler(BaseHTTPRequestHandler):
+    """Request handler answering a subset of the AlQuran.cloud routes."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0
+    failure_rate = 0.0
+    slow_rate = 0.0
+    slow_latency = 0.0
+    text_scale = 1
+
+    def log_message(self, format, *args):
+        """Silence per-request logging."""
+
+    def _send_json(self, code, payload):
+        """
+        Send a JSON response, gzipped if the client accepts it.
+
+        Responses carry an ETag; a request whose If-None-Match matches it is
+        answered with an empty 304 Not Modified.
+        """
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+
+        if code == 200 and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        headers = {"Content-Type": "application/json", "ETag": etag}
+
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+
+        self.send_response(code)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self, path):
+        """Build the response data for a path, or None if it is unknown."""
+        match = re.fullmatch(r"/v1/ayah/([\d:]+)/editions/([\w.,-]+)", path)
+        if match:
+            number = _resolve(match.group(1))
+            if number is None:
+                return None
+            return [_ayah(number, identifier) for identifier in match.group(2).split(",")]
+
+        match = re.fullmatch(r"/v1/surah/(\d+)/editions/([\w.,-]+)", path)
+        if match:
+            surah_number = int(match.group(1))
+            if not 1 <= surah_number <= 114:
+                return None
+            first = LOCATIONS.index((surah_number, 1))
+            surahs = []
+            for identifier in match.group(2).split(","):
+                surah = _surah(surah_number)
+                surah["ayahs"] = [_ayah(n, identifier, include_surah=False)
+                                  for n in range(first, first + SURAH_LENGTHS[surah_number - 1])]
+                surah["edition"] = _edition(identifier)
+                surahs.append(surah)
+            return surahs
+
+        match = re.fullmatch(r"/v1/page/(\d+)/([\w.-]+)", path)
+        if match:
+            page, identifier = int(match.group(1)), match.group(2)
+            ayahs = [_ayah(n, identifier) for n in range(1, 6237)
+                     if _ayah(n, identifier, include_surah=False)["page"] == page]
+            for ayah in ayahs:
+                del ayah["edition"]
+            return {"number": page, "ayahs": ayahs, "edition": _edition(identifier)}
+
+        match = re.fullmatch(r"/v1/quran/([\w.-]+)", path)
+        if match:
+            identifier = match.group(1)
+            surahs = []
+            number = 1
+            for surah_number, length in enumerate(SURAH_LENGTHS, start=1):
+                surah = _surah(surah_number)
+                surah["ayahs"] = [_ayah(n, identifier, include_surah=False)
+                                  for n in range(number, number + length)]
+                for ayah in surah["ayahs"]:
+                    ayah["text"] = " ".join([ayah["text"]] * self.text_scale)
+                number += length
+                surahs.append(surah)
+            return {"surahs": surahs, "edition": _edition(identifier)}
+
+        if path == "/v1/edition":
+            identifiers = ["quran-uthmani", "en.asad", "en.sahih", "en.pickthall",
+                           "fr.hamidullah", "de.aburida", "ur.jalandhry"]
+            return [_edition(identifier) for identifier in identifiers]
+
+        return None
+
+    def do_GET(self):
+        """Answer a GET request."""
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self.slow_rate and random.random() < self.slow_rate:
+            time.sleep(self.slow_latency)
+
+        if self.failure_rate and random.random() < self.failure_rate:
+            self._send_json(503, {"code": 503, "status": "Service Unavailable", "data": "Try again"})
+            return
+
+        data = self._route(self.path.split("?")[0])
+        if data is None:
+            self._send_json(404, {"code": 404, "status": "Not Found", "data": "Not found"})
+        else:
+            self._send_json(200, {"code": 200, "status": "OK", "data": data})
+
+
+class StubServer:
+    """
+    Run the stub API on a background thread.
+
+    Usage::
+
+        with StubServer(latency=0.02) as server:
+            api.BASE_URL = server.base_url
+    """
+
+    def __init__(self, latency=0.0, host="127.0.0.1", port=0, failure_rate=0.0,
+                 slow_rate=0.0, slow_latency=0.0, text_scale=1):
+        handler = type("Handler", (StubAPIHandler,),
+                       {"latency": latency, "failure_rate": failure_rate,
+                        "slow_rate": slow_rate, "slow_latency": slow_latency,
+                        "text_scale": text_scale})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        """The base URL of the stub API, equivalent to APIService.BASE_URL."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -4,10 +4,27 @@ API Service for Qur'anic Verse Application
 This module handles communication with the AlQuran.cloud API.
 """
 
-import random
-import requests
+import os
 import json
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+from src.corpus_store import CorpusStore
+from src.http_transport import HTTPTransport
+from src.json_stream import iter_json
+from src.latency_tracker import LatencyTracker
+from src.persistent_cache import PersistentCache
+from src.providers import AlQuranCloudProvider, LocalProvider, ProviderRouter, QuranComProvider
+from src.quran_metadata import QuranMetadata
+from src.rate_limiter import TokenBucketRateLimiter, parse_retry_after
+from src.resilience import CircuitBreaker, RetryPolicy
+from src.single_flight import SingleFlight
+from src.verse_cache import VerseCache
+from src.verse_keys import SURAH_LENGTHS, TOTAL_SURAHS, TOTAL_VERSES, parse_reference, verse_key
+from src.verse_sampler import VerseSampler
 
 class APIService:
     """
@@ -15,56 +32,440 @@ class APIService:
     """
     
     BASE_URL = "http://api.alquran.cloud/v1"
-    TOTAL_VERSES = 6236
+    TOTAL_VERSES = TOTAL_VERSES
+    TOTAL_SURAHS = TOTAL_SURAHS
+    TOTAL_PAGES = 604
+    DIVISION_COUNTS = {"juz": 30, "manzil": 7, "page": TOTAL_PAGES, "ruku": 556, "hizbQuarter": 240}
+    EDITIONS_TTL = 24 * 3600  # The editions catalog changes rarely but does change
+    META_TTL = 30 * 24 * 3600
+    CACHE_VERSION = 3  # Bumped when the cache key format changes
+    STREAM_CHUNK_SIZE = 64 * 1024
+    EDITION_AYAH_PATH = "data.surahs.item.ayahs.item"
     
-    def __init__(self):
-        """Initialize the API service."""
-        self.cache = {}
-        self.last_request_time = 0
+    def __init__(self, corpus_store=None, transport=None, cache=None, rate_limiter=None,
+                 sampler=None, retry_policy=None, breaker_factory=None, hedge_requests=True,
+                 providers=None):
+        """
+        Initialize the API service.
+        
+        Args:
+            corpus_store (CorpusStore, optional): Local store of installed editions.
+                                                  Verses in installed editions are
+                                                  served without network access.
+            transport (HTTPTransport, optional): Pooled HTTP session used for all
+                                                 requests. Defaults to a new one.
+            cache (VerseCache, optional): Bounded in-memory response cache,
+                                          optionally backed by a persistent tier.
+                                          Defaults to a new in-memory cache.
+            rate_limiter (TokenBucketRateLimiter, optional): Limiter shared by every
+                                                             caller of this service.
+                                                             Defaults to one request
+                                                             per second.
+            sampler (VerseSampler, optional): Source of random verse numbers.
+                                              Defaults to an unseeded shuffle
+                                              bag over the whole Quran.
+            retry_policy (RetryPolicy, optional): Retries of failed requests.
+                                                  Defaults to 3 attempts with
+                                                  jittered backoff.
+            breaker_factory (callable, optional): Creates the CircuitBreaker of
+                                                  each endpoint. Defaults to
+                                                  CircuitBreaker().
+            hedge_requests (bool): Whether a request slower than the endpoint's
+                                   p95 latency is duplicated, using whichever
+                                   copy answers first.
+            providers (list, optional): Additional VerseProvider instances to
+                                        route verse and surah requests to,
+                                        alongside AlQuran.cloud.
+        """
+        self.cache = cache if cache is not None else VerseCache()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else TokenBucketRateLimiter()
+        self.single_flight = SingleFlight()
+        self.corpus_store = corpus_store
+        self.transport = transport if transport is not None else HTTPTransport()
+        self.sampler = sampler if sampler is not None else VerseSampler()
+        
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._breaker_factory = breaker_factory if breaker_factory is not None else CircuitBreaker
+        self._breakers = {}
+        self._refreshes = {}
+        self.hedge_requests = hedge_requests
+        self._latency = {}
+        self._executor = None
+        self.router = ProviderRouter([AlQuranCloudProvider(self)] + list(providers or []))
+        
+        # Conditional request, fallback and tail latency counters
+        self._stats_lock = threading.Lock()
+        self.revalidations = 0
+        self.not_modified = 0
+        self.bytes_saved = 0
+        self.retries = 0
+        self.stale_served = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.deadlines_exceeded = 0
+    
+    @classmethod
+    def from_config(cls, config):
+        """
+        Create an API service wired to the local data configured by the user.
+        
+        Args:
+            config (dict): Application configuration.
+        
+        Returns:
+            APIService: The configured service.
+        """
+        data_directory = config.get("dataDirectory", "data")
+        transport = HTTPTransport(
+            pool_size=config.get("httpPoolSize", 4),
+            connect_timeout=config.get("httpConnectTimeout", 5.0),
+            read_timeout=config.get("httpReadTimeout", 15.0)
+        )
+        backing = None
+        if config.get("persistentCache", True):
+            backing = PersistentCache(
+                os.path.join(data_directory, "cache.db"),
+                ttl=config.get("cacheTTL", 30 * 24 * 3600),
+                version=cls.CACHE_VERSION
+            )
+        cache = VerseCache(
+            max_entries=config.get("cacheMaxEntries", 1000),
+            max_bytes=config.get("cacheMaxBytes", 8 * 1024 * 1024),
+            backing=backing
+        )
+        rate_limiter = TokenBucketRateLimiter(
+            rate=config.get("apiRateLimit", 1.0),
+            burst=config.get("apiBurst", 3)
+        )
+        sampler = VerseSampler(
+            seed=config.get("randomSeed"),
+            state_path=os.path.join(data_directory, "sampler.json")
+        )
+        retry_policy = RetryPolicy(
+            max_attempts=config.get("apiRetries", 3),
+            base_delay=config.get("apiRetryDelay", 0.5)
+        )
+        
+        def breaker_factory():
+            return CircuitBreaker(
+                failure_threshold=config.get("circuitFailureThreshold", 5),
+                reset_timeout=config.get("circuitResetTimeout", 30.0)
+            )
+        
+        corpus_store = CorpusStore(os.path.join(data_directory, "corpus.db"))
+        providers = []
+        for name in config.get("providers", ["alquran.cloud", "quran.com", "local"]):
+            if name == "quran.com":
+                providers.append(QuranComProvider(transport))
+            elif name == "local":
+                providers.append(LocalProvider(corpus_store))
+        
+        return cls(
+            corpus_store=corpus_store,
+            transport=transport,
+            cache=cache,
+            rate_limiter=rate_limiter,
+            sampler=sampler,
+            retry_policy=retry_policy,
+            breaker_factory=breaker_factory,
+            hedge_requests=config.get("hedgeRequests", True),
+            providers=providers
+        )
+        
+    def _rate_limit(self, deadline=None):
+        """
+        Wait for the shared rate limiter before sending a request.
+        
+        Args:
+            deadline (Deadline, optional): Time budget of the request.
+        
+        Returns:
+            bool: True once the request may be sent, False without waiting
+                  if the rate limit would hold it past the deadline.
+        """
+        max_wait = deadline.remaining() if deadline is not None else None
+        return self.rate_limiter.acquire(max_wait) is not None
+    
+    def _request(self, path, description, deadline=None):
+        """
+        Send a rate-limited GET request to the API.
+        
+        Concurrent requests for the same path share a single request.
+        
+        Args:
+            path (str): Path below BASE_URL, e.g. "/edition".
+            description (str): What is being fetched, used in error messages.
+            deadline (Deadline, optional): Time budget of the request.
+        
+        Returns:
+            The "data" member of the response, or None if an error occurred.
+        """
+        return self.single_flight.do(path, lambda: self._send(path, description, deadline))
+    
+    def _send(self, path, description, deadline=None):
+        """
+        Send one rate-limited GET request to the API.
+        
+        Args:
+            path (str): Path below BASE_URL, e.g. "/edition".
+            description (str): What is being fetched, used in error messages.
+            deadline (Deadline, optional): Time budget of the request.
+        
+        Returns:
+            The "data" member of the response, or None if an error occurred.
+        """
+        response = self._get_response(path, description, deadline=deadline)
+        if response is None:
+            return None
+        
+        return self._parse_response(response, description)
+    
+    def _get_response(self, path, description, headers=None, deadline=None, stream=False):
+        """
+        Send a rate-limited GET request and return the raw response.
+        
+        Connection errors, timeouts and 5xx responses are retried with
+        jittered exponential backoff. Each endpoint has a circuit breaker;
+        while it is open, requests fail immediately instead of waiting for
+        timeouts. With a deadline, retries, backoff and request timeouts are
+        cut to the time left.
+        
+        Args:
+            path (str): Path below BASE_URL, e.g. "/edition".
+            description (str): What is being fetched, used in error messages.
+            headers (dict, optional): Extra request headers.
+            deadline (Deadline, optional): Time budget of the request.
+            stream (bool): Return before the body is read (see
+                           HTTPTransport.get). Streamed requests are not hedged.
         
-    def _rate_limit(self):
-        """Simple rate limiting to avoid overwhelming the API."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        Returns:
+            requests.Response: The response, or None if the request failed,
+                               was rate limited or ran out of time.
+        """
+        breaker = self._breaker(path)
+        url = f"{self.BASE_URL}{path}"
+        error = None
+        out_of_time = False
         
-        if time_since_last < 1.0:  # Ensure at least 1 second between requests
-            time.sleep(1.0 - time_since_last)
+        for attempt in range(self.retry_policy.max_attempts):
+            permit = breaker.allow()
+            if not permit:
+                print(f"Error fetching {description}: API unavailable, retrying later")
+                return None
             
-        self.last_request_time = time.time()
+            try:
+                if attempt:
+                    delay = self.retry_policy.delay(attempt)
+                    if deadline is not None and delay >= deadline.remaining():
+                        out_of_time = True
+                        break
+                    with self._stats_lock:
+                        self.retries += 1
+                    time.sleep(delay)
+                
+                # Apply rate limiting
+                if not self._rate_limit(deadline) or (deadline is not None and deadline.expired()):
+                    out_of_time = True
+                    break
+                
+                try:
+                    if stream:
+                        response = self._timed_get(self._latency_tracker(path), url, headers, None, stream)
+                    else:
+                        response = self._hedged_get(path, url, headers, deadline)
+                except requests.RequestException as e:
+                    # A timeout cut short by the caller's deadline says nothing
+                    # about the endpoint, so it does not count against the breaker
+                    if isinstance(e, requests.Timeout) and deadline is not None and deadline.expired():
+                        out_of_time = True
+                        break
+                    breaker.record_failure()
+                    error = str(e)
+                    continue
+                except Exception as e:
+                    breaker.record_failure()
+                    print(f"Error fetching {description}: {str(e)}")
+                    return None
+                
+                if response is None:
+                    # The deadline passed before the endpoint answered
+                    out_of_time = True
+                    break
+                
+                if response.status_code == 429:
+                    self.rate_limiter.record_throttled(
+                        parse_retry_after(response.headers.get("Retry-After"))
+                    )
+                    print("API rate limit exceeded, slowing down")
+                    response.close()
+                    return None
+                
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                    error = f"status code {response.status_code}"
+                    response.close()
+                    continue
+                
+                # Only an answered request lets the adaptive backoff recover
+                self.rate_limiter.record_success()
+                breaker.record_success()
+                return response
+            finally:
+                # Settle a half-open trial on every exit (429, deadline, ...),
+                # or the breaker would keep rejecting requests
+                breaker.release(permit)
+        
+        if out_of_time:
+            with self._stats_lock:
+                self.deadlines_exceeded += 1
+            error = f"no answer within {deadline.budget:g} s"
+        
+        print(f"Error fetching {description}: {error}")
+        return None
     
-    def get_random_verse(self, editions=None):
+    def _hedged_get(self, path, url, headers, deadline):
         """
-        Get a random verse from the Quran.
+        Send a request, duplicating it if it is slower than usual.
+        
+        When the request has not answered within the endpoint's p95
+        latency, a hedged copy is sent (if the rate limiter has a token to
+        spare) and the first response to arrive is used. The slower copy is
+        left to finish in the background.
         
         Args:
-            editions (str, optional): Comma-separated list of edition identifiers.
-                                     Defaults to "quran-uthmani,en.asad".
+            path (str): Path below BASE_URL.
+            url (str): The full URL.
+            headers (dict): Extra request headers, or None.
+            deadline (Deadline): Time budget of the request, or None.
         
         Returns:
-            dict: The verse data or None if an error occurred.
+            requests.Response: The first response, or None if the deadline
+                               passed before any copy answered.
+        
+        Raises:
+            requests.RequestException: If every copy failed.
         """
-        if editions is None:
-            editions = "quran-uthmani,en.asad"
+        tracker = self._latency_tracker(path)
+        hedge_delay = tracker.hedge_delay() if self.hedge_requests else None
+        
+        if hedge_delay is None and deadline is None:
+            return self._timed_get(tracker, url, headers, None)
+        
+        timeout = deadline.timeout(self.transport.timeout) if deadline is not None else None
+        executor = self._request_executor()
+        first = executor.submit(self._timed_get, tracker, url, headers, timeout)
+        pending = {first}
+        
+        if hedge_delay is not None and (deadline is None or hedge_delay < deadline.remaining()):
+            done, _ = wait(pending, timeout=hedge_delay)
+            if not done and self.rate_limiter.try_acquire():
+                with self._stats_lock:
+                    self.hedges += 1
+                pending.add(executor.submit(self._timed_get, tracker, url, headers, timeout))
+        
+        error = None
+        while pending:
+            remaining = deadline.remaining() if deadline is not None else None
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                return None
             
-        random_ayah_number = random.randint(1, self.TOTAL_VERSES)
-        cache_key = f"{random_ayah_number}_{editions}"
+            for future in done:
+                try:
+                    response = future.result()
+                except requests.RequestException as e:
+                    error = e
+                    continue
+                
+                if future is not first:
+                    with self._stats_lock:
+                        self.hedge_wins += 1
+                return response
+        
+        raise error
+    
+    def _timed_get(self, tracker, url, headers, timeout, stream=False):
+        """
+        Send one request and record its latency.
+        
+        Args:
+            tracker (LatencyTracker): Tracker of the endpoint.
+            url (str): The full URL.
+            headers (dict): Extra request headers, or None.
+            timeout (float or tuple): Request timeout, or None for the default.
+            stream (bool): Return before the body is read.
+        
+        Returns:
+            requests.Response: The response.
+        """
+        start = time.perf_counter()
+        response = self.transport.get(url, headers=headers, timeout=timeout, stream=stream)
+        tracker.record(time.perf_counter() - start)
+        return response
+    
+    def _latency_tracker(self, path):
+        """
+        Get the latency tracker of the endpoint a path belongs to.
+        
+        Args:
+            path (str): Path below BASE_URL.
+        
+        Returns:
+            LatencyTracker: The endpoint's tracker.
+        """
+        endpoint = path.split("/")[1]
+        with self._stats_lock:
+            tracker = self._latency.get(endpoint)
+            if tracker is None:
+                tracker = self._latency[endpoint] = LatencyTracker()
+            return tracker
+    
+    def _request_executor(self):
+        """
+        Get the thread pool that runs hedged and deadline-bound requests.
+        
+        Returns:
+            ThreadPoolExecutor: The pool, created on first use.
+        """
+        with self._stats_lock:
+            if self._executor is None:
+                workers = max(4, 2 * self.transport.pool_size)
+                self._executor = ThreadPoolExecutor(max_workers=workers,
+                                                    thread_name_prefix="api-request")
+            return self._executor
+    
+    def _breaker(self, path):
+        """
+        Get the circuit breaker of the endpoint a path belongs to.
         
-        # Check if we have this verse cached
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        Args:
+            path (str): Path below BASE_URL, e.g. "/ayah/262/editions/en.asad".
         
-        # Apply rate limiting
-        self._rate_limit()
+        Returns:
+            CircuitBreaker: The breaker of the endpoint ("ayah" in the example).
+        """
+        endpoint = path.split("/")[1]
+        with self._stats_lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = self._breaker_factory()
+            return breaker
+    
+    def _parse_response(self, response, description):
+        """
+        Extract the data from an API response.
+        
+        Args:
+            response (requests.Response): The response.
+            description (str): What is being fetched, used in error messages.
         
+        Returns:
+            The "data" member of the response, or None if the request failed.
+        """
         try:
-            url = f"{self.BASE_URL}/ayah/{random_ayah_number}/editions/{editions}"
-            response = requests.get(url)
-            
             if response.status_code == 200:
                 data = response.json()
                 if data["status"] == "OK":
-                    # Cache the result
-                    self.cache[cache_key] = data["data"]
                     return data["data"]
                 else:
                     print(f"API returned non-OK status: {data['status']}")
@@ -74,10 +475,237 @@ class APIService:
                 return None
                 
         except Exception as e:
-            print(f"Error fetching random verse: {str(e)}")
+            print(f"Error fetching {description}: {str(e)}")
             return None
     
-    def get_specific_verse(self, reference, editions=None):
+    def _get_resource(self, path, key, description, max_age):
+        """
+        Get a cached API resource, revalidating it once it is older than max_age.
+        
+        Resources are cached with the ETag and Last-Modified validators of the
+        response. A stale resource is returned immediately and refreshed in
+        the background with a conditional request, so when it has not changed
+        the server answers 304 Not Modified without a body and the cached
+        copy is kept. If the refresh fails, the stale copy keeps being served.
+        
+        Args:
+            path (str): Path below BASE_URL, e.g. "/edition".
+            key (str): Cache key of the resource.
+            description (str): What is being fetched, used in error messages.
+            max_age (float): Seconds a cached copy is used without revalidation.
+        
+        Returns:
+            The "data" member of the response, or None if an error occurred.
+        """
+        record = self.cache.get(key)
+        if record is None:
+            record = self.cache.get_stale(key)
+        
+        if record is None:
+            return self.single_flight.do(path, lambda: self._revalidate(path, key, description, None))
+        
+        if time.time() - record["fetched_at"] >= max_age:
+            with self._stats_lock:
+                self.stale_served += 1
+            self._refresh_in_background(path, key, description, record)
+        
+        return record["data"]
+    
+    def _refresh_in_background(self, path, key, description, record):
+        """
+        Revalidate a cached resource on a background thread.
+        
+        Args:
+            path (str): Path below BASE_URL.
+            key (str): Cache key of the resource.
+            description (str): What is being fetched, used in error messages.
+            record (dict): The stale cached copy.
+        """
+        with self._stats_lock:
+            refresh = self._refreshes.get(key)
+            if refresh is not None and refresh.is_alive():
+                return
+            
+            refresh = threading.Thread(
+                target=self.single_flight.do,
+                args=(path, lambda: self._revalidate(path, key, description, record)),
+                name=f"refresh-{key}",
+                daemon=True
+            )
+            self._refreshes[key] = refresh
+            refresh.start()
+    
+    def wait_for_refreshes(self, timeout=None):
+        """
+        Wait for background refreshes of cached resources to finish.
+        
+        Args:
+            timeout (float, optional): Seconds to wait for each refresh.
+        """
+        with self._stats_lock:
+            refreshes = list(self._refreshes.values())
+        
+        for refresh in refreshes:
+            refresh.join(timeout)
+    
+    def _revalidate(self, path, key, description, record):
+        """
+        Fetch a resource, conditionally if a cached copy has validators.
+        
+        Args:
+            path (str): Path below BASE_URL.
+            key (str): Cache key of the resource.
+            description (str): What is being fetched, used in error messages.
+            record (dict): The cached copy and its validators, or None.
+        
+        Returns:
+            The resource data, or None if an error occurred.
+        """
+        headers = {}
+        if record is not None:
+            if record.get("etag"):
+                headers["If-None-Match"] = record["etag"]
+            if record.get("last_modified"):
+                headers["If-Modified-Since"] = record["last_modified"]
+        
+        response = self._get_response(path, description, headers or None)
+        if response is None:
+            return None
+        
+        if headers:
+            with self._stats_lock:
+                self.revalidations += 1
+        
+        if response.status_code == 304 and record is not None:
+            with self._stats_lock:
+                self.not_modified += 1
+                self.bytes_saved += max(record["bytes"] - HTTPTransport.wire_size(response), 0)
+            
+            record = dict(record, fetched_at=time.time())
+            self.cache.put(key, record)
+            return record["data"]
+        
+        data = self._parse_response(response, description)
+        if data is None:
+            return None
+        
+        self.cache.put(key, {
+            "data": data,
+            "etag": self._validator(response, "ETag"),
+            "last_modified": self._validator(response, "Last-Modified"),
+            "bytes": HTTPTransport.wire_size(response),
+            "fetched_at": time.time()
+        })
+        return data
+    
+    @staticmethod
+    def _validator(response, header):
+        """
+        Get a validator header from a response.
+        
+        Args:
+            response (requests.Response): The response.
+            header (str): "ETag" or "Last-Modified".
+        
+        Returns:
+            str: The header value, or None if the response has none.
+        """
+        value = response.headers.get(header)
+        return value if isinstance(value, str) else None
+    
+    def get_resilience_stats(self):
+        """
+        Get counters for retries, stale fallbacks and circuit breakers.
+        
+        Returns:
+            dict: Retries sent, stale entries served and the stats of each
+                  endpoint's circuit breaker.
+        """
+        with self._stats_lock:
+            stats = {
+                "retries": self.retries,
+                "stale_served": self.stale_served
+            }
+            breakers = dict(self._breakers)
+        
+        stats["breakers"] = {endpoint: breaker.stats() for endpoint, breaker in breakers.items()}
+        return stats
+    
+    def get_latency_stats(self):
+        """
+        Get tail latency statistics and hedging counters.
+        
+        Returns:
+            dict: Hedged requests sent, hedges that answered first, calls
+                  that ran out of time and the latency percentiles of each
+                  endpoint.
+        """
+        with self._stats_lock:
+            stats = {
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "deadlines_exceeded": self.deadlines_exceeded
+            }
+            trackers = dict(self._latency)
+        
+        stats["endpoints"] = {endpoint: tracker.stats() for endpoint, tracker in trackers.items()}
+        return stats
+    
+    def get_provider_stats(self):
+        """
+        Get per-provider latency and error statistics of routed requests.
+        
+        Returns:
+            dict: See ProviderRouter.stats.
+        """
+        return self.router.stats()
+    
+    def get_revalidation_stats(self):
+        """
+        Get counters for conditional requests.
+        
+        Returns:
+            dict: Conditional requests sent, 304 responses and the response
+                  bytes they avoided downloading.
+        """
+        with self._stats_lock:
+            return {
+                "revalidations": self.revalidations,
+                "not_modified": self.not_modified,
+                "bytes_saved": self.bytes_saved
+            }
+    
+    def get_random_verse(self, editions=None, deadline=None):
+        """
+        Get a random verse from the Quran.
+        
+        Args:
+            editions (str, optional): Comma-separated list of edition identifiers.
+                                     Defaults to "quran-uthmani,en.asad".
+            deadline (Deadline, optional): Time budget of the call.
+        
+        Returns:
+            dict: The verse data or None if an error occurred.
+        """
+        if editions is None:
+            editions = "quran-uthmani,en.asad"
+            
+        random_ayah_number = self.pick_random_ayah()
+        
+        return self._get_verse(random_ayah_number, editions, "random verse", deadline)
+    
+    def pick_random_ayah(self):
+        """
+        Choose the ayah number for a random verse.
+        
+        Verses do not repeat until every verse has been picked once.
+        
+        Returns:
+            int: A global ayah number between 1 and TOTAL_VERSES.
+        """
+        return self.sampler.next()
+    
+    def get_specific_verse(self, reference, editions=None, deadline=None):
         """
         Get a specific verse from the Quran.
         
@@ -85,42 +713,324 @@ class APIService:
             reference (str): Verse reference (number or surah:ayah format).
             editions (str, optional): Comma-separated list of edition identifiers.
                                      Defaults to "quran-uthmani,en.asad".
+            deadline (Deadline, optional): Time budget of the call.
         
         Returns:
             dict: The verse data or None if an error occurred.
         """
         if editions is None:
             editions = "quran-uthmani,en.asad"
-            
-        cache_key = f"{reference}_{editions}"
         
-        # Check if we have this verse cached
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        return self._get_verse(reference, editions, "specific verse", deadline)
+    
+    def _get_verse(self, reference, editions, description, deadline=None):
+        """
+        Get a verse from the offline corpus, the cache or the API.
         
-        # Apply rate limiting
-        self._rate_limit()
+        Each edition of a verse is stored separately, so only the editions
+        that are not available locally are requested from the API.
         
-        try:
-            url = f"{self.BASE_URL}/ayah/{reference}/editions/{editions}"
-            response = requests.get(url)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data["status"] == "OK":
-                    # Cache the result
-                    self.cache[cache_key] = data["data"]
-                    return data["data"]
-                else:
-                    print(f"API returned non-OK status: {data['status']}")
+        Args:
+            reference (int or str): Verse reference (number or surah:ayah format).
+            editions (str): Comma-separated list of edition identifiers.
+            description (str): What is being fetched, used in error messages.
+            deadline (Deadline, optional): Time budget of the call.
+        
+        Returns:
+            list: The verse data (one entry per edition) or None if an error occurred.
+        """
+        number = parse_reference(reference)
+        if number is None:
+            print(f"Error fetching {description}: invalid verse reference {reference!r}")
+            return None
+        
+        identifiers = editions.split(",")
+        parts = {identifier: self._find_edition(number, identifier)
+                 for identifier in identifiers}
+        missing = [identifier for identifier in identifiers if parts[identifier] is None]
+        
+        if not missing:
+            return [parts[identifier] for identifier in identifiers]
+        
+        # Responses that are not one entry per edition are cached whole
+        combined_key = (number, editions)
+        cached = self.cache.get(combined_key)
+        if cached is not None:
+            return cached
+        
+        data = self.router.fetch("verse", number, missing, deadline)
+        if data is None:
+            return self._get_stale_verse(number, identifiers, parts)
+        
+        fetched = self._split_editions(data)
+        if fetched is not None and set(fetched) != set(missing) and len(fetched) == len(missing):
+            # A provider may answer with its own text of an edition (Quran.com's
+            # Uthmani script), which is never cached under the requested identifier
+            fetched = dict(zip(missing, data))
+        if fetched is None or set(fetched) != set(missing):
+            self.cache.put(combined_key, data)
+            return data
+        
+        for identifier, entry in fetched.items():
+            # Cache the result
+            self.cache.put((number, entry["edition"]["identifier"]), entry)
+            parts[identifier] = entry
+        
+        return [parts[identifier] for identifier in identifiers]
+    
+    def _get_stale_verse(self, number, identifiers, parts):
+        """
+        Complete a verse from expired cache entries when the API cannot be reached.
+        
+        Args:
+            number (int): The global ayah number.
+            identifiers (list): The requested edition identifiers.
+            parts (dict): Entries already found locally, keyed by identifier.
+        
+        Returns:
+            list: The verse data, or None if an edition has never been cached.
+        """
+        verse = []
+        for identifier in identifiers:
+            entry = parts[identifier]
+            if entry is None:
+                entry = self.cache.get_stale((number, identifier))
+                if entry is None:
                     return None
-            else:
-                print(f"API request failed with status code: {response.status_code}")
+            verse.append(entry)
+        
+        with self._stats_lock:
+            self.stale_served += 1
+        return verse
+    
+    def fetch_verse(self, reference, editions, description="specific verse", deadline=None):
+        """
+        Get a verse, requesting the editions that are not available locally.
+        
+        Args:
+            reference (int or str): Verse reference (number or surah:ayah format).
+            editions (str): Comma-separated list of edition identifiers.
+            description (str): What is being fetched, used in error messages.
+            deadline (Deadline, optional): Time budget of the call.
+        
+        Returns:
+            list: The verse data or None if an error occurred.
+        """
+        return self._get_verse(reference, editions, description, deadline)
+    
+    def find_verse(self, reference, editions):
+        """
+        Get a verse from the offline corpus or the cache, without network access.
+        
+        Args:
+            reference (int or str): Verse reference (number or surah:ayah format).
+            editions (str): Comma-separated list of edition identifiers.
+        
+        Returns:
+            list: The verse data, or None if any edition is not available locally.
+        """
+        number = parse_reference(reference)
+        if number is None:
+            return None
+        
+        verse = []
+        for identifier in editions.split(","):
+            entry = self._find_edition(number, identifier)
+            if entry is None:
+                return self.cache.get((number, editions))
+            verse.append(entry)
+        return verse
+    
+    def _find_edition(self, number, identifier):
+        """
+        Get one edition of a verse from the offline corpus or the cache.
+        
+        Args:
+            number (int): The global ayah number.
+            identifier (str): The edition identifier.
+        
+        Returns:
+            dict: The ayah entry for that edition, or None if not available locally.
+        """
+        # Serve from the offline corpus when the edition is installed
+        local_verse = self._get_local_verse(number, identifier)
+        if local_verse is not None:
+            return local_verse[0]
+        
+        # Check if we have this edition of the verse cached
+        return self.cache.get((number, identifier))
+    
+    @staticmethod
+    def _split_editions(data):
+        """
+        Split a multi-edition ayah response into its editions.
+        
+        Args:
+            data: The "data" member of an /ayah/{reference}/editions response.
+        
+        Returns:
+            dict: Ayah entries keyed by edition identifier, or None if the
+                  response does not have one entry per edition.
+        """
+        if not isinstance(data, list):
+            return None
+        
+        entries = {}
+        for entry in data:
+            edition = entry.get("edition") if isinstance(entry, dict) else None
+            if not isinstance(edition, dict) or "identifier" not in edition:
                 return None
-                
-        except Exception as e:
-            print(f"Error fetching specific verse: {str(e)}")
+            entries[edition["identifier"]] = entry
+        return entries
+    
+    def get_surah(self, number, editions=None):
+        """
+        Get every ayah of a surah in a single request.
+        
+        Each ayah is also cached individually, so later get_specific_verse
+        calls for verses of this surah are served from the cache.
+        
+        Args:
+            number (int): The surah number (1-114).
+            editions (str, optional): Comma-separated list of edition identifiers.
+                                     Defaults to "quran-uthmani,en.asad".
+        
+        Returns:
+            list: One verse data list per ayah, or None if an error occurred.
+        """
+        if editions is None:
+            editions = "quran-uthmani,en.asad"
+        
+        if not 1 <= int(number) <= self.TOTAL_SURAHS:
+            print(f"Invalid surah number: {number}")
+            return None
+        
+        if self.corpus_store is not None:
+            local_ayahs = self.corpus_store.get_surah(int(number), editions.split(","))
+            if local_ayahs is not None:
+                return local_ayahs
+        
+        ayahs = self.router.fetch("surah", int(number), editions.split(","))
+        if ayahs is None:
             return None
+        
+        return self._cache_verses(ayahs, editions)
+    
+    def get_page(self, number, editions=None):
+        """
+        Get every ayah on a mushaf page.
+        
+        The API serves pages one edition at a time, so this makes one request
+        per edition. Each ayah is also cached individually.
+        
+        Args:
+            number (int): The page number (1-604).
+            editions (str, optional): Comma-separated list of edition identifiers.
+                                     Defaults to "quran-uthmani,en.asad".
+        
+        Returns:
+            list: One verse data list per ayah, or None if an error occurred.
+        """
+        return self.get_division("page", number, editions)
+    
+    def get_division(self, division, number, editions=None):
+        """
+        Get every ayah of a juz, manzil, page, ruku or hizb quarter.
+        
+        The API serves these one edition at a time, so this makes one request
+        per edition. Each ayah is also cached individually.
+        
+        Args:
+            division (str): One of DIVISION_COUNTS, e.g. "juz".
+            number (int): The part number, e.g. 1-30 for a juz.
+            editions (str, optional): Comma-separated list of edition identifiers.
+                                     Defaults to "quran-uthmani,en.asad".
+        
+        Returns:
+            list: One verse data list per ayah, or None if an error occurred.
+        """
+        if editions is None:
+            editions = "quran-uthmani,en.asad"
+        
+        if not 1 <= int(number) <= self.DIVISION_COUNTS.get(division, 0):
+            print(f"Invalid {division} number: {number}")
+            return None
+        
+        if self.corpus_store is not None:
+            local_ayahs = self.corpus_store.get_division(division, int(number), editions.split(","))
+            if local_ayahs is not None:
+                return local_ayahs
+        
+        units = []
+        for identifier in editions.split(","):
+            data = self._request(f"/{division}/{number}/{identifier}", f"{division} {number}")
+            if data is None:
+                return None
+            units.append([dict(ayah, edition=data["edition"]) for ayah in data["ayahs"]])
+        
+        return self._cache_ayahs(units, editions)
+    
+    def get_metadata(self):
+        """
+        Get the index of the Quran's divisions (juz, page, ruku, ...).
+        
+        The API's /meta tables are fetched once and cached; an installed
+        corpus provides them without network access. A corpus imported
+        without some divisions (e.g. pages) has them completed from /meta,
+        and the fetched divisions are stored in the corpus.
+        
+        Returns:
+            QuranMetadata: The index, or None if it could not be loaded.
+        """
+        starts = None
+        if self.corpus_store is not None and self.cache.get("meta") is None:
+            starts = self.corpus_store.get_division_starts()
+            if starts is not None and all(division in starts for division in CorpusStore.DIVISIONS):
+                return QuranMetadata(starts)
+        
+        data = self._get_resource("/meta", "meta", "metadata", self.META_TTL)
+        if data is None:
+            return QuranMetadata(starts) if starts is not None else None
+        
+        fetched = QuranMetadata.starts_from_meta(data)
+        if starts is not None:
+            missing = {division: numbers for division, numbers in fetched.items()
+                       if division not in starts}
+            if missing:
+                self.corpus_store.add_division_starts(missing)
+            fetched.update(starts)
+        
+        return QuranMetadata(fetched)
+    
+    def _cache_ayahs(self, units, editions):
+        """
+        Combine per-edition ayah lists and cache each ayah individually.
+        
+        Args:
+            units (list): One list of ayah dicts per edition, in the same ayah order.
+            editions (str): Comma-separated list of edition identifiers.
+        
+        Returns:
+            list: One verse data list per ayah, shaped like get_specific_verse results.
+        """
+        return self._cache_verses([list(entries) for entries in zip(*units)], editions)
+    
+    def _cache_verses(self, ayahs, editions):
+        """
+        Cache each edition of each ayah individually.
+        
+        Args:
+            ayahs (list): One verse data list per ayah.
+            editions (str): Comma-separated list of edition identifiers.
+        
+        Returns:
+            list: The ayahs.
+        """
+        for entries in ayahs:
+            for identifier, entry in zip(editions.split(","), entries):
+                self.cache.put((entry["number"], identifier), entry)
+        
+        return ayahs
     
     def get_available_editions(self):
         """
@@ -129,37 +1039,140 @@ class APIService:
         Returns:
             list: List of available editions or None if an error occurred.
         """
-        # Check if we have editions cached
-        if "editions" in self.cache:
-            return self.cache["editions"]
+        # Cached copies older than EDITIONS_TTL are revalidated with the server
+        return self._get_resource("/edition", "editions", "editions", self.EDITIONS_TTL)
+    
+    def find_available_editions(self):
+        """
+        Get the editions catalog if a fresh copy is cached, without network access.
+        
+        Returns:
+            list: List of available editions, or None if no fresh copy is cached.
+        """
+        record = self.cache.get("editions")
+        if record is None or time.time() - record["fetched_at"] >= self.EDITIONS_TTL:
+            return None
+        return record["data"]
+    
+    def _get_local_verse(self, reference, editions):
+        """
+        Look up a verse in the offline corpus.
         
-        # Apply rate limiting
-        self._rate_limit()
+        Args:
+            reference (int or str): Verse reference (number or surah:ayah format).
+            editions (str): Comma-separated list of edition identifiers.
+        
+        Returns:
+            list: The verse data, or None if any edition is not installed.
+        """
+        if self.corpus_store is None:
+            return None
+        
+        return self.corpus_store.get_ayah(reference, editions.split(","))
+    
+    def install_edition(self, identifier):
+        """
+        Download a complete edition into the offline corpus.
+        
+        The response is parsed while it downloads and each ayah is written
+        to the corpus as soon as it has been read, so memory use does not
+        depend on the size of the edition.
+        
+        Args:
+            identifier (str): The edition identifier, e.g. "quran-uthmani".
+        
+        Returns:
+            bool: True if the edition was installed, False otherwise.
+        """
+        if self.corpus_store is None:
+            print("No offline corpus store configured")
+            return False
+        
+        response = self._get_response(f"/quran/{identifier}", f"edition {identifier}", stream=True)
+        if response is None:
+            return False
         
         try:
-            url = f"{self.BASE_URL}/edition"
-            response = requests.get(url)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data["status"] == "OK":
-                    # Cache the result
-                    self.cache["editions"] = data["data"]
-                    return data["data"]
-                else:
-                    print(f"API returned non-OK status: {data['status']}")
-                    return None
-            else:
+            if response.status_code != 200:
                 print(f"API request failed with status code: {response.status_code}")
-                return None
-                
+                return False
+            
+            # Completed from the response's "edition" member as it is parsed
+            edition = {"identifier": identifier}
+            self.corpus_store.add_ayahs(edition, self._iter_edition(response, edition))
+            return True
         except Exception as e:
-            print(f"Error fetching editions: {str(e)}")
-            return None
+            print(f"Error installing edition {identifier}: {str(e)}")
+            return False
+        finally:
+            response.close()
+    
+    def _iter_edition(self, response, edition):
+        """
+        Stream the ayahs of a ``/quran/{edition}`` response.
+        
+        Args:
+            response (requests.Response): The streamed response.
+            edition (dict): Updated with the edition metadata once it is read.
+        
+        Yields:
+            tuple: (surah, ayah) records for CorpusStore.add_ayahs.
+        
+        Raises:
+            ValueError: If the response is not a valid edition.
+        """
+        surah = {}
+        
+        for path, value in iter_json(response.iter_content(self.STREAM_CHUNK_SIZE),
+                                     (self.EDITION_AYAH_PATH, "data.edition")):
+            if path == self.EDITION_AYAH_PATH:
+                key = verse_key(value["number"]) if isinstance(value.get("number"), int) else None
+                if key is None:
+                    raise ValueError(f"Invalid ayah in edition {edition['identifier']}")
+                if surah.get("number") != key[0]:
+                    surah = {"number": key[0]}
+                surah.setdefault("numberOfAyahs", SURAH_LENGTHS[key[0] - 1])
+                yield surah, value
+            elif path.startswith("data.surahs.item."):
+                field = path[len("data.surahs.item."):]
+                if field == "number":
+                    surah = {}
+                surah[field] = value
+            elif path == "data.edition":
+                edition.update(value, identifier=edition["identifier"])
+            elif path == "status" and value != "OK":
+                raise ValueError(f"API returned non-OK status: {value}")
+    
+    def list_installed_editions(self):
+        """
+        Get the editions installed in the offline corpus.
+        
+        Returns:
+            list: List of installed edition dicts.
+        """
+        if self.corpus_store is None:
+            return []
+        
+        return self.corpus_store.list_editions()
+    
+    def remove_edition(self, identifier):
+        """
+        Remove an edition from the offline corpus.
+        
+        Args:
+            identifier (str): The edition identifier.
+        
+        Returns:
+            bool: True if the edition was removed, False otherwise.
+        """
+        if self.corpus_store is None:
+            return False
+        
+        return self.corpus_store.remove_edition(identifier)
     
     def clear_cache(self):
         """Clear the API cache."""
-        self.cache = {}
+        self.cache.clear()
 
 
 # Simple test function
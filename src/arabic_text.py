@@ -0,0 +1,67 @@
+"""
+Arabic Text for Qur'anic Verse Application
+
+This module normalizes Arabic text so searches ignore diacritics,
+Uthmani-specific marks and spelling variants of the same letter or of the
+long a.
+"""
+
+import re
+
+# Tashkeel (harakat, tanween, shadda, sukun, ...) and the Uthmani small
+# letters, pause marks and annotation signs. The dagger alef (U+0670) is a
+# long a and is handled with the other alef spellings.
+DIACRITICS = re.compile(
+    "[\u0610-\u061A\u064B-\u065F\u06D6-\u06DC\u06DF-\u06E8\u06EA-\u06ED\u08D3-\u08FF]"
+)
+
+# Uthmani long a written on a waw (ٱلصَّلَوٰةَ) or, inside a word, on an alef
+# maksura (ٱلتَّوْرَىٰةَ); a final alef maksura keeps its letter (مُوسَىٰ)
+LONG_A = re.compile("\u0648\u0670|\u0649\u0670(?=\\w)|\u0670")
+
+# The long a is spelled with a plain alef, a dagger alef or not at all
+# (ٱلْعَٰلَمِينَ, العالمين; ٱلرَّحْمَٰنِ, الرحمن), so only a word-initial alef is kept
+INNER_ALEF = re.compile("(?<=\\w)\u0627")
+
+# Tatweel, rub el hizb, sajda sign and end-of-ayah marks carry no letters
+MARKS = re.compile("[\u0640\u06DD\u06DE\u06E9\u06FD\u06FE]")
+
+LETTER_VARIANTS = str.maketrans({
+    "\u0671": "\u0627",  # alef wasla
+    "\u0622": "\u0627",  # alef with madda
+    "\u0623": "\u0627",  # alef with hamza above
+    "\u0625": "\u0627",  # alef with hamza below
+    "\u0672": "\u0627",  # alef with wavy hamza above
+    "\u0673": "\u0627",  # alef with wavy hamza below
+    "\u0624": "\u0648",  # waw with hamza
+    "\u0626": "\u064A",  # ya with hamza
+    "\u0649": "\u064A",  # alef maksura
+    "\u06CC": "\u064A",  # farsi ya
+    "\u0629": "\u0647",  # ta marbuta
+    "\u06A9": "\u0643",  # keheh
+})
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_arabic(text):
+    """
+    Reduce Arabic text to a plain letter skeleton.
+
+    Diacritics and Uthmani marks are removed; alef, hamza carrier, ya and
+    ta marbuta variants are unified. Alefs inside a word are dropped, so
+    the Uthmani and standard spellings of a long a give the same skeleton.
+    Other characters are left unchanged.
+
+    Args:
+        text (str): The text to normalize.
+
+    Returns:
+        str: The normalized text with single spaces between words.
+    """
+    text = MARKS.sub("", text)
+    text = DIACRITICS.sub("", text)
+    text = LONG_A.sub("\u0627", text)
+    text = text.translate(LETTER_VARIANTS)
+    text = INNER_ALEF.sub("", text)
+    return WHITESPACE.sub(" ", text).strip()
@@ -0,0 +1,157 @@
+"""
+Async API Service for Qur'anic Verse Application
+
+This module provides an asyncio interface to APIService so many verses
+can be fetched concurrently.
+"""
+
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncAPIService:
+    """
+    Asyncio front end to APIService with bounded concurrency.
+
+    All work runs on threads, so the event loop never blocks: lookups in the
+    offline corpus and the caches (which may read SQLite) use the loop's
+    default executor and do not wait for a request slot. Misses run the
+    synchronous request path on a dedicated thread pool, so they share the
+    wrapped service's cache, transport and rate limiter with synchronous
+    callers. At most ``max_concurrency`` requests are in flight at once.
+
+    One client may be used from several event loops, e.g. successive
+    ``asyncio.run`` calls.
+    """
+
+    def __init__(self, api_service, max_concurrency=8):
+        """
+        Initialize the async API service.
+
+        Args:
+            api_service (APIService): The synchronous service to share state with.
+            max_concurrency (int): Maximum number of concurrent requests.
+        """
+        self.api_service = api_service
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix="async-api")
+        # asyncio semaphores belong to one event loop
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._semaphores_lock = threading.Lock()
+
+    async def _run(self, func, *args):
+        """
+        Run a blocking APIService call under the concurrency cap.
+
+        Args:
+            func (callable): The blocking function.
+            *args: Its arguments.
+
+        Returns:
+            The function's result.
+        """
+        loop = asyncio.get_running_loop()
+        with self._semaphores_lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+
+        async with semaphore:
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def _lookup(self, func, *args):
+        """
+        Run a local lookup (corpus or cache) off the event loop.
+
+        Args:
+            func (callable): The blocking lookup.
+            *args: Its arguments.
+
+        Returns:
+            The lookup's result.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args))
+
+    async def get_random_verse(self, editions=None):
+        """
+        Get a random verse from the Quran.
+
+        Args:
+            editions (str, optional): Comma-separated list of edition identifiers.
+                                      Defaults to "quran-uthmani,en.asad".
+
+        Returns:
+            dict: The verse data or None if an error occurred.
+        """
+        return await self._get_verse(self.api_service.pick_random_ayah(), editions)
+
+    async def get_specific_verse(self, reference, editions=None):
+        """
+        Get a specific verse from the Quran.
+
+        Args:
+            reference (str): Verse reference (number or surah:ayah format).
+            editions (str, optional): Comma-separated list of edition identifiers.
+                                      Defaults to "quran-uthmani,en.asad".
+
+        Returns:
+            dict: The verse data or None if an error occurred.
+        """
+        return await self._get_verse(reference, editions)
+
+    async def _get_verse(self, reference, editions):
+        """
+        Get a verse locally if possible, otherwise through the API.
+
+        Args:
+            reference (int or str): Verse reference.
+            editions (str, optional): Comma-separated list of edition identifiers.
+
+        Returns:
+            dict: The verse data or None if an error occurred.
+        """
+        if editions is None:
+            editions = "quran-uthmani,en.asad"
+
+        known = await self._lookup(self.api_service.find_verse, reference, editions)
+        if known is not None:
+            return known
+
+        return await self._run(self.api_service.fetch_verse, reference, editions)
+
+    async def get_verses(self, references, editions=None):
+        """
+        Fetch several verses concurrently.
+
+        Args:
+            references (list): Verse references.
+            editions (str, optional): Comma-separated list of edition identifiers.
+
+        Returns:
+            list: Verse data in the order of the references (None for failures).
+        """
+        return await asyncio.gather(
+            *(self.get_specific_verse(reference, editions) for reference in references)
+        )
+
+    async def get_available_editions(self):
+        """
+        Get a list of all available editions (translations and recitations).
+
+        Returns:
+            list: List of available editions or None if an error occurred.
+        """
+        cached = await self._lookup(self.api_service.find_available_editions)
+        if cached is not None:
+            return cached
+
+        return await self._run(self.api_service.get_available_editions)
+
+    def close(self):
+        """Stop the worker threads."""
+        self._executor.shutdown(wait=False)
@@ -7,6 +7,8 @@ This module handles user preferences and settings.
 import json
 import os
 import hashlib
+import tempfile
+import threading
 
 class ConfigurationManager:
     """
@@ -26,18 +28,50 @@ class ConfigurationManager:
         "showArabicText": True,
         "showTranslation": True,
         "showReference": True,
-        "maxHistorySize": 50
+        "maxHistorySize": 50,
+        "persistentHistory": True,
+        "dataDirectory": "data",
+        "httpPoolSize": 4,
+        "httpConnectTimeout": 5.0,
+        "httpReadTimeout": 15.0,
+        "cacheMaxEntries": 1000,
+        "cacheMaxBytes": 8388608,
+        "persistentCache": True,
+        "cacheTTL": 2592000,
+        "prefetchSize": 5,
+        "apiRateLimit": 1.0,
+        "apiBurst": 3,
+        "apiRetries": 3,
+        "apiRetryDelay": 0.5,
+        "circuitFailureThreshold": 5,
+        "circuitResetTimeout": 30.0,
+        "hedgeRequests": True,
+        "verseRequestBudget": 10.0,
+        "providers": ["alquran.cloud", "quran.com", "local"],
+        "randomSeed": None  # Set to an integer for a reproducible verse order
     }
     
-    def __init__(self, config_file="config.json"):
+    def __init__(self, config_file="config.json", save_delay=0.5):
         """
         Initialize the configuration manager.
         
         Args:
             config_file (str): Path to the configuration file.
+            save_delay (float): Seconds to wait for further changes before
+                                writing the file. 0 writes on every save.
         """
         self.config_file = config_file
+        self.save_delay = save_delay
         self.config = self._load_config()
+        
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = False
+        
+        # Persistence counters
+        self.save_requests = 0
+        self.disk_writes = 0
+        self.writes_avoided = 0
     
     def _load_config(self):
         """
@@ -64,14 +98,134 @@ class ConfigurationManager:
             return self.DEFAULT_CONFIG.copy()
     
     def save_config(self):
-        """Save the current configuration to file."""
+        """
+        Schedule the current configuration to be saved to file.
+        
+        Saves requested within ``save_delay`` seconds of each other are
+        coalesced into a single write once the changes stop. Call flush()
+        or close() to write pending changes immediately.
+        
+        Returns:
+            bool: True if the save was scheduled or written, False otherwise.
+        """
+        with self._lock:
+            self.save_requests += 1
+            
+            if self.save_delay <= 0:
+                self._dirty = True
+                return self.flush()
+            
+            if self._timer is not None:
+                self._timer.cancel()
+                self.writes_avoided += 1
+            
+            self._dirty = True
+            self._timer = threading.Timer(self.save_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+            return True
+    
+    def flush(self):
+        """
+        Write pending configuration changes to file now.
+        
+        Returns:
+            bool: True if nothing was pending or the write succeeded, False otherwise.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            
+            if not self._dirty:
+                return True
+            
+            if not self._write_config():
+                return False
+            
+            self._dirty = False
+            return True
+    
+    def _write_config(self):
+        """
+        Atomically replace the configuration file with the current configuration.
+        
+        The data is written to a temporary file in the same directory, synced
+        to disk and renamed over the old file, so a crash leaves either the
+        old or the new configuration, never a partial one.
+        
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        directory = os.path.dirname(os.path.abspath(self.config_file))
+        temp_path = None
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4)
+            data = json.dumps(self.config, indent=4)
+            
+            fd, temp_path = tempfile.mkstemp(
+                prefix=f".{os.path.basename(self.config_file)}.", suffix=".tmp", dir=directory
+            )
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            
+            os.replace(temp_path, self.config_file)
+            temp_path = None
+            self._sync_directory(directory)
+            
+            self.disk_writes += 1
             return True
         except Exception as e:
             print(f"Error saving configuration: {str(e)}")
             return False
+        finally:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    @staticmethod
+    def _sync_directory(directory):
+        """
+        Sync a directory so a rename inside it survives a crash (POSIX only).
+        
+        Args:
+            directory (str): The directory path.
+        """
+        if os.name != "posix":
+            return
+        
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    
+    def close(self):
+        """
+        Write any pending changes and stop the save timer.
+        
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        return self.flush()
+    
+    def get_persistence_stats(self):
+        """
+        Get counters describing how configuration saves reached the disk.
+        
+        Returns:
+            dict: Save requests, disk writes, writes avoided by coalescing
+                  and whether changes are pending.
+        """
+        with self._lock:
+            return {
+                "save_requests": self.save_requests,
+                "disk_writes": self.disk_writes,
+                "writes_avoided": self.writes_avoided,
+                "pending": self._dirty
+            }
     
     def get_config(self):
         """
@@ -93,9 +247,10 @@ class ConfigurationManager:
             bool: True if successful, False otherwise.
         """
         try:
-            for key, value in updates.items():
-                if key in self.config:
-                    self.config[key] = value
+            with self._lock:
+                for key, value in updates.items():
+                    if key in self.config:
+                        self.config[key] = value
             
             return self.save_config()
         except Exception as e:
@@ -218,6 +373,7 @@ def test_config_manager():
     print(f"Advanced mode enabled: {config_manager.is_advanced_mode_enabled()}")
     
     # Clean up test file
+    config_manager.close()
     if os.path.exists("test_config.json"):
         os.remove("test_config.json")
         print("\nTest config file removed.")
@@ -0,0 +1,616 @@
+"""
+Corpus Store for Qur'anic Verse Application
+
+This module keeps complete Quran editions in a local SQLite database so
+verse text can be served without contacting the API.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from src.verse_keys import TOTAL_VERSES, parse_reference
+
+
+class CorpusStore:
+    """
+    Local store holding every ayah of the installed editions.
+
+    Verse metadata (surah, juz, page, ...) is shared by all editions and
+    stored once; each edition only adds one text row per ayah.
+    """
+
+    SCHEMA_VERSION = 1
+    TOTAL_VERSES = TOTAL_VERSES
+
+    EDITION_FIELDS = ("identifier", "language", "name", "englishName",
+                      "format", "type", "direction")
+    SURAH_FIELDS = ("number", "name", "englishName", "englishNameTranslation",
+                    "numberOfAyahs", "revelationType")
+    AYAH_FIELDS = ("number", "surah", "numberInSurah", "juz", "manzil",
+                   "page", "ruku", "hizbQuarter", "sajda")
+    DIVISIONS = ("juz", "manzil", "page", "ruku", "hizbQuarter")
+
+    def __init__(self, db_path="data/corpus.db"):
+        """
+        Initialize the corpus store.
+
+        The database file is only created once an edition is installed.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+        """
+        self.db_path = db_path
+        self._conn = None
+        self._lock = threading.RLock()
+        # Serializes writers; always taken before _lock
+        self._write_lock = threading.Lock()
+        self._editions = None
+
+    def _connect(self, create=False):
+        """
+        Open the database connection if needed.
+
+        Args:
+            create (bool): Whether to create the database if it is missing.
+
+        Returns:
+            sqlite3.Connection: The connection, or None if there is no store yet.
+        """
+        if self._conn is not None:
+            return self._conn
+
+        if not create and not os.path.exists(self.db_path):
+            return None
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Readers keep seeing the last committed editions while one is written
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._create_schema()
+        return self._conn
+
+    def _create_schema(self):
+        """Create the tables and reset them if the schema version changed."""
+        conn = self._conn
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+        if version not in (0, self.SCHEMA_VERSION):
+            for table in ("texts", "ayahs", "surahs", "editions"):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS editions (
+                identifier TEXT PRIMARY KEY,
+                language TEXT,
+                name TEXT,
+                englishName TEXT,
+                format TEXT,
+                type TEXT,
+                direction TEXT,
+                installed_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS surahs (
+                number INTEGER PRIMARY KEY,
+                name TEXT,
+                englishName TEXT,
+                englishNameTranslation TEXT,
+                numberOfAyahs INTEGER,
+                revelationType TEXT
+            );
+            CREATE TABLE IF NOT EXISTS ayahs (
+                number INTEGER PRIMARY KEY,
+                surah INTEGER NOT NULL,
+                numberInSurah INTEGER NOT NULL,
+                juz INTEGER,
+                manzil INTEGER,
+                page INTEGER,
+                ruku INTEGER,
+                hizbQuarter INTEGER,
+                sajda INTEGER
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS ayahs_by_key
+                ON ayahs (surah, numberInSurah);
+            CREATE TABLE IF NOT EXISTS texts (
+                edition TEXT NOT NULL,
+                number INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                PRIMARY KEY (edition, number)
+            ) WITHOUT ROWID;
+        """)
+        conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        conn.commit()
+
+    def _load_editions(self):
+        """
+        Load the metadata of installed editions into memory.
+
+        Returns:
+            dict: Edition metadata keyed by identifier.
+        """
+        if self._editions is None:
+            conn = self._connect()
+            editions = {}
+
+            if conn is not None:
+                columns = ", ".join(self.EDITION_FIELDS)
+                for row in conn.execute(f"SELECT {columns} FROM editions"):
+                    editions[row[0]] = dict(zip(self.EDITION_FIELDS, row))
+
+            self._editions = editions
+
+        return self._editions
+
+    def add_edition(self, edition, surahs):
+        """
+        Store a complete edition.
+
+        Args:
+            edition (dict): Edition metadata as returned by the API.
+            surahs (iterable): Surah objects, each with its list of ayahs.
+
+        Returns:
+            int: Number of ayahs stored.
+
+        Raises:
+            ValueError: If the edition is incomplete.
+        """
+        def records():
+            for surah in surahs:
+                surah_info = dict(surah, numberOfAyahs=len(surah["ayahs"]))
+                for ayah in surah["ayahs"]:
+                    yield surah_info, ayah
+
+        return self.add_ayahs(edition, records())
+
+    def add_ayahs(self, edition, records, batch_size=1000):
+        """
+        Store a complete edition from a stream of ayahs.
+
+        Rows are written in batches inside one transaction, so memory use
+        does not grow with the edition and an incomplete edition leaves the
+        store unchanged. The records are consumed without holding the lock
+        that lookups take; readers see the new edition once it is committed.
+
+        Surah and verse metadata are shared by all editions: fields missing
+        from the records are stored as NULL and filled in by later installs,
+        while fields already stored are kept.
+
+        Args:
+            edition (dict): Edition metadata as returned by the API. It is
+                            only read once the records are exhausted, so a
+                            streaming source may complete it on the way.
+            records (iterable): (surah, ayah) pairs in ayah order. The surah
+                                dict holds SURAH_FIELDS, the ayah dict holds
+                                AYAH_FIELDS (except "surah") and the "text".
+            batch_size (int): Number of ayahs written per batch.
+
+        Returns:
+            int: Number of ayahs stored.
+
+        Raises:
+            ValueError: If the edition is incomplete.
+        """
+        identifier = edition["identifier"]
+        surah_rows = []
+        ayah_rows = []
+        text_rows = []
+        count = 0
+        last_surah = None
+
+        with self._write_lock:
+            with self._lock:
+                self._connect(create=True)
+
+            # The records may come from a download, so they are written through
+            # a separate connection without holding the lock readers need
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            try:
+                conn.execute("DELETE FROM texts WHERE edition = ?", (identifier,))
+
+                for surah, ayah in records:
+                    if surah["number"] != last_surah:
+                        last_surah = surah["number"]
+                        surah_rows.append(tuple(surah.get(field) for field in self.SURAH_FIELDS))
+
+                    row = dict(ayah, surah=last_surah)
+                    if "sajda" in row:
+                        row["sajda"] = 1 if row["sajda"] else 0
+                    ayah_rows.append(tuple(row.get(field) for field in self.AYAH_FIELDS))
+                    text_rows.append((identifier, ayah["number"], ayah["text"]))
+                    count += 1
+
+                    if len(text_rows) >= batch_size:
+                        self._write_rows(conn, surah_rows, ayah_rows, text_rows)
+
+                self._write_rows(conn, surah_rows, ayah_rows, text_rows)
+
+                if count != self.TOTAL_VERSES:
+                    raise ValueError(
+                        f"Edition {identifier} has {count} ayahs, "
+                        f"expected {self.TOTAL_VERSES}"
+                    )
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO editions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    tuple(edition.get(field) for field in self.EDITION_FIELDS) + (time.time(),)
+                )
+
+                with self._lock:
+                    conn.commit()
+                    self._editions = None
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+
+        return count
+
+    def _write_rows(self, conn, surah_rows, ayah_rows, text_rows):
+        """
+        Write and empty one batch of rows.
+
+        Args:
+            conn (sqlite3.Connection): The connection, inside a transaction.
+            surah_rows (list): Surah rows in SURAH_FIELDS order.
+            ayah_rows (list): Ayah rows in AYAH_FIELDS order.
+            text_rows (list): (edition, number, text) rows.
+        """
+        # New values replace stored surah fields unless they are missing
+        surah_updates = ", ".join(f"{field} = COALESCE(excluded.{field}, {field})"
+                                  for field in self.SURAH_FIELDS[1:])
+        conn.executemany(
+            f"INSERT INTO surahs VALUES (?, ?, ?, ?, ?, ?) "
+            f"ON CONFLICT (number) DO UPDATE SET {surah_updates}",
+            surah_rows
+        )
+        # Verse metadata is shared, so only fill in what is still missing
+        ayah_updates = ", ".join(f"{field} = COALESCE({field}, excluded.{field})"
+                                 for field in self.AYAH_FIELDS[3:])
+        conn.executemany(
+            f"INSERT INTO ayahs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            f"ON CONFLICT (number) DO UPDATE SET {ayah_updates}",
+            ayah_rows
+        )
+        conn.executemany("INSERT INTO texts VALUES (?, ?, ?)", text_rows)
+        del surah_rows[:], ayah_rows[:], text_rows[:]
+
+    def remove_edition(self, identifier):
+        """
+        Remove an installed edition.
+
+        Args:
+            identifier (str): The edition identifier.
+
+        Returns:
+            bool: True if the edition was installed, False otherwise.
+        """
+        with self._write_lock, self._lock:
+            if identifier not in self._load_editions():
+                return False
+
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM texts WHERE edition = ?", (identifier,))
+                conn.execute("DELETE FROM editions WHERE identifier = ?", (identifier,))
+            self._editions = None
+            return True
+
+    def has_edition(self, identifier):
+        """
+        Check whether an edition is installed.
+
+        Args:
+            identifier (str): The edition identifier.
+
+        Returns:
+            bool: True if installed.
+        """
+        with self._lock:
+            return identifier in self._load_editions()
+
+    def list_editions(self):
+        """
+        Get the metadata of all installed editions.
+
+        Returns:
+            list: List of edition dicts.
+        """
+        with self._lock:
+            return [dict(edition) for edition in self._load_editions().values()]
+
+    def _select_ayahs(self, condition, params, editions):
+        """
+        Build API-shaped ayah data for every ayah matching a condition.
+
+        Args:
+            condition (str): SQL condition on the ayahs table.
+            params (tuple): Parameters of the condition.
+            editions (list): Edition identifiers, all of which must be installed.
+
+        Returns:
+            list: One list of per-edition ayah dicts for each matching ayah,
+                  in ayah order, or None if an edition is not installed.
+        """
+        installed = self._load_editions()
+        if not editions or any(identifier not in installed for identifier in editions):
+            return None
+
+        conn = self._conn
+        ayahs = []
+        surahs = {}
+        for row in conn.execute(
+            f"SELECT {', '.join(self.AYAH_FIELDS)} FROM ayahs WHERE {condition} ORDER BY number",
+            params
+        ):
+            ayah = dict(zip(self.AYAH_FIELDS, row))
+            ayah["sajda"] = bool(ayah["sajda"])
+            ayahs.append(ayah)
+            surahs[ayah["surah"]] = None
+
+        if not ayahs:
+            return []
+
+        for number in surahs:
+            row = conn.execute(
+                f"SELECT {', '.join(self.SURAH_FIELDS)} FROM surahs WHERE number = ?",
+                (number,)
+            ).fetchone()
+            surahs[number] = dict(zip(self.SURAH_FIELDS, row))
+
+        texts = {}
+        first, last = ayahs[0]["number"], ayahs[-1]["number"]
+        for identifier in editions:
+            texts[identifier] = dict(conn.execute(
+                "SELECT number, text FROM texts WHERE edition = ? AND number BETWEEN ? AND ?",
+                (identifier, first, last)
+            ))
+
+        result = []
+        for ayah in ayahs:
+            entries = []
+            for identifier in editions:
+                entry = dict(ayah)
+                entry["text"] = texts[identifier][ayah["number"]]
+                entry["edition"] = dict(installed[identifier])
+                entry["surah"] = dict(surahs[ayah["surah"]])
+                entries.append(entry)
+            result.append(entries)
+
+        return result
+
+    def get_ayah(self, reference, editions):
+        """
+        Get an ayah in one or more installed editions.
+
+        The result has the same shape as the API's
+        ``/ayah/{reference}/editions/{editions}`` response data.
+
+        Args:
+            reference (int or str): Ayah number or "surah:ayah" reference.
+            editions (list): Edition identifiers, all of which must be installed.
+
+        Returns:
+            list: One ayah dict per edition, or None if unavailable.
+        """
+        with self._lock:
+            if not self._load_editions():
+                return None
+
+            number = parse_reference(reference)
+            if number is None:
+                return None
+
+            ayahs = self._select_ayahs("number = ?", (number,), editions)
+            return ayahs[0] if ayahs else None
+
+    def get_surah(self, number, editions):
+        """
+        Get every ayah of a surah in one or more installed editions.
+
+        Args:
+            number (int): The surah number.
+            editions (list): Edition identifiers, all of which must be installed.
+
+        Returns:
+            list: Per-ayah lists of edition entries, or None if unavailable.
+        """
+        with self._lock:
+            return self._select_ayahs("surah = ?", (number,), editions) or None
+
+    def get_page(self, number, editions):
+        """
+        Get every ayah on a mushaf page in one or more installed editions.
+
+        Args:
+            number (int): The page number.
+            editions (list): Edition identifiers, all of which must be installed.
+
+        Returns:
+            list: Per-ayah lists of edition entries, or None if unavailable.
+        """
+        return self.get_division("page", number, editions)
+
+    def get_division(self, division, number, editions):
+        """
+        Get every ayah of a juz, manzil, page, ruku or hizb quarter.
+
+        Args:
+            division (str): One of DIVISIONS.
+            number (int): The part number.
+            editions (list): Edition identifiers, all of which must be installed.
+
+        Returns:
+            list: Per-ayah lists of edition entries, or None if unavailable.
+        """
+        if division not in self.DIVISIONS:
+            return None
+
+        with self._lock:
+            return self._select_ayahs(f"{division} = ?", (number,), editions) or None
+
+    def get_division_starts(self):
+        """
+        Get the first ayah of every part of each division.
+
+        Returns:
+            dict: Division name mapped to ascending ayah numbers, or None if
+                  no edition is installed.
+        """
+        with self._lock:
+            if not self._load_editions():
+                return None
+
+            starts = {}
+            for division in self.DIVISIONS:
+                # Editions imported without division data leave it NULL
+                numbers = [row[0] for row in self._conn.execute(
+                    f"SELECT MIN(number) FROM ayahs WHERE {division} IS NOT NULL "
+                    f"GROUP BY {division} ORDER BY {division}"
+                )]
+                if numbers:
+                    starts[division] = numbers
+            return starts
+
+    def add_division_starts(self, starts):
+        """
+        Fill in division data that the installed editions did not provide.
+
+        Values already stored are kept.
+
+        Args:
+            starts (dict): Division name mapped to the ascending ayah numbers
+                           at which its parts start.
+
+        Returns:
+            bool: True if the data was stored, False if no edition is installed
+                  or the database could not be written.
+        """
+        with self._write_lock, self._lock:
+            if not self._load_editions():
+                return False
+
+            try:
+                with self._conn:
+                    for division, numbers in starts.items():
+                        if division not in self.DIVISIONS:
+                            continue
+                        ends = list(numbers[1:]) + [self.TOTAL_VERSES + 1]
+                        self._conn.executemany(
+                            f"UPDATE ayahs SET {division} = ? "
+                            f"WHERE number >= ? AND number < ? AND {division} IS NULL",
+                            [(part, start, end) for part, (start, end)
+                             in enumerate(zip(numbers, ends), start=1)]
+                        )
+                return True
+            except sqlite3.Error as e:
+                print(f"Error storing division data: {str(e)}")
+                return False
+
+    def get_texts(self, edition):
+        """
+        Get every ayah text of an installed edition.
+
+        Args:
+            edition (str): An installed edition identifier.
+
+        Returns:
+            list: (ayah number, text) pairs in ayah order, or None if the
+                  edition is not installed.
+        """
+        with self._lock:
+            if edition not in self._load_editions():
+                return None
+
+            return self._conn.execute(
+                "SELECT number, text FROM texts WHERE edition = ? ORDER BY number",
+                (edition,)
+            ).fetchall()
+
+    def verses_by_length(self, edition, min_length, max_length):
+        """
+        Find the ayahs whose text length lies in a range.
+
+        Args:
+            edition (str): An installed edition identifier.
+            min_length (int): Minimum text length in characters.
+            max_length (int): Maximum text length in characters.
+
+        Returns:
+            list: Ascending ayah numbers, or None if the edition is not installed.
+        """
+        with self._lock:
+            if edition not in self._load_editions():
+                return None
+
+            return [row[0] for row in self._conn.execute(
+                "SELECT number FROM texts WHERE edition = ? AND length(text) BETWEEN ? AND ? "
+                "ORDER BY number",
+                (edition, min_length, max_length)
+            )]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._editions = None
+
+
+def main(argv=None):
+    """
+    Command line entry point for managing offline editions.
+
+    Args:
+        argv (list, optional): Command line arguments.
+    """
+    import argparse
+    from src.api_service import APIService
+    from src.tanzil_importer import import_edition, make_edition
+
+    parser = argparse.ArgumentParser(description="Manage offline Quran editions.")
+    parser.add_argument("--db", default="data/corpus.db", help="Path to the corpus database")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    install_parser = subparsers.add_parser("install", help="Download editions")
+    install_parser.add_argument("editions", nargs="+")
+    remove_parser = subparsers.add_parser("remove", help="Remove editions")
+    remove_parser.add_argument("editions", nargs="+")
+    subparsers.add_parser("list", help="List installed editions")
+    import_parser = subparsers.add_parser("import", help="Import a Tanzil text or XML file")
+    import_parser.add_argument("file")
+    import_parser.add_argument("edition", help="Identifier to install the edition as")
+    import_parser.add_argument("--metadata", help="Tanzil quran-data.xml with surah and division data")
+    import_parser.add_argument("--language", help="Language code of the edition")
+    import_parser.add_argument("--name", help="Display name of the edition")
+    args = parser.parse_args(argv)
+
+    api = APIService(corpus_store=CorpusStore(args.db))
+
+    if args.command == "install":
+        for identifier in args.editions:
+            status = "installed" if api.install_edition(identifier) else "failed"
+            print(f"{identifier}: {status}")
+    elif args.command == "remove":
+        for identifier in args.editions:
+            status = "removed" if api.remove_edition(identifier) else "not installed"
+            print(f"{identifier}: {status}")
+    elif args.command == "import":
+        edition = make_edition(args.edition, args.language, args.name)
+        try:
+            count = import_edition(api.corpus_store, args.file, edition, args.metadata)
+            print(f"{args.edition}: imported {count} ayahs")
+        except (OSError, SyntaxError, ValueError) as e:
+            print(f"{args.edition}: failed ({e})")
+    else:
+        for edition in api.list_installed_editions():
+            print(f"{edition['identifier']} - {edition['englishName']} ({edition['language']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+HTTP Transport for Qur'anic Verse Application
+
+This module provides a pooled, keep-alive HTTP session with timeouts and
+per-request timing counters.
+"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HTTPTransport:
+    """
+    Shared HTTP session used by the API service.
+
+    Connections are kept alive and reused across requests, so only the
+    first request to a host pays for the TCP (and TLS) handshake.
+    """
+
+    def __init__(self, pool_size=4, connect_timeout=5.0, read_timeout=15.0, keep_alive=True):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_size (int): Maximum number of pooled connections per host.
+            connect_timeout (float): Seconds to wait for a connection.
+            read_timeout (float): Seconds to wait between bytes of the response.
+            keep_alive (bool): Whether connections are reused between requests.
+        """
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+        self.session = requests.Session()
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive" if keep_alive else "close"
+        })
+
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        """
+        Send a GET request through the pooled session.
+
+        Args:
+            url (str): The URL to request.
+            headers (dict, optional): Extra request headers.
+            timeout (float or tuple, optional): Overrides the default timeouts.
+            stream (bool): Return once the headers have arrived and leave the
+                           body to be read with ``response.iter_content``.
+                           The caller must close the response.
+
+        Returns:
+            requests.Response: The response.
+
+        Raises:
+            requests.RequestException: If the request failed.
+        """
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, headers=headers, timeout=timeout or self.timeout,
+                                        stream=stream)
+        except requests.RequestException:
+            self._record(time.perf_counter() - start, 0, failed=True)
+            raise
+
+        self._record(time.perf_counter() - start, self.wire_size(response, read_body=not stream))
+        return response
+
+    @staticmethod
+    def wire_size(response, read_body=True):
+        """
+        Get the number of body bytes received for a response.
+
+        Args:
+            response (requests.Response): The response.
+            read_body (bool): Whether the body may be read to measure it when
+                              there is no Content-Length header.
+
+        Returns:
+            int: Body size as sent on the wire (compressed if gzipped).
+        """
+        try:
+            return int(response.headers["Content-Length"])
+        except (KeyError, TypeError, ValueError):
+            return len(response.content or b"") if read_body else 0
+
+    def _record(self, elapsed, size, failed=False):
+        """
+        Record the timing of one request.
+
+        Args:
+            elapsed (float): Request duration in seconds.
+            size (int): Bytes received.
+            failed (bool): Whether the request raised an error.
+        """
+        with self._lock:
+            self._requests += 1
+            self._errors += 1 if failed else 0
+            self._bytes_received += size
+            self._total_time += elapsed
+            self._max_time = max(self._max_time, elapsed)
+
+    def connections_opened(self):
+        """
+        Get the number of connections opened by the pool so far.
+
+        Returns:
+            int: Number of new TCP connections.
+        """
+        pools = self.adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+    def stats(self):
+        """
+        Get the transport statistics.
+
+        Returns:
+            dict: Request count, errors, bytes, timings (seconds) and connections opened.
+        """
+        with self._lock:
+            requests_sent = self._requests
+            stats = {
+                "requests": requests_sent,
+                "errors": self._errors,
+                "bytes_received": self._bytes_received,
+                "total_time": self._total_time,
+                "average_time": self._total_time / requests_sent if requests_sent else 0.0,
+                "max_time": self._max_time
+            }
+        stats["connections_opened"] = self.connections_opened()
+        return stats
+
+    def reset_stats(self):
+        """Reset the timing counters."""
+        with self._lock:
+            self._requests = 0
+            self._errors = 0
+            self._bytes_received = 0
+            self._total_time = 0.0
+            self._max_time = 0.0
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
@@ -31,6 +31,14 @@ class IntegratedApplication:
         
         # Set up the UI
         self._setup_ui()
+        
+        # Write pending settings before the window closes
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+    
+    def _on_close(self):
+        """Flush pending configuration changes and close the window."""
+        self.config_manager.close()
+        self.root.destroy()
     
     def _setup_ui(self):
         """Set up the main user interface."""
@@ -0,0 +1,187 @@
+"""
+JSON Stream for Qur'anic Verse Application
+
+This module parses JSON documents incrementally, so large API responses
+can be processed while they download instead of being held in memory.
+"""
+
+import codecs
+import json
+import re
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """
+    Buffer over a stream of byte chunks.
+
+    Consumed text is dropped whenever a new chunk is read, so the buffer
+    holds at most one chunk plus the value being decoded.
+    """
+
+    def __init__(self, chunks):
+        """
+        Initialize the reader.
+
+        Args:
+            chunks (iterable): UTF-8 encoded byte chunks of the document.
+        """
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+
+    def fill(self):
+        """
+        Append the next chunk to the buffer.
+
+        Returns:
+            bool: False if the input is exhausted.
+        """
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self.buffer = self.buffer[self.pos:] + text
+                self.pos = 0
+                return True
+
+        text = self._utf8.decode(b"", final=True)
+        if text:
+            self.buffer = self.buffer[self.pos:] + text
+            self.pos = 0
+            return True
+        return False
+
+    def peek(self):
+        """
+        Skip whitespace and get the next character.
+
+        Returns:
+            str: The character, or "" at the end of the input.
+        """
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, characters):
+        """
+        Consume the next character, which must be one of characters.
+
+        Args:
+            characters (str): The allowed characters.
+
+        Returns:
+            str: The character.
+
+        Raises:
+            ValueError: If another character (or the end of input) follows.
+        """
+        char = self.peek()
+        if not char or char not in characters:
+            raise ValueError(f"Invalid JSON: expected one of {characters!r}, found {char!r}")
+        self.pos += 1
+        return char
+
+    def decode(self):
+        """
+        Decode the complete value at the current position.
+
+        Returns:
+            The decoded value.
+
+        Raises:
+            json.JSONDecodeError: If the value is invalid or truncated.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Most likely the value continues in the next chunk
+                if not self.fill():
+                    raise
+                continue
+
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self.buffer[self.pos] in "-0123456789" and self.fill():
+                continue
+
+            self.pos = end
+            return value
+
+
+def iter_json(chunks, materialize=()):
+    """
+    Parse a JSON document incrementally.
+
+    Values are identified by their path: object keys and "item" for array
+    elements, joined by dots, e.g. "data.surahs.item.number". Every scalar
+    value is yielded as soon as it has been read. Values at a path listed in
+    ``materialize`` are decoded as a whole and yielded instead of being
+    descended into; no other container is ever held in memory.
+
+    Args:
+        chunks (iterable): UTF-8 encoded byte chunks of the document, e.g.
+                           ``response.iter_content(65536)``.
+        materialize (iterable): Paths of the containers to yield whole.
+
+    Yields:
+        tuple: (path, value) in document order.
+
+    Raises:
+        ValueError: If the document is not valid JSON (json.JSONDecodeError
+                    is a subclass).
+    """
+    reader = _Reader(chunks)
+    yield from _walk(reader, "", frozenset(materialize))
+
+    if reader.peek():
+        raise ValueError("Invalid JSON: extra data after the document")
+
+
+def _walk(reader, path, materialize):
+    """
+    Parse the value at the reader's position.
+
+    Args:
+        reader (_Reader): The input.
+        path (str): Path of the value.
+        materialize (frozenset): Paths of the containers to yield whole.
+
+    Yields:
+        tuple: (path, value) pairs, see iter_json.
+    """
+    char = reader.peek()
+
+    if char not in ("{", "[") or path in materialize:
+        yield path, reader.decode()
+        return
+
+    reader.pos += 1
+    prefix = f"{path}." if path else ""
+
+    if char == "{":
+        if reader.peek() == "}":
+            reader.pos += 1
+            return
+        while True:
+            if reader.peek() != '"':
+                raise ValueError(f"Invalid JSON: expected a key in {path or 'the document'}")
+            key = reader.decode()
+            reader.expect(":")
+            yield from _walk(reader, prefix + key, materialize)
+            if reader.expect(",}") == "}":
+                return
+    else:
+        if reader.peek() == "]":
+            reader.pos += 1
+            return
+        while True:
+            yield from _walk(reader, prefix + "item", materialize)
+            if reader.expect(",]") == "]":
+                return
@@ -0,0 +1,97 @@
+"""
+Latency Tracker for Qur'anic Verse Application
+
+This module keeps recent request latencies and derives the tail-latency
+percentiles used to decide when to hedge a slow request.
+"""
+
+import threading
+from collections import deque
+
+
+class LatencyTracker:
+    """
+    Sliding window of request latencies.
+
+    Only the newest ``window`` samples are kept, so the percentiles follow
+    the API as it speeds up or slows down.
+    """
+
+    def __init__(self, window=256, min_samples=20, hedge_percentile=0.95):
+        """
+        Initialize the tracker.
+
+        Args:
+            window (int): Number of recent latencies kept.
+            min_samples (int): Samples needed before hedge_delay returns a value.
+            hedge_percentile (float): Percentile a request must exceed to be hedged.
+        """
+        self.min_samples = min_samples
+        self.hedge_percentile = hedge_percentile
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def record(self, seconds):
+        """
+        Record the latency of a completed request.
+
+        Args:
+            seconds (float): The request duration.
+        """
+        with self._lock:
+            self._samples.append(seconds)
+            self.recorded += 1
+
+    def percentile(self, fraction):
+        """
+        Get a latency percentile of the window.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.95.
+
+        Returns:
+            float: The latency in seconds, or None if nothing was recorded.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def hedge_delay(self):
+        """
+        Get how long to wait for a request before sending a hedged duplicate.
+
+        Returns:
+            float: The hedge percentile of the window, or None while fewer
+                   than min_samples latencies are known.
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+        return self.percentile(self.hedge_percentile)
+
+    def stats(self):
+        """
+        Get the latency statistics.
+
+        Returns:
+            dict: Sample counts and the p50, p95, p99 and maximum latency in seconds.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+            recorded = self.recorded
+
+        def pick(fraction):
+            return samples[min(len(samples) - 1, int(fraction * len(samples)))] if samples else None
+
+        return {
+            "recorded": recorded,
+            "window": len(samples),
+            "p50": pick(0.50),
+            "p95": pick(0.95),
+            "p99": pick(0.99),
+            "max": samples[-1] if samples else None
+        }
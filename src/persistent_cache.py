@@ -0,0 +1,235 @@
+"""
+Persistent Cache for Qur'anic Verse Application
+
+This module stores API responses in a local SQLite database so they
+survive application restarts.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class PersistentCache:
+    """
+    On-disk cache tier with per-entry expiry.
+
+    Entries are stored as JSON under a JSON-encoded key. The whole cache is
+    discarded when ``SCHEMA_VERSION`` or the caller-supplied ``version``
+    changes, so stale layouts are never read back.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path="data/cache.db", ttl=30 * 24 * 3600, version=1,
+                 compact_ratio=0.25):
+        """
+        Initialize the persistent cache.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+            ttl (float): Default time-to-live of entries in seconds.
+            version (int): Version of the cached data format.
+            compact_ratio (float): Fraction of expired entries above which
+                                   the cache is compacted when opened.
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.version = version
+        self.compact_ratio = compact_ratio
+        self._conn = None
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def _connect(self):
+        """
+        Open the database, resetting it if the stored version differs.
+
+        Returns:
+            sqlite3.Connection: The connection.
+        """
+        if self._conn is not None:
+            return self._conn
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+
+        expected = {"schema": self.SCHEMA_VERSION, "data": self.version}
+        stored = dict(conn.execute("SELECT name, value FROM meta"))
+        if stored and stored != expected:
+            conn.execute("DELETE FROM entries")
+        conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", expected.items())
+        conn.commit()
+
+        self._conn = conn
+        self._compact_if_needed()
+        return conn
+
+    def _compact_if_needed(self):
+        """Compact the cache when enough of it has expired."""
+        total, expired = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(expires_at <= ?), 0) FROM entries",
+            (time.time(),)
+        ).fetchone()
+
+        if expired and expired >= total * self.compact_ratio:
+            self.compact()
+
+    @staticmethod
+    def _encode_key(key):
+        """Encode a cache key (string, number or tuple) as text."""
+        return json.dumps(key, ensure_ascii=False, separators=(",", ":"))
+
+    def get(self, key, default=None):
+        """
+        Get a cached value if it has not expired.
+
+        Args:
+            key: The cache key.
+            default: Value returned when the key is missing or expired.
+
+        Returns:
+            The cached value or default.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?",
+                (self._encode_key(key),)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return default
+
+            if row[1] <= time.time():
+                self.expired += 1
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            return json.loads(row[0])
+
+    def get_stale(self, key, default=None):
+        """
+        Get a cached value even if it has expired.
+
+        Used as a fallback when fresh data cannot be fetched. Expired
+        entries stay readable until the cache is compacted.
+
+        Args:
+            key: The cache key.
+            default: Value returned when the key is missing.
+
+        Returns:
+            The cached value or default.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value FROM entries WHERE key = ?",
+                (self._encode_key(key),)
+            ).fetchone()
+
+            if row is None:
+                return default
+            return json.loads(row[0])
+
+    def put(self, key, value, ttl=None):
+        """
+        Store a value.
+
+        Args:
+            key: The cache key.
+            value: A JSON-serializable value.
+            ttl (float, optional): Time-to-live in seconds. Defaults to the cache TTL.
+        """
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        encoded = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                    (self._encode_key(key), encoded, now, expires_at)
+                )
+
+    def delete(self, key):
+        """
+        Remove a value.
+
+        Args:
+            key: The cache key.
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM entries WHERE key = ?", (self._encode_key(key),))
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM entries")
+
+    def compact(self):
+        """
+        Remove expired entries and reclaim their disk space.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                removed = conn.execute(
+                    "DELETE FROM entries WHERE expires_at <= ?", (time.time(),)
+                ).rowcount
+            conn.execute("VACUUM")
+            return removed
+
+    def stats(self):
+        """
+        Get the cache statistics.
+
+        Returns:
+            dict: Entry count, file size, hits, misses and expired lookups.
+        """
+        with self._lock:
+            entries = self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return {
+                "entries": entries,
+                "file_bytes": os.path.getsize(self.db_path),
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired
+            }
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,464 @@
+"""
+Verse Providers for Qur'anic Verse Application
+
+This module adapts the verse sources the application can use (the
+AlQuran.cloud API, the Quran.com API and the offline corpus) to one
+interface, and routes each request to the provider that has recently
+been fastest and most reliable for that kind of request.
+"""
+
+import random
+import re
+import threading
+import time
+
+from src.http_transport import HTTPTransport
+from src.rate_limiter import TokenBucketRateLimiter
+from src.verse_keys import TOTAL_SURAHS, format_reference
+
+
+class VerseProvider:
+    """
+    A source of verses.
+
+    Providers return data shaped like the AlQuran.cloud API, which is what
+    APIService caches and VerseManager formats:
+
+    - "verse" requests return one ayah entry per edition;
+    - "surah" requests return one such list per ayah of the surah.
+    """
+
+    name = "provider"
+    KINDS = ()
+
+    def supports(self, kind, identifiers):
+        """
+        Check whether the provider can answer a request.
+
+        Args:
+            kind (str): "verse" or "surah".
+            identifiers (list): Edition identifiers.
+
+        Returns:
+            bool: True if the provider serves this kind and every edition.
+        """
+        return kind in self.KINDS and all(self.has_edition(identifier) for identifier in identifiers)
+
+    def has_edition(self, identifier):
+        """
+        Check whether the provider serves an edition.
+
+        Args:
+            identifier (str): The edition identifier.
+
+        Returns:
+            bool: True if the edition is available.
+        """
+        return True
+
+    def fetch(self, kind, number, identifiers, deadline=None):
+        """
+        Answer a request.
+
+        Args:
+            kind (str): "verse" or "surah".
+            number (int): Global ayah number for verses, surah number for surahs.
+            identifiers (list): Edition identifiers.
+            deadline (Deadline, optional): Time budget of the request.
+
+        Returns:
+            list: The verse or surah data, or None if it could not be fetched.
+        """
+        if kind == "verse":
+            return self.get_verse(number, identifiers, deadline)
+        if kind == "surah":
+            return self.get_surah(number, identifiers, deadline)
+        return None
+
+    def get_verse(self, number, identifiers, deadline=None):
+        """Get one verse; see fetch."""
+        return None
+
+    def get_surah(self, number, identifiers, deadline=None):
+        """Get every ayah of a surah; see fetch."""
+        return None
+
+
+class LocalProvider(VerseProvider):
+    """
+    Provider backed by the editions installed in the offline corpus.
+    """
+
+    name = "local"
+    KINDS = ("verse", "surah")
+
+    def __init__(self, corpus_store):
+        """
+        Initialize the provider.
+
+        Args:
+            corpus_store (CorpusStore): The offline corpus.
+        """
+        self.corpus_store = corpus_store
+
+    def has_edition(self, identifier):
+        return self.corpus_store.has_edition(identifier)
+
+    def get_verse(self, number, identifiers, deadline=None):
+        return self.corpus_store.get_ayah(number, identifiers)
+
+    def get_surah(self, number, identifiers, deadline=None):
+        return self.corpus_store.get_surah(number, identifiers)
+
+
+class AlQuranCloudProvider(VerseProvider):
+    """
+    Provider for the AlQuran.cloud API.
+
+    Requests go through the APIService request path, so they share its
+    rate limiter, retries, circuit breakers and hedging.
+    """
+
+    name = "alquran.cloud"
+    KINDS = ("verse", "surah")
+
+    def __init__(self, api_service):
+        """
+        Initialize the provider.
+
+        Args:
+            api_service (APIService): The service whose request path is used.
+        """
+        self.api_service = api_service
+
+    def get_verse(self, number, identifiers, deadline=None):
+        return self.api_service._request(
+            f"/ayah/{format_reference(number)}/editions/{','.join(identifiers)}",
+            f"verse {format_reference(number)}", deadline
+        )
+
+    def get_surah(self, number, identifiers, deadline=None):
+        data = self.api_service._request(
+            f"/surah/{number}/editions/{','.join(identifiers)}", f"surah {number}", deadline
+        )
+        if data is None:
+            return None
+
+        if isinstance(data, dict):
+            data = [data]
+
+        units = []
+        for surah in data:
+            surah_info = {key: value for key, value in surah.items()
+                          if key not in ("ayahs", "edition")}
+            units.append([dict(ayah, edition=surah["edition"], surah=surah_info)
+                          for ayah in surah["ayahs"]])
+        return [list(entries) for entries in zip(*units)]
+
+
+class QuranComProvider(VerseProvider):
+    """
+    Provider for the Quran.com API (v4).
+
+    Quran.com identifies translations by numeric resource ids, so only the
+    editions listed in ``TRANSLATIONS`` (and the Uthmani Arabic text) are
+    served. Responses are normalized to AlQuran.cloud entries; surah names
+    come from the /chapters list, fetched once. Quran.com encodes its
+    Uthmani text differently from AlQuran.cloud, so it is served in place
+    of quran-uthmani under its own identifier, ``ARABIC_EDITION``.
+    """
+
+    name = "quran.com"
+    KINDS = ("verse",)
+    BASE_URL = "https://api.quran.com/api/v4"
+    ARABIC_EDITION = "qurancom-uthmani"
+
+    # AlQuran.cloud edition identifier -> Quran.com translation resource id
+    TRANSLATIONS = {
+        "en.sahih": 20,
+        "en.pickthall": 19,
+        "en.yusufali": 22,
+        "en.hilali": 203,
+    }
+
+    FOOTNOTES = re.compile(r"<sup[^>]*>.*?</sup>", re.DOTALL)
+    TAGS = re.compile(r"<[^>]+>")
+
+    def __init__(self, transport=None, rate_limiter=None, base_url=None):
+        """
+        Initialize the provider.
+
+        Args:
+            transport (HTTPTransport, optional): HTTP session to use. Defaults
+                                                 to a new one.
+            rate_limiter (TokenBucketRateLimiter, optional): Limiter for this API.
+                                                             Defaults to one
+                                                             request per second.
+            base_url (str, optional): Overrides BASE_URL.
+        """
+        self.transport = transport if transport is not None else HTTPTransport()
+        self.rate_limiter = (rate_limiter if rate_limiter is not None
+                             else TokenBucketRateLimiter(rate=1.0, burst=3))
+        self.base_url = base_url or self.BASE_URL
+        self._chapters = None
+        self._lock = threading.Lock()
+
+    def has_edition(self, identifier):
+        return identifier in ("quran-uthmani", self.ARABIC_EDITION) or identifier in self.TRANSLATIONS
+
+    def _get(self, path, deadline=None):
+        """
+        Send a rate-limited GET request.
+
+        Args:
+            path (str): Path and query below the base URL.
+            deadline (Deadline, optional): Time budget of the request.
+
+        Returns:
+            dict: The decoded JSON body, or None if the request failed.
+        """
+        max_wait = deadline.remaining() if deadline is not None else None
+        if self.rate_limiter.acquire(max_wait) is None:
+            print(f"Error fetching {path} from Quran.com: rate limited past the deadline")
+            return None
+        timeout = deadline.timeout(self.transport.timeout) if deadline is not None else None
+
+        try:
+            response = self.transport.get(f"{self.base_url}{path}", timeout=timeout)
+            if response.status_code != 200:
+                print(f"Quran.com request failed with status code: {response.status_code}")
+                return None
+            return response.json()
+        except Exception as e:
+            print(f"Error fetching {path} from Quran.com: {str(e)}")
+            return None
+
+    def _surah_info(self, number, deadline=None):
+        """
+        Get surah metadata in the AlQuran.cloud format.
+
+        Args:
+            number (int): The surah number.
+            deadline (Deadline, optional): Time budget of the request.
+
+        Returns:
+            dict: The surah fields, with only the number if the chapter list
+                  could not be loaded.
+        """
+        with self._lock:
+            if self._chapters is None:
+                data = self._get("/chapters", deadline)
+                if data is not None and len(data.get("chapters", ())) == TOTAL_SURAHS:
+                    self._chapters = {chapter["id"]: chapter for chapter in data["chapters"]}
+            chapters = self._chapters
+
+        chapter = (chapters or {}).get(number)
+        if chapter is None:
+            return {"number": number}
+
+        return {
+            "number": number,
+            "name": chapter.get("name_arabic"),
+            "englishName": chapter.get("name_simple"),
+            "englishNameTranslation": (chapter.get("translated_name") or {}).get("name"),
+            "numberOfAyahs": chapter.get("verses_count"),
+            "revelationType": "Meccan" if chapter.get("revelation_place") == "makkah" else "Medinan"
+        }
+
+    def _clean(self, text):
+        """Remove footnote markers and HTML tags from a translation."""
+        return self.TAGS.sub("", self.FOOTNOTES.sub("", text or "")).strip()
+
+    def get_verse(self, number, identifiers, deadline=None):
+        translations = [self.TRANSLATIONS[identifier] for identifier in identifiers
+                        if identifier in self.TRANSLATIONS]
+        query = "fields=text_uthmani"
+        if translations:
+            query += "&translations=" + ",".join(str(resource) for resource in translations)
+
+        data = self._get(f"/verses/by_key/{format_reference(number)}?{query}", deadline)
+        verse = data.get("verse") if isinstance(data, dict) else None
+        if not verse or verse.get("id") != number:
+            return None
+
+        texts = {resource.get("resource_id"): self._clean(resource.get("text"))
+                 for resource in verse.get("translations") or ()}
+        base = {
+            "number": number,
+            "numberInSurah": verse.get("verse_number"),
+            "juz": verse.get("juz_number"),
+            "page": verse.get("page_number"),
+            "hizbQuarter": verse.get("rub_el_hizb_number"),
+            "surah": self._surah_info(int(verse["verse_key"].split(":")[0]), deadline)
+        }
+
+        entries = []
+        for identifier in identifiers:
+            if identifier in ("quran-uthmani", self.ARABIC_EDITION):
+                text = verse.get("text_uthmani")
+                edition = {"identifier": self.ARABIC_EDITION, "language": "ar", "format": "text",
+                           "type": "quran", "name": "Quran.com Uthmani"}
+            else:
+                text = texts.get(self.TRANSLATIONS[identifier])
+                edition = {"identifier": identifier, "language": identifier.split(".")[0],
+                           "format": "text", "type": "translation"}
+            if text is None:
+                return None
+            entries.append(dict(base, text=text, edition=edition))
+        return entries
+
+
+class _ProviderStats:
+    """
+    Exponentially weighted latency and error rate of one provider and request kind.
+    """
+
+    def __init__(self):
+        self.latency = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.failures = 0
+
+
+class ProviderRouter:
+    """
+    Send each request to the provider expected to answer it best.
+
+    Providers are ranked per request kind by their smoothed latency plus
+    ``error_penalty`` seconds times their smoothed error rate; providers
+    not yet measured are tried first. A provider that fails or returns
+    nothing is skipped for the next one, until a provider answers or the
+    deadline passes. A small share of requests (``explore``) goes to a
+    random provider first, so rankings follow providers that recover.
+    """
+
+    def __init__(self, providers, smoothing=0.2, error_penalty=2.0, explore=0.05, rng=None):
+        """
+        Initialize the router.
+
+        Args:
+            providers (list): VerseProvider instances, in order of preference
+                              when their scores are equal.
+            smoothing (float): Weight of the newest sample in the averages.
+            error_penalty (float): Seconds added to a provider's score per
+                                   unit of error rate.
+            explore (float): Share of requests sent to a random provider first.
+            rng (random.Random, optional): Source of exploration choices.
+        """
+        self.providers = list(providers)
+        self.smoothing = smoothing
+        self.error_penalty = error_penalty
+        self.explore = explore
+        self._rng = rng if rng is not None else random.Random()
+        self._stats = {}
+        self._lock = threading.Lock()
+        self.failovers = 0
+
+    def _stats_for(self, provider, kind):
+        key = (provider.name, kind)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _ProviderStats()
+        return stats
+
+    def _score(self, provider, kind):
+        """Expected cost of sending a request of this kind to the provider."""
+        stats = self._stats_for(provider, kind)
+        if stats.latency is None:
+            return 0.0
+        return stats.latency + self.error_penalty * stats.error_rate
+
+    def candidates(self, kind, identifiers):
+        """
+        Get the providers able to answer a request, best first.
+
+        Args:
+            kind (str): "verse" or "surah".
+            identifiers (list): Edition identifiers.
+
+        Returns:
+            list: The providers in the order they will be tried.
+        """
+        providers = [provider for provider in self.providers if provider.supports(kind, identifiers)]
+
+        with self._lock:
+            ranked = sorted(providers, key=lambda provider: self._score(provider, kind))
+            if len(ranked) > 1 and self._rng.random() < self.explore:
+                ranked.insert(0, ranked.pop(self._rng.randrange(1, len(ranked))))
+        return ranked
+
+    def fetch(self, kind, number, identifiers, deadline=None):
+        """
+        Answer a request from the best provider, failing over to the others.
+
+        Args:
+            kind (str): "verse" or "surah".
+            number (int): Global ayah number for verses, surah number for surahs.
+            identifiers (list): Edition identifiers.
+            deadline (Deadline, optional): Time budget of the whole request.
+
+        Returns:
+            list: The data of the first provider that answered, or None.
+        """
+        for attempt, provider in enumerate(self.candidates(kind, identifiers)):
+            if deadline is not None and deadline.expired():
+                break
+
+            if attempt:
+                with self._lock:
+                    self.failovers += 1
+
+            start = time.perf_counter()
+            try:
+                data = provider.fetch(kind, number, identifiers, deadline)
+            except Exception as e:
+                print(f"Error fetching {kind} {number} from {provider.name}: {str(e)}")
+                data = None
+
+            self._record(provider, kind, time.perf_counter() - start, data is not None)
+            if data is not None:
+                return data
+
+        return None
+
+    def _record(self, provider, kind, latency, succeeded):
+        """
+        Update a provider's averages with the outcome of one request.
+
+        Args:
+            provider (VerseProvider): The provider.
+            kind (str): The request kind.
+            latency (float): Seconds the request took.
+            succeeded (bool): Whether the provider answered.
+        """
+        with self._lock:
+            stats = self._stats_for(provider, kind)
+            stats.requests += 1
+            stats.failures += 0 if succeeded else 1
+
+            error = 0.0 if succeeded else 1.0
+            stats.error_rate += self.smoothing * (error - stats.error_rate)
+            if stats.latency is None:
+                stats.latency = latency
+            else:
+                stats.latency += self.smoothing * (latency - stats.latency)
+
+    def stats(self):
+        """
+        Get the routing statistics.
+
+        Returns:
+            dict: Failover count and, per provider and request kind, the
+                  request and failure counts, smoothed latency (seconds)
+                  and smoothed error rate.
+        """
+        with self._lock:
+            providers = {}
+            for (name, kind), stats in self._stats.items():
+                providers.setdefault(name, {})[kind] = {
+                    "requests": stats.requests,
+                    "failures": stats.failures,
+                    "latency": stats.latency,
+                    "error_rate": stats.error_rate
+                }
+            return {"failovers": self.failovers, "providers": providers}
@@ -0,0 +1,186 @@
+"""
+Quran Metadata for Qur'anic Verse Application
+
+This module indexes the structural divisions of the Quran (surah, juz,
+hizb, page, manzil, ruku) so verses can be located and grouped locally.
+"""
+
+from array import array
+from bisect import bisect_right
+
+from src.verse_keys import SURAH_OFFSETS, TOTAL_VERSES, parse_reference, verse_id
+
+# First verse (surah, ayah) of each juz and manzil; these never change
+JUZ_STARTS = (
+    (1, 1), (2, 142), (2, 253), (3, 93), (4, 24), (4, 148), (5, 82), (6, 111),
+    (7, 88), (8, 41), (9, 93), (11, 6), (12, 53), (15, 1), (17, 1), (18, 75),
+    (21, 1), (23, 1), (25, 21), (27, 56), (29, 46), (33, 31), (36, 28), (39, 32),
+    (41, 47), (46, 1), (51, 31), (58, 1), (67, 1), (78, 1)
+)
+MANZIL_STARTS = ((1, 1), (5, 1), (10, 1), (17, 1), (26, 1), (37, 1), (50, 1))
+
+
+class QuranMetadata:
+    """
+    Interval index over the Quran's divisions.
+
+    Each division is stored as a sorted ``array('H')`` of the global ayah
+    number at which each of its parts starts, so locating a verse is a
+    binary search and listing a part's verses is a range. Surahs, juz and
+    manzils are built in; pages, hizb quarters and rukus come from the
+    API's ``/meta`` response or an installed corpus.
+    """
+
+    # Division names used by the API's /meta response
+    META_KEYS = {
+        "juz": "juzs",
+        "hizbQuarter": "hizbQuarters",
+        "page": "pages",
+        "manzil": "manzils",
+        "ruku": "rukus"
+    }
+
+    def __init__(self, starts=None):
+        """
+        Initialize the index.
+
+        Args:
+            starts (dict, optional): Division name mapped to the ascending
+                                     global ayah numbers at which its parts
+                                     start. Missing juz and manzil starts
+                                     are filled in from the built-in tables.
+        """
+        self._starts = {"surah": array("H", (offset + 1 for offset in SURAH_OFFSETS[:-1]))}
+        self._starts["juz"] = array("H", (verse_id(*start) for start in JUZ_STARTS))
+        self._starts["manzil"] = array("H", (verse_id(*start) for start in MANZIL_STARTS))
+
+        for division, numbers in (starts or {}).items():
+            numbers = array("H", numbers)
+            if not numbers or numbers[0] != 1 or any(
+                    a >= b for a, b in zip(numbers, numbers[1:])):
+                print(f"Ignoring invalid {division} metadata")
+                continue
+            self._starts[division] = numbers
+
+        # A hizb is four hizb quarters
+        if "hizbQuarter" in self._starts:
+            self._starts["hizb"] = self._starts["hizbQuarter"][::4]
+
+    @classmethod
+    def starts_from_meta(cls, meta):
+        """
+        Read the division starts of the API's ``/meta`` response data.
+
+        Args:
+            meta (dict): The "data" member of the /meta response.
+
+        Returns:
+            dict: Division name mapped to ascending global ayah numbers.
+        """
+        starts = {}
+        for division, key in cls.META_KEYS.items():
+            references = meta.get(key, {}).get("references")
+            if references:
+                numbers = [verse_id(reference["surah"], reference["ayah"])
+                           for reference in references]
+                if None not in numbers:
+                    starts[division] = numbers
+        return starts
+
+    @classmethod
+    def from_meta(cls, meta):
+        """
+        Build the index from the API's ``/meta`` response data.
+
+        Args:
+            meta (dict): The "data" member of the /meta response.
+
+        Returns:
+            QuranMetadata: The index.
+        """
+        return cls(cls.starts_from_meta(meta))
+
+    def divisions(self):
+        """
+        Get the names of the indexed divisions.
+
+        Returns:
+            list: Division names, e.g. ["hizb", "juz", "manzil", ...].
+        """
+        return sorted(self._starts)
+
+    def has_division(self, division):
+        """
+        Check whether a division is indexed.
+
+        Args:
+            division (str): The division name.
+
+        Returns:
+            bool: True if the division is indexed.
+        """
+        return division in self._starts
+
+    def count(self, division):
+        """
+        Get the number of parts in a division.
+
+        Args:
+            division (str): The division name.
+
+        Returns:
+            int: The number of parts, or 0 if the division is not indexed.
+        """
+        return len(self._starts.get(division, ()))
+
+    def division_of(self, division, reference):
+        """
+        Find the part of a division that contains a verse.
+
+        Args:
+            division (str): The division name, e.g. "juz".
+            reference (int or str): Verse reference (number or surah:ayah format).
+
+        Returns:
+            int: The part number (1-based), or None if unknown.
+        """
+        starts = self._starts.get(division)
+        number = parse_reference(reference)
+        if starts is None or number is None:
+            return None
+        return bisect_right(starts, number)
+
+    def locate(self, reference):
+        """
+        Find every indexed division containing a verse.
+
+        Args:
+            reference (int or str): Verse reference (number or surah:ayah format).
+
+        Returns:
+            dict: Division name mapped to part number, or None if the
+                  reference is invalid.
+        """
+        number = parse_reference(reference)
+        if number is None:
+            return None
+        return {division: bisect_right(starts, number)
+                for division, starts in self._starts.items()}
+
+    def verse_range(self, division, number):
+        """
+        Get the verses of one part of a division.
+
+        Args:
+            division (str): The division name, e.g. "juz".
+            number (int): The part number (1-based).
+
+        Returns:
+            range: Global ayah numbers of the part (empty if unknown).
+        """
+        starts = self._starts.get(division)
+        if starts is None or not 1 <= number <= len(starts):
+            return range(0)
+
+        end = starts[number] if number < len(starts) else TOTAL_VERSES + 1
+        return range(starts[number - 1], end)
@@ -0,0 +1,179 @@
+"""
+Rate Limiter for Qur'anic Verse Application
+
+This module provides a thread-safe token bucket shared by all API callers.
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value (str): Either a number of seconds or an HTTP date.
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket allowing ``burst`` immediate requests and ``rate`` per second after.
+
+    Callers reserve a token under a lock and then sleep outside it, so
+    concurrent threads are spaced out fairly without holding the lock
+    while waiting. A 429 response halves the rate and
+    blocks everyone for the server's Retry-After; successful responses
+    restore the rate gradually.
+    """
+
+    def __init__(self, rate=1.0, burst=1, min_rate=0.05, recovery_step=0.1):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate (float): Sustained requests per second.
+            burst (int): Requests allowed back-to-back after an idle period.
+            min_rate (float): Lowest rate the adaptive back-off may reach.
+            recovery_step (float): Fraction of the configured rate restored
+                                   after each successful response.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.recovery_step = recovery_step
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.delayed = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _reserve(self, max_wait=None):
+        """
+        Take a token, possibly one that only becomes available later.
+
+        Args:
+            max_wait (float, optional): Longest acceptable wait in seconds.
+
+        Returns:
+            float: Seconds the caller must wait before sending its request,
+                   or None if that is longer than max_wait (no token is taken).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            wait = max(0.0, (1 - self._tokens) / self.rate, self._blocked_until - now)
+            if max_wait is not None and wait > max_wait:
+                return None
+
+            self._tokens -= 1
+            self.acquired += 1
+            if wait > 0:
+                self.delayed += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def acquire(self, max_wait=None):
+        """
+        Block until a request may be sent.
+
+        Args:
+            max_wait (float, optional): Longest acceptable wait in seconds,
+                                        e.g. the time left before a deadline.
+
+        Returns:
+            float: Seconds spent waiting, or None without waiting if the
+                   request could not be sent within max_wait.
+        """
+        wait = self._reserve(max_wait)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def try_acquire(self):
+        """
+        Take a token only if one is available right now.
+
+        Used for optional requests, such as hedges, that should not queue
+        behind the rate limit.
+
+        Returns:
+            bool: True if a token was taken, False otherwise.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens < 1 or self._blocked_until > now:
+                return False
+
+            self._tokens -= 1
+            self.acquired += 1
+            return True
+
+    def record_throttled(self, retry_after=None):
+        """
+        React to a 429 (Too Many Requests) response.
+
+        Args:
+            retry_after (float, optional): Seconds the server asked us to wait.
+        """
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+
+            delay = retry_after if retry_after is not None else 1.0 / self.rate
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self._tokens = min(self._tokens, 0.0)
+
+    def record_success(self):
+        """Gradually restore the configured rate after a successful response."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery_step)
+
+    def stats(self):
+        """
+        Get the rate limiter statistics.
+
+        Returns:
+            dict: Current rate, acquisitions, delayed acquisitions, 429 responses
+                  and total/average/maximum wait in seconds.
+        """
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "acquired": self.acquired,
+                "delayed": self.delayed,
+                "throttled": self.throttled,
+                "total_wait": self.total_wait,
+                "average_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+                "max_wait": self.max_wait
+            }
@@ -0,0 +1,224 @@
+"""
+Resilience for Qur'anic Verse Application
+
+This module provides the retry policy, circuit breaker and deadlines used
+by the API service to ride out network flaps and slow periods without
+hammering a failing API.
+"""
+
+import random
+import threading
+import time
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+
+    The n-th retry waits a random time between 0 and
+    ``min(max_delay, base_delay * 2 ** (n - 1))`` seconds, so clients that
+    failed together do not retry together.
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=8.0, rng=None):
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_attempts (int): Attempts per request, including the first one.
+            base_delay (float): Upper bound of the first retry delay in seconds.
+            max_delay (float): Upper bound of any retry delay in seconds.
+            rng (random.Random, optional): Source of jitter.
+        """
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng if rng is not None else random.Random()
+
+    def delay(self, retry):
+        """
+        Get the time to wait before a retry.
+
+        Args:
+            retry (int): The retry number, starting at 1.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return self._rng.uniform(0.0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Stop sending requests to an endpoint that keeps failing.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects requests for ``reset_timeout`` seconds. It then lets a single
+    trial request through (half-open): success closes the breaker, failure
+    opens it again. The trial gets its own permit from allow(), so only the
+    trial request itself can hand the probe back with release().
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the breaker.
+            reset_timeout (float): Seconds the breaker stays open.
+            clock (callable): Monotonic time source.
+        """
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial = None
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self):
+        """The breaker state: "closed", "open" or "half-open"."""
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self):
+        """
+        Check whether a request may be sent.
+
+        Returns:
+            The permit to pass to release(): True for a request of a closed
+            breaker, a unique object for the half-open trial, or False if
+            the breaker rejects the request.
+        """
+        with self._lock:
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial = None
+
+            if self._state == self.HALF_OPEN:
+                if self._trial is not None:
+                    self.rejected += 1
+                    return False
+                self._trial = object()
+                return self._trial
+
+            return True
+
+    def record_success(self):
+        """Record a successful request and close the breaker."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial = None
+
+    def record_failure(self):
+        """Record a failed request, opening the breaker if needed."""
+        with self._lock:
+            self._failures += 1
+            self._trial = None
+
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.trips += 1
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+    def release(self, permit):
+        """
+        End a request that neither succeeded nor failed, e.g. one that was
+        rate limited or never sent.
+
+        If the request was the half-open trial, the breaker lets its next
+        trial request through; otherwise nothing changes.
+
+        Args:
+            permit: What allow() returned for the request.
+        """
+        with self._lock:
+            if permit is self._trial:
+                self._trial = None
+
+    def stats(self):
+        """
+        Get the breaker statistics.
+
+        Returns:
+            dict: State, consecutive failures, times opened and rejected requests.
+        """
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "failures": self._failures,
+                "trips": self.trips,
+                "rejected": self.rejected
+            }
+
+
+class Deadline:
+    """
+    Time budget of a call, passed down to every request it makes.
+
+    Retries, backoff sleeps and request timeouts are all cut to what is
+    left of the budget, so a call returns when its budget runs out.
+    """
+
+    def __init__(self, budget, clock=time.monotonic):
+        """
+        Start the deadline.
+
+        Args:
+            budget (float): Seconds the call may take.
+            clock (callable): Monotonic time source.
+        """
+        self.budget = budget
+        self._clock = clock
+        self._expires_at = clock() + budget
+
+    def remaining(self):
+        """
+        Get the time left.
+
+        Returns:
+            float: Seconds until the deadline, 0.0 once it has passed.
+        """
+        return max(0.0, self._expires_at - self._clock())
+
+    def expired(self):
+        """
+        Check whether the deadline has passed.
+
+        Returns:
+            bool: True if no time is left.
+        """
+        return self.remaining() <= 0.0
+
+    def timeout(self, timeout):
+        """
+        Cut a request timeout to the time left.
+
+        Args:
+            timeout (float or tuple): A requests timeout, either one value or
+                                      (connect, read).
+
+        Returns:
+            float or tuple: The timeout, no longer than the time left.
+        """
+        remaining = max(self.remaining(), 0.001)
+        if isinstance(timeout, tuple):
+            return tuple(min(value, remaining) for value in timeout)
+        return min(timeout, remaining)
@@ -0,0 +1,501 @@
+"""
+Search Index for Qur'anic Verse Application
+
+This module provides ranked full-text search over verse texts in any
+number of editions.
+"""
+
+import math
+import re
+import threading
+import unicodedata
+from array import array
+from collections import defaultdict
+
+from src.arabic_text import normalize_arabic
+from src.quran_metadata import QuranMetadata
+from src.verse_keys import TOTAL_VERSES, VERSE_SURAHS
+
+TOKEN_PATTERN = re.compile(r"\w+")
+PHRASE_PATTERN = re.compile(r'"([^"]*)"')
+
+
+def tokenize(text):
+    """
+    Split a text into normalized search terms.
+
+    Combining marks (accents, Arabic vowel signs) are removed, Arabic letter
+    variants are unified and case is folded, so "Mercy" matches "mercy" and
+    Uthmani text matches plain Arabic spelling.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        list: The terms in order.
+    """
+    decomposed = unicodedata.normalize("NFKD", normalize_arabic(text))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return TOKEN_PATTERN.findall(stripped.casefold())
+
+
+class SearchIndex:
+    """
+    Inverted index with BM25 ranking and phrase queries.
+
+    Each (edition, verse) text is a document with a compact integer id.
+    The posting list of a term is an ``array('I')`` of interleaved
+    (document, position) pairs in document order; documents are only ever
+    appended, so editions can be indexed incrementally without a rebuild.
+    BM25 statistics are kept per edition, and a verse's score is its best
+    score in any searched edition.
+    """
+
+    def __init__(self, k1=1.2, b=0.75, tokenizer=tokenize, metadata=None):
+        """
+        Initialize the search index.
+
+        Args:
+            k1 (float): BM25 term frequency saturation.
+            b (float): BM25 document length normalization.
+            tokenizer (callable): Function splitting a text into terms.
+            metadata (QuranMetadata, optional): Division index used for juz
+                                                filters. Defaults to the
+                                                built-in tables.
+        """
+        self.k1 = k1
+        self.b = b
+        self.tokenizer = tokenizer
+        self.metadata = metadata if metadata is not None else QuranMetadata()
+        self._postings = defaultdict(lambda: array("I"))
+        self._doc_verses = array("H")
+        self._doc_editions = array("H")
+        self._doc_lengths = array("H")
+        self._documents = set()
+        self._editions = []
+        self._edition_ids = {}
+        self._edition_docs = []
+        self._edition_lengths = []
+        self._lock = threading.RLock()
+
+    def _edition_id(self, edition):
+        """
+        Get the compact id of an edition, registering it if needed.
+
+        Args:
+            edition (str): The edition identifier.
+
+        Returns:
+            int: The edition id.
+        """
+        edition_id = self._edition_ids.get(edition)
+        if edition_id is None:
+            edition_id = len(self._editions)
+            self._edition_ids[edition] = edition_id
+            self._editions.append(edition)
+            self._edition_docs.append(0)
+            self._edition_lengths.append(0)
+        return edition_id
+
+    def add(self, verse, edition, text):
+        """
+        Index one verse text.
+
+        Args:
+            verse (int): The global ayah number.
+            edition (str): The edition identifier.
+            text (str): The verse text.
+
+        Returns:
+            bool: True if the text was added, False if it was already indexed.
+        """
+        terms = self.tokenizer(text)
+
+        with self._lock:
+            edition_id = self._edition_id(edition)
+            if (edition_id, verse) in self._documents:
+                return False
+
+            doc = len(self._doc_verses)
+            self._documents.add((edition_id, verse))
+            self._doc_verses.append(verse)
+            self._doc_editions.append(edition_id)
+            self._doc_lengths.append(min(len(terms), 0xFFFF))
+            self._edition_docs[edition_id] += 1
+            self._edition_lengths[edition_id] += len(terms)
+
+            for position, term in enumerate(terms):
+                postings = self._postings[term]
+                postings.append(doc)
+                postings.append(position)
+            return True
+
+    def add_verse_data(self, verse_data):
+        """
+        Index API-shaped verse data (one entry or a list of per-edition entries).
+
+        Entries without a number, edition identifier or text are skipped.
+
+        Args:
+            verse_data (dict or list): Verse data as returned by APIService.
+
+        Returns:
+            int: Number of texts added.
+        """
+        if not isinstance(verse_data, list):
+            verse_data = [verse_data]
+
+        added = 0
+        for entry in verse_data:
+            if not isinstance(entry, dict):
+                continue
+            edition = entry.get("edition")
+            text = entry.get("text")
+            if not isinstance(edition, dict) or not isinstance(text, str):
+                continue
+            if isinstance(entry.get("number"), int) and edition.get("identifier"):
+                added += self.add(entry["number"], edition["identifier"], text)
+        return added
+
+    def add_texts(self, edition, texts):
+        """
+        Index many texts of one edition, e.g. a whole installed edition.
+
+        Args:
+            edition (str): The edition identifier.
+            texts (iterable): (verse, text) pairs.
+
+        Returns:
+            int: Number of texts added.
+        """
+        return sum(self.add(verse, edition, text) for verse, text in texts)
+
+    def has_edition(self, edition, complete=True):
+        """
+        Check whether an edition has been indexed.
+
+        Args:
+            edition (str): The edition identifier.
+            complete (bool): Require all 6236 ayahs rather than any.
+
+        Returns:
+            bool: True if the edition is indexed.
+        """
+        with self._lock:
+            edition_id = self._edition_ids.get(edition)
+            if edition_id is None:
+                return False
+            count = self._edition_docs[edition_id]
+            return count == TOTAL_VERSES if complete else count > 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._doc_verses)
+
+    def _parse_query(self, query):
+        """
+        Split a query into phrases and loose terms.
+
+        Args:
+            query (str): Terms, with phrases in double quotes.
+
+        Returns:
+            tuple: (list of phrase term lists, list of loose terms)
+        """
+        phrases = [terms for terms in map(self.tokenizer, PHRASE_PATTERN.findall(query)) if terms]
+        terms = self.tokenizer(PHRASE_PATTERN.sub(" ", query))
+        return phrases, terms
+
+    def _phrase_documents(self, phrase):
+        """
+        Find the documents containing a phrase.
+
+        Args:
+            phrase (list): The phrase terms in order.
+
+        Returns:
+            set: Ids of documents containing the terms consecutively.
+        """
+        positions = None
+        for offset, term in enumerate(phrase):
+            postings = self._postings.get(term)
+            if postings is None:
+                return set()
+
+            # Shift each occurrence back to where the phrase would start
+            starts = set(zip(postings[::2], (pos - offset for pos in postings[1::2])))
+            positions = starts if positions is None else positions & starts
+            if not positions:
+                return set()
+
+        return {doc for doc, _ in positions}
+
+    def search(self, query, editions=None, surahs=None, juz=None, limit=20):
+        """
+        Search the indexed texts.
+
+        Loose terms are ranked with BM25; quoted phrases must all occur
+        and are scored like their terms.
+
+        Args:
+            query (str): Search terms, e.g. 'mercy "light upon light"'.
+            editions (list, optional): Edition identifiers to search.
+                                       Defaults to all indexed editions.
+            surahs (iterable, optional): Only return verses of these surahs.
+            juz (iterable, optional): Only return verses of these juz.
+            limit (int): Maximum number of results.
+
+        Returns:
+            list: (verse, score) pairs, best first.
+        """
+        phrases, terms = self._parse_query(query)
+        scored_terms = terms + [term for phrase in phrases for term in phrase]
+        if not scored_terms:
+            return []
+
+        surahs = set(surahs) if surahs is not None else None
+        juz = set(juz) if juz is not None else None
+
+        with self._lock:
+            if editions is None:
+                edition_ids = set(range(len(self._editions)))
+            else:
+                edition_ids = {self._edition_ids[edition] for edition in editions
+                               if edition in self._edition_ids}
+
+            required = None
+            for phrase in phrases:
+                documents = self._phrase_documents(phrase)
+                required = documents if required is None else required & documents
+
+            scores = defaultdict(float)
+            for term in set(scored_terms):
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+
+                frequencies = defaultdict(int)
+                for doc in postings[::2]:
+                    if self._doc_editions[doc] in edition_ids:
+                        frequencies[doc] += 1
+
+                document_frequency = defaultdict(int)
+                for doc in frequencies:
+                    document_frequency[self._doc_editions[doc]] += 1
+
+                for doc, frequency in frequencies.items():
+                    if required is not None and doc not in required:
+                        continue
+
+                    edition_id = self._doc_editions[doc]
+                    total = self._edition_docs[edition_id]
+                    df = document_frequency[edition_id]
+                    idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                    average = self._edition_lengths[edition_id] / total
+                    norm = 1 - self.b + self.b * self._doc_lengths[doc] / average
+                    scores[doc] += idf * frequency * (self.k1 + 1) / (frequency + self.k1 * norm)
+
+            best = {}
+            for doc, score in scores.items():
+                verse = self._doc_verses[doc]
+                if surahs is not None and VERSE_SURAHS[verse] not in surahs:
+                    continue
+                if juz is not None and self.metadata.division_of("juz", verse) not in juz:
+                    continue
+                if score > best.get(verse, 0.0):
+                    best[verse] = score
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def stats(self):
+        """
+        Get the index statistics.
+
+        Returns:
+            dict: Document, term and posting counts and documents per edition.
+        """
+        with self._lock:
+            return {
+                "documents": len(self._doc_verses),
+                "terms": len(self._postings),
+                "postings": sum(len(postings) for postings in self._postings.values()) // 2,
+                "editions": dict(zip(self._editions, self._edition_docs))
+            }
+
+
+class NGramIndex:
+    """
+    Character n-gram index for substring and fuzzy search in one edition.
+
+    Texts are normalized once when added (by default with
+    normalize_arabic) and every n-gram maps to an ``array('H')`` of the
+    verses containing it. A substring query intersects the posting lists
+    of its n-grams and confirms the candidates against the normalized
+    text; a fuzzy query ranks verses by the share of query n-grams they
+    contain, which tolerates a wrong or missing letter.
+    """
+
+    def __init__(self, n=3, normalizer=normalize_arabic):
+        """
+        Initialize the n-gram index.
+
+        Args:
+            n (int): Length of the indexed character n-grams.
+            normalizer (callable): Function applied to texts and queries.
+        """
+        self.n = n
+        self.normalizer = normalizer
+        self._texts = {}
+        self._postings = defaultdict(lambda: array("H"))
+        self._lock = threading.RLock()
+
+    def _grams(self, text):
+        """
+        Get the distinct n-grams of a normalized text.
+
+        Args:
+            text (str): Normalized text.
+
+        Returns:
+            set: The n-grams.
+        """
+        return {text[i:i + self.n] for i in range(len(text) - self.n + 1)}
+
+    def add(self, verse, text):
+        """
+        Index one verse text.
+
+        Args:
+            verse (int): The global ayah number.
+            text (str): The verse text.
+
+        Returns:
+            bool: True if the text was added, False if the verse was already indexed.
+        """
+        normalized = self.normalizer(text)
+
+        with self._lock:
+            if verse in self._texts:
+                return False
+
+            self._texts[verse] = normalized
+            for gram in self._grams(normalized):
+                self._postings[gram].append(verse)
+            return True
+
+    def add_texts(self, texts):
+        """
+        Index many verse texts.
+
+        Args:
+            texts (iterable): (verse, text) pairs.
+
+        Returns:
+            int: Number of texts added.
+        """
+        return sum(self.add(verse, text) for verse, text in texts)
+
+    def add_verse_data(self, verse_data, edition="quran-uthmani"):
+        """
+        Index the entries of one edition in API-shaped verse data.
+
+        Args:
+            verse_data (dict or list): Verse data as returned by APIService.
+            edition (str): The edition whose texts are indexed.
+
+        Returns:
+            int: Number of texts added.
+        """
+        if not isinstance(verse_data, list):
+            verse_data = [verse_data]
+
+        added = 0
+        for entry in verse_data:
+            if not isinstance(entry, dict) or not isinstance(entry.get("edition"), dict):
+                continue
+            if entry["edition"].get("identifier") != edition:
+                continue
+            if isinstance(entry.get("number"), int) and isinstance(entry.get("text"), str):
+                added += self.add(entry["number"], entry["text"])
+        return added
+
+    def __len__(self):
+        with self._lock:
+            return len(self._texts)
+
+    def find(self, query, limit=20):
+        """
+        Find the verses containing a string, ignoring diacritics and spelling variants.
+
+        Args:
+            query (str): The text to look for.
+            limit (int): Maximum number of results.
+
+        Returns:
+            list: Global ayah numbers in ascending order.
+        """
+        query = self.normalizer(query)
+        if not query:
+            return []
+
+        with self._lock:
+            grams = self._grams(query)
+            if not grams:
+                # Too short for an n-gram lookup; scan the texts instead
+                candidates = self._texts
+            else:
+                postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+                candidates = set(postings[0])
+                for posting in postings[1:]:
+                    if not candidates:
+                        break
+                    candidates.intersection_update(posting)
+
+            matches = sorted(verse for verse in candidates if query in self._texts[verse])
+
+        return matches[:limit]
+
+    def search(self, query, threshold=0.6, limit=20):
+        """
+        Find the verses most similar to a possibly misspelled query.
+
+        Args:
+            query (str): The text to look for.
+            threshold (float): Minimum share of query n-grams a verse must contain.
+            limit (int): Maximum number of results.
+
+        Returns:
+            list: (verse, similarity) pairs, best first.
+        """
+        query = self.normalizer(query)
+        grams = self._grams(query)
+        if not grams:
+            return [(verse, 1.0) for verse in self.find(query, limit)]
+
+        with self._lock:
+            counts = defaultdict(int)
+            for gram in grams:
+                for verse in self._postings.get(gram, ()):
+                    counts[verse] += 1
+
+        minimum = threshold * len(grams)
+        ranked = sorted(
+            ((verse, count / len(grams)) for verse, count in counts.items() if count >= minimum),
+            key=lambda item: (-item[1], item[0])
+        )
+        return ranked[:limit]
+
+    def stats(self):
+        """
+        Get the index statistics.
+
+        Returns:
+            dict: Verse, n-gram and posting counts.
+        """
+        with self._lock:
+            return {
+                "verses": len(self._texts),
+                "ngrams": len(self._postings),
+                "postings": sum(len(postings) for postings in self._postings.values())
+            }
@@ -0,0 +1,101 @@
+"""
+Single Flight for Qur'anic Verse Application
+
+This module coalesces concurrent calls for the same key into one call.
+"""
+
+import threading
+
+
+class _Call:
+    """
+    An in-flight call and its outcome.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time.
+
+    Callers that ask for a key while a call for it is already running wait
+    for that call and receive its result (or its exception) instead of
+    starting their own.
+    """
+
+    def __init__(self):
+        """Initialize the single-flight group."""
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.suppressed = 0
+
+    def do(self, key, func):
+        """
+        Call a function unless a call for the same key is already in flight.
+
+        Args:
+            key: Identifies duplicate calls, e.g. the request URL.
+            func (callable): Function to run without arguments.
+
+        Returns:
+            The result of the (shared) call.
+
+        Raises:
+            Exception: Whatever the shared call raised.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.suppressed += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        """
+        Get the number of calls currently running.
+
+        Returns:
+            int: Number of distinct keys in flight.
+        """
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self):
+        """
+        Get the coalescing statistics.
+
+        Returns:
+            dict: Calls executed, duplicate calls suppressed and calls in flight.
+        """
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "suppressed": self.suppressed,
+                "in_flight": len(self._calls)
+            }
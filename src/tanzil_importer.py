@@ -0,0 +1,260 @@
+"""
+Tanzil Importer for Qur'anic Verse Application
+
+This module imports the Quran text and translation files published by
+Tanzil (tanzil.net) into the corpus store, so editions can be installed
+without any API access.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+
+from src.corpus_store import CorpusStore
+from src.quran_metadata import QuranMetadata
+from src.verse_keys import SURAH_LENGTHS, TOTAL_VERSES, format_reference, verse_id, verse_key
+
+RTL_LANGUAGES = frozenset(("ar", "dv", "fa", "he", "ku", "ps", "sd", "ug", "ur", "yi"))
+
+# Division elements of Tanzil's quran-data.xml and the corpus fields they fill
+METADATA_DIVISIONS = {
+    "juz": "juz",
+    "manzil": "manzil",
+    "page": "page",
+    "ruku": "ruku",
+    "quarter": "hizbQuarter"
+}
+
+NUMBERED_LINE = re.compile(r"(\d+)\|(\d+)\|(.*)")
+
+
+def iter_xml(path):
+    """
+    Stream the ayahs of a Tanzil XML file.
+
+    Each surah is discarded once read, so memory use does not depend on
+    the size of the file.
+
+    Args:
+        path (str): Path to the file.
+
+    Yields:
+        tuple: (surah, ayah, text, surah name) for every ayah in file order.
+    """
+    root = None
+    surah = None
+    name = None
+
+    for event, element in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            elif element.tag == "sura":
+                surah = int(element.get("index"))
+                name = element.get("name")
+        elif element.tag == "aya":
+            yield surah, int(element.get("index")), element.get("text"), name
+        elif element.tag == "sura":
+            root.clear()
+
+
+def iter_text(path):
+    """
+    Stream the ayahs of a Tanzil text file.
+
+    Both text layouts are accepted: "surah|ayah|text" lines, and one ayah
+    per line in Quran order. Empty lines and "#" comments (the license
+    footer) are skipped.
+
+    Args:
+        path (str): Path to the file.
+
+    Yields:
+        tuple: (surah, ayah, text, None) for every ayah in file order.
+
+    Raises:
+        ValueError: If an unnumbered file has more than TOTAL_VERSES lines.
+    """
+    number = 0
+
+    with open(path, encoding="utf-8-sig") as lines:
+        for line in lines:
+            line = line.rstrip("\r\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+
+            match = NUMBERED_LINE.fullmatch(line)
+            if match:
+                yield int(match.group(1)), int(match.group(2)), match.group(3), None
+                continue
+
+            number += 1
+            key = verse_key(number)
+            if key is None:
+                raise ValueError(f"{path} has more than {TOTAL_VERSES} ayahs")
+            yield key[0], key[1], line, None
+
+
+def read_metadata(path):
+    """
+    Read Tanzil's quran-data.xml.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        tuple: (QuranMetadata, surah dicts keyed by number, set of the
+               global numbers of ayahs with a sajda).
+    """
+    starts = {field: [] for field in METADATA_DIVISIONS.values()}
+    surahs = {}
+    sajdas = set()
+
+    for _, element in ET.iterparse(path):
+        tag = element.tag
+
+        if tag == "sura" and element.get("ayas"):
+            number = int(element.get("index"))
+            surahs[number] = {
+                "number": number,
+                "name": element.get("name"),
+                "englishName": element.get("tname"),
+                "englishNameTranslation": element.get("ename"),
+                "numberOfAyahs": int(element.get("ayas")),
+                "revelationType": element.get("type")
+            }
+        elif tag in METADATA_DIVISIONS or tag == "sajda":
+            number = verse_id(int(element.get("sura")), int(element.get("aya")))
+            if tag == "sajda":
+                sajdas.add(number)
+            else:
+                starts[METADATA_DIVISIONS[tag]].append(number)
+
+        element.clear()
+
+    metadata = QuranMetadata({division: numbers for division, numbers in starts.items() if numbers})
+    return metadata, surahs, sajdas
+
+
+def make_edition(identifier, language=None, name=None):
+    """
+    Build the metadata of an imported edition.
+
+    Args:
+        identifier (str): The edition identifier, e.g. "quran-uthmani" or "en.sahih".
+        language (str, optional): Language code. Derived from the identifier by default.
+        name (str, optional): Display name. Defaults to the identifier.
+
+    Returns:
+        dict: Edition metadata in the API's shape.
+    """
+    arabic = identifier.startswith("quran-")
+    if language is None:
+        language = "ar" if arabic else identifier.split(".")[0]
+
+    return {
+        "identifier": identifier,
+        "language": language,
+        "name": name or identifier,
+        "englishName": name or identifier,
+        "format": "text",
+        "type": "quran" if arabic else "translation",
+        "direction": "rtl" if language in RTL_LANGUAGES else "ltr"
+    }
+
+
+def read_tanzil(path, file_format=None):
+    """
+    Stream the ayahs of a Tanzil file.
+
+    Args:
+        path (str): Path to the file.
+        file_format (str, optional): "xml" or "text". Guessed from the file
+                                     extension by default.
+
+    Returns:
+        iterator: (surah, ayah, text, surah name) tuples.
+    """
+    if file_format is None:
+        file_format = "xml" if path.lower().endswith(".xml") else "text"
+    return iter_xml(path) if file_format == "xml" else iter_text(path)
+
+
+def import_edition(corpus_store, path, edition, metadata_path=None, search_index=None,
+                   arabic_index=None, file_format=None, batch_size=1000):
+    """
+    Import a Tanzil text or XML file as an edition of the corpus store.
+
+    The file is read once: each ayah is checked against the Hafs verse
+    numbering, given its surah and division data and written to the store
+    as it is parsed. The search indexes are filled from the store once the
+    import has been committed, so a failed import leaves them untouched.
+    Divisions come from
+    ``metadata_path`` if given, otherwise from the built-in juz and manzil
+    tables and whatever previously installed editions stored.
+
+    Args:
+        corpus_store (CorpusStore): The store to import into.
+        path (str): Path to the Tanzil file.
+        edition (dict): Edition metadata, see make_edition.
+        metadata_path (str, optional): Path to Tanzil's quran-data.xml.
+        search_index (SearchIndex, optional): Full-text index to fill.
+        arabic_index (NGramIndex, optional): Arabic substring index to fill.
+        file_format (str, optional): "xml" or "text", see read_tanzil.
+        batch_size (int): Number of ayahs written per batch.
+
+    Returns:
+        int: Number of ayahs imported.
+
+    Raises:
+        ValueError: If the file does not hold every ayah exactly once, in order.
+        OSError: If a file cannot be read.
+        xml.etree.ElementTree.ParseError: If an XML file is malformed.
+    """
+    if metadata_path is not None:
+        metadata, surahs, sajdas = read_metadata(metadata_path)
+    else:
+        metadata, surahs, sajdas = QuranMetadata(), {}, None
+
+    identifier = edition["identifier"]
+    divisions = [division for division in CorpusStore.DIVISIONS if metadata.has_division(division)]
+
+    def records():
+        expected = 1
+        surah_info = None
+
+        for surah, ayah, text, name in read_tanzil(path, file_format):
+            number = verse_id(surah, ayah)
+            if number != expected:
+                if expected > TOTAL_VERSES:
+                    raise ValueError(f"{path} has more than {TOTAL_VERSES} ayahs")
+                raise ValueError(
+                    f"{path}: expected ayah {format_reference(expected)}, found {surah}:{ayah}"
+                )
+            if not text:
+                raise ValueError(f"{path}: ayah {surah}:{ayah} has no text")
+            expected += 1
+
+            if surah_info is None or surah_info["number"] != surah:
+                surah_info = surahs.get(surah) or {
+                    "number": surah,
+                    "name": name,
+                    "numberOfAyahs": SURAH_LENGTHS[surah - 1]
+                }
+
+            record = {"number": number, "numberInSurah": ayah, "text": text}
+            for division in divisions:
+                record[division] = metadata.division_of(division, number)
+            if sajdas is not None:
+                record["sajda"] = number in sajdas
+
+            yield surah_info, record
+
+    count = corpus_store.add_ayahs(edition, records(), batch_size)
+
+    if search_index is not None or arabic_index is not None:
+        texts = corpus_store.get_texts(identifier)
+        if search_index is not None:
+            search_index.add_texts(identifier, texts)
+        if arabic_index is not None:
+            arabic_index.add_texts(texts)
+    return count
@@ -7,10 +7,13 @@ This module manages the user interface and mode switching.
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import webbrowser
-import threading
 import time
 
+from src.api_service import APIService
+from src.verse_history import VerseHistory
 from src.verse_manager import VerseManager
+from src.verse_prefetcher import VersePrefetcher
+from src.ui_tasks import UITaskRunner
 from src.config_manager import ConfigurationManager
 
 class UIController:
@@ -26,20 +29,52 @@ class UIController:
             root (tk.Tk): The root Tkinter window.
         """
         self.root = root
-        self.verse_manager = VerseManager()
         self.config_manager = ConfigurationManager()
         
         # Load configuration
         self.config = self.config_manager.get_config()
         
+        self.verse_manager = VerseManager(
+            APIService.from_config(self.config),
+            history=VerseHistory.from_config(self.config),
+            request_budget=self.config.get("verseRequestBudget", 10.0)
+        )
+        
+        # Keep random verses ready for the current translation
+        self.prefetcher = VersePrefetcher(
+            self.verse_manager,
+            self.config["translation"],
+            self.config.get("prefetchSize", 5)
+        )
+        
+        # Run network fetches off the Tk thread
+        self.task_runner = UITaskRunner(root, on_pending_changed=self._set_loading)
+        
         # Set up the UI
         self._setup_ui()
+        self.prefetcher.start()
+        
+        # Write pending settings and stop workers when the window closes
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         
         # Current mode
         self.current_mode = "standard"
         
         # Show the standard mode by default
         self._show_standard_mode()
+        
+        # Resume with the last verse of the previous session
+        if self.verse_manager.current_verse:
+            self._display_verse(self.verse_manager.current_verse)
+    
+    def _on_close(self):
+        """Flush pending configuration and sampler state, stop workers and close the window."""
+        self.config_manager.close()
+        self.prefetcher.stop()
+        self.task_runner.shutdown()
+        self.verse_manager.history.close()
+        self.verse_manager.close()
+        self.root.destroy()
     
     def _setup_ui(self):
         """Set up the main user interface."""
@@ -150,6 +185,23 @@ class UIController:
         )
         self.new_verse_button.pack(side=tk.LEFT, padx=5)
         
+        # History navigation buttons
+        self.back_button = ttk.Button(
+            self.controls_frame, 
+            text="◀",
+            width=3,
+            command=self._show_previous_verse
+        )
+        self.back_button.pack(side=tk.LEFT, padx=(5, 0))
+        
+        self.forward_button = ttk.Button(
+            self.controls_frame, 
+            text="▶",
+            width=3,
+            command=self._show_next_verse
+        )
+        self.forward_button.pack(side=tk.LEFT, padx=(0, 5))
+        
         # Copy button
         self.copy_button = ttk.Button(
             self.controls_frame, 
@@ -166,6 +218,10 @@ class UIController:
         )
         self.share_button.pack(side=tk.LEFT, padx=5)
         
+        # Pending indicator
+        self.loading_label = ttk.Label(self.controls_frame, text="")
+        self.loading_label.pack(side=tk.RIGHT, padx=5)
+        
         # Settings frame
         self.settings_frame = ttk.Frame(self.standard_frame)
         self.settings_frame.pack(fill=tk.X, pady=10)
@@ -182,7 +238,11 @@ class UIController:
         self.translation_combo.pack(side=tk.LEFT, padx=5)
         
         # Populate translations (async)
-        threading.Thread(target=self._load_translations, daemon=True).start()
+        self.task_runner.submit(
+            "translations",
+            self._load_translations,
+            self._on_translations_loaded
+        )
         
         # Bind translation change
         self.translation_combo.bind("<<ComboboxSelected>>", self._on_translation_changed)
@@ -302,29 +362,68 @@ class UIController:
     
     def _get_random_verse(self):
         """Get and display a random verse."""
-        # Show loading state
-        self.new_verse_button.config(state=tk.DISABLED)
-        self.new_verse_button.config(text="Loading...")
-        self.root.update()
+        started = time.perf_counter()
+        
+        # Serve from the prefetch buffer when possible
+        verse = self.prefetcher.get()
+        if verse:
+            # A newer click wins over any fetch still in flight
+            self.task_runner.cancel("verse")
+            self._show_fetched_verse(verse)
+            self.task_runner.record_latency("verse", started)
+            return
         
         # Get translation from config
         translation = self.translation_var.get()
         
-        # Get random verse
-        verse = self.verse_manager.get_random_verse(translation)
+        # Fetch in the background; rapid clicks supersede each other
+        self.task_runner.submit(
+            "verse",
+            lambda: self.verse_manager.fetch_random_verse(translation),
+            self._show_fetched_verse,
+            started=started
+        )
+    
+    def _show_previous_verse(self):
+        """Display the verse shown before the current one."""
+        verse = self.verse_manager.previous_verse()
+        if verse:
+            self.task_runner.cancel("verse")
+            self._display_verse(verse)
+    
+    def _show_next_verse(self):
+        """Display the next verse after going back in the history."""
+        verse = self.verse_manager.next_verse()
+        if verse:
+            self.task_runner.cancel("verse")
+            self._display_verse(verse)
+    
+    def _show_fetched_verse(self, verse, report_errors=True):
+        """
+        Make a fetched verse current and display it.
         
+        Args:
+            verse (dict): The formatted verse, or None if the fetch failed.
+            report_errors (bool): Whether to show an error dialog on failure.
+        """
         if verse:
-            # Update UI with verse
+            self.verse_manager.set_current_verse(verse)
             self._display_verse(verse)
-        else:
+        elif report_errors:
             messagebox.showerror(
                 "Error", 
                 "Failed to retrieve verse. Please check your internet connection and try again."
             )
+    
+    def _set_loading(self, pending):
+        """
+        Show or hide the pending indicator.
         
-        # Reset button state
-        self.new_verse_button.config(state=tk.NORMAL)
-        self.new_verse_button.config(text="New Random Verse")
+        Args:
+            pending (bool): Whether a fetch is in progress.
+        """
+        if hasattr(self, "loading_label"):
+            self.loading_label.config(text="Loading..." if pending else "")
     
     def _display_verse(self, verse):
         """
@@ -348,7 +447,8 @@ class UIController:
         self.translation_text.config(state=tk.DISABLED)
         
         # Update reference
-        surah_name = verse["surah"]["englishName"]
+        # Editions imported without metadata have no transliterated names
+        surah_name = verse["surah"]["englishName"] or verse["surah"]["name"] or verse["surah"]["number"]
         reference = verse["reference"]
         self.reference_label.config(text=f"— Surah {surah_name} ({reference})")
     
@@ -413,7 +513,12 @@ class UIController:
             messagebox.showinfo("No Verse", "Please get a verse first.")
     
     def _load_translations(self):
-        """Load available translations asynchronously."""
+        """
+        Load available translations (runs on a worker thread).
+        
+        Returns:
+            tuple: Combobox options and name-to-identifier map, or None on failure.
+        """
         translations = self.verse_manager.get_available_translations()
         
         if translations:
@@ -427,8 +532,19 @@ class UIController:
                 options.append(name)
                 translation_map[name] = identifier
             
-            # Update the combobox
-            self.root.after(0, lambda: self._update_translation_combo(options, translation_map))
+            return options, translation_map
+        
+        return None
+    
+    def _on_translations_loaded(self, result):
+        """
+        Populate the translation combobox once translations have loaded.
+        
+        Args:
+            result (tuple): The result of _load_translations, or None.
+        """
+        if result:
+            self._update_translation_combo(*result)
     
     def _update_translation_combo(self, options, translation_map):
         """
@@ -467,14 +583,16 @@ class UIController:
             self.translation_var.set(identifier)
             self.config["translation"] = identifier
             self.config_manager.update_config({"translation": identifier})
+            self.prefetcher.set_translation(identifier)
             
             # If we have a current verse, refresh it with the new translation
             if self.verse_manager.current_verse:
                 reference = self.verse_manager.current_verse["reference"]
-                verse = self.verse_manager.get_specific_verse(reference, identifier)
-                
-                if verse:
-                    self._display_verse(verse)
+                self.task_runner.submit(
+                    "verse",
+                    lambda: self.verse_manager.fetch_specific_verse(reference, identifier),
+                    lambda verse: self._show_fetched_verse(verse, report_errors=False)
+                )
     
     def _show_settings(self):
         """Show the settings dialog."""
@@ -0,0 +1,253 @@
+"""
+UI Tasks for Qur'anic Verse Application
+
+This module runs blocking work off the Tk main thread and delivers the
+results back to it.
+"""
+
+import itertools
+import queue
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class UITask:
+    """
+    Handle for a submitted task.
+    """
+
+    def __init__(self, task_id, channel, started, on_success, on_error):
+        """
+        Initialize the task handle.
+
+        Args:
+            task_id (int): Unique task number.
+            channel (str): Channel the task belongs to.
+            started (float): perf_counter() time of the user action.
+            on_success (callable): Called with the result on the Tk thread.
+            on_error (callable): Called with the exception on the Tk thread.
+        """
+        self.id = task_id
+        self.channel = channel
+        self.started = started
+        self.on_success = on_success
+        self.on_error = on_error
+        self.future = None
+        self.cancelled = False
+
+
+class UITaskRunner:
+    """
+    Run blocking calls on worker threads and hand results to Tk.
+
+    Tasks are grouped by channel: submitting a task supersedes the pending
+    task on the same channel, so after rapid clicks only the latest result
+    is rendered. Tk is only touched from its own thread: workers put
+    results on a queue that the Tk thread drains through ``root.after``.
+    """
+
+    POLL_INTERVAL_MS = 15
+
+    def __init__(self, root, max_workers=2, on_pending_changed=None, latency_hook=None):
+        """
+        Initialize the task runner.
+
+        Args:
+            root (tk.Tk): The root Tkinter window.
+            max_workers (int): Number of worker threads.
+            on_pending_changed (callable, optional): Called with True/False on the
+                                                     Tk thread when work starts/ends.
+            latency_hook (callable, optional): Called with (channel, seconds) after
+                                               each result has been rendered.
+        """
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ui-task")
+        self.on_pending_changed = on_pending_changed
+        self.latency_hook = latency_hook
+        self.latencies = deque(maxlen=500)
+        self.cancelled_tasks = 0
+        self._results = queue.Queue()
+        self._latest = {}
+        self._ids = itertools.count(1)
+        self._poll_scheduled = False
+        self._was_pending = False
+
+    def submit(self, channel, func, on_success, on_error=None, started=None):
+        """
+        Run a function on a worker thread.
+
+        Must be called on the Tk thread.
+
+        Args:
+            channel (str): Channel name; a newer task supersedes older ones.
+            func (callable): Blocking function to run without arguments.
+            on_success (callable): Receives the result on the Tk thread.
+            on_error (callable, optional): Receives the exception on the Tk thread.
+            started (float, optional): perf_counter() time of the user action.
+                                       Defaults to now.
+
+        Returns:
+            UITask: The task handle.
+        """
+        self._drop(channel)
+
+        task = UITask(
+            next(self._ids),
+            channel,
+            started if started is not None else time.perf_counter(),
+            on_success,
+            on_error
+        )
+        self._latest[channel] = task
+        task.future = self.executor.submit(func)
+        task.future.add_done_callback(lambda future: self._results.put(task))
+
+        self._update_pending()
+        self._schedule_poll()
+        return task
+
+    def cancel(self, channel):
+        """
+        Cancel the pending task on a channel.
+
+        A task that is already running finishes, but its result is dropped.
+
+        Args:
+            channel (str): The channel name.
+
+        Returns:
+            bool: True if there was a pending task.
+        """
+        dropped = self._drop(channel)
+        self._update_pending()
+        return dropped
+
+    def _drop(self, channel):
+        """
+        Mark the pending task on a channel as cancelled.
+
+        Args:
+            channel (str): The channel name.
+
+        Returns:
+            bool: True if there was a pending task.
+        """
+        task = self._latest.pop(channel, None)
+        if task is None:
+            return False
+
+        task.cancelled = True
+        task.future.cancel()
+        self.cancelled_tasks += 1
+        return True
+
+    def is_pending(self, channel=None):
+        """
+        Check whether tasks are outstanding.
+
+        Args:
+            channel (str, optional): Restrict the check to one channel.
+
+        Returns:
+            bool: True if a task is pending.
+        """
+        if channel is None:
+            return bool(self._latest)
+        return channel in self._latest
+
+    def record_latency(self, channel, started):
+        """
+        Record the time from a user action to the rendered result.
+
+        Args:
+            channel (str): The channel name.
+            started (float): perf_counter() time of the user action.
+        """
+        elapsed = time.perf_counter() - started
+        self.latencies.append((channel, elapsed))
+
+        if self.latency_hook is not None:
+            self.latency_hook(channel, elapsed)
+
+    def latency_stats(self, channel=None):
+        """
+        Summarize recorded click-to-render latencies.
+
+        Args:
+            channel (str, optional): Restrict the summary to one channel.
+
+        Returns:
+            dict: Sample count and mean/median/p95/max latency in seconds.
+        """
+        samples = sorted(elapsed for name, elapsed in self.latencies
+                         if channel is None or name == channel)
+        if not samples:
+            return {"count": 0, "mean": 0.0, "median": 0.0, "p95": 0.0, "max": 0.0}
+
+        return {
+            "count": len(samples),
+            "mean": sum(samples) / len(samples),
+            "median": samples[len(samples) // 2],
+            "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            "max": samples[-1]
+        }
+
+    def _schedule_poll(self):
+        """Make sure the result queue is drained on the Tk thread."""
+        if not self._poll_scheduled:
+            self._poll_scheduled = True
+            self.root.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        """Deliver finished tasks and keep polling while work is outstanding."""
+        self._poll_scheduled = False
+
+        while True:
+            try:
+                task = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if task.cancelled or self._latest.get(task.channel) is not task:
+                continue
+
+            del self._latest[task.channel]
+            self._update_pending()
+            self._deliver(task)
+
+        if self._latest:
+            self._schedule_poll()
+
+    def _deliver(self, task):
+        """
+        Call the task's callbacks and record its latency.
+
+        Args:
+            task (UITask): A finished task.
+        """
+        error = task.future.exception()
+
+        if error is None:
+            task.on_success(task.future.result())
+        elif task.on_error is not None:
+            task.on_error(error)
+        else:
+            print(f"Background task on {task.channel} failed: {str(error)}")
+
+        self.record_latency(task.channel, task.started)
+
+    def _update_pending(self):
+        """Notify the pending indicator when the pending state changes."""
+        pending = bool(self._latest)
+
+        if pending != self._was_pending:
+            self._was_pending = pending
+            if self.on_pending_changed is not None:
+                self.on_pending_changed(pending)
+
+    def shutdown(self):
+        """Drop pending tasks and stop the worker threads."""
+        for channel in list(self._latest):
+            self.cancel(channel)
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,275 @@
+"""
+Verse for Qur'anic Verse Application
+
+This module defines the compact formatted verse type kept in the history
+and shown by the UI.
+"""
+
+import threading
+
+
+class _MappingView:
+    """
+    Read-only dict-like access to attributes of a slotted object.
+
+    Subclasses list their keys in ``_keys``; each key is read from the
+    attribute named in ``_attributes`` (defaulting to the key itself).
+    """
+
+    __slots__ = ()
+    _keys = ()
+    _attributes = {}
+
+    def _target(self):
+        return self
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self._target(), self._attributes.get(key, key))
+
+    def get(self, key, default=None):
+        """Return the value for key, or default if the key is unknown."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def keys(self):
+        """Return the keys, like dict.keys()."""
+        return list(self._keys)
+
+    def values(self):
+        """Return the values, like dict.values()."""
+        return [self[key] for key in self._keys]
+
+    def items(self):
+        """Return the (key, value) pairs, like dict.items()."""
+        return [(key, self[key]) for key in self._keys]
+
+    def to_dict(self):
+        """
+        Convert to plain nested dicts.
+
+        Returns:
+            dict: A dict with the same keys and values.
+        """
+        return {key: value.to_dict() if isinstance(value, _MappingView) else value
+                for key, value in self.items()}
+
+    def __eq__(self, other):
+        if isinstance(other, (dict, _MappingView)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, _MappingView) else other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+class SurahInfo(_MappingView):
+    """
+    Surah metadata shared by every verse of the surah.
+
+    Instances are interned: ``SurahInfo.intern`` returns the same object for
+    the same values, so thousands of verses cost one surah record each.
+    """
+
+    __slots__ = ("number", "name", "englishName")
+    _keys = ("number", "name", "englishName")
+
+    _interned = {}
+    _lock = threading.Lock()
+
+    def __init__(self, number=None, name=None, englishName=None):
+        """
+        Initialize the surah record. Prefer SurahInfo.intern.
+
+        Args:
+            number (int): The surah number.
+            name (str): The Arabic surah name.
+            englishName (str): The transliterated surah name.
+        """
+        self.number = number
+        self.name = name
+        self.englishName = englishName
+
+    @classmethod
+    def intern(cls, number=None, name=None, englishName=None):
+        """
+        Get the shared record for these values, creating it on first use.
+
+        Args:
+            number (int): The surah number.
+            name (str): The Arabic surah name.
+            englishName (str): The transliterated surah name.
+
+        Returns:
+            SurahInfo: The shared record.
+        """
+        key = (number, name, englishName)
+        with cls._lock:
+            info = cls._interned.get(key)
+            if info is None:
+                info = cls._interned[key] = cls(number, name, englishName)
+            return info
+
+
+class _TextView(_MappingView):
+    """The ``verse["text"]`` part of a Verse."""
+
+    __slots__ = ("_verse",)
+    _keys = ("arabic", "translation")
+
+    def __init__(self, verse):
+        self._verse = verse
+
+    def _target(self):
+        return self._verse
+
+
+class _AudioView(_MappingView):
+    """The ``verse["audio"]`` part of a Verse."""
+
+    __slots__ = ("_verse",)
+    _keys = ("url",)
+    _attributes = {"url": "audio_url"}
+
+    def __init__(self, verse):
+        self._verse = verse
+
+    def _target(self):
+        return self._verse
+
+
+class Verse(_MappingView):
+    """
+    A formatted verse: Arabic text, translation, surah and reference.
+
+    Verses use ``__slots__`` and share interned SurahInfo records, but also
+    read like the nested dicts the application used before, so
+    ``verse["text"]["arabic"]`` and ``verse["surah"]["englishName"]`` work.
+    """
+
+    __slots__ = ("number", "surah", "ayah", "arabic", "translation", "audio_url")
+    _keys = ("number", "surah", "text", "audio", "reference")
+
+    def __init__(self, number=None, surah=None, ayah=None, arabic=None,
+                 translation=None, audio_url=None):
+        """
+        Initialize the verse.
+
+        Args:
+            number (int): The global ayah number.
+            surah (SurahInfo): The surah record. Defaults to an empty record.
+            ayah (int): The ayah number within the surah.
+            arabic (str): The Arabic text.
+            translation (str): The translation text.
+            audio_url (str): URL of a recitation.
+        """
+        self.number = number
+        self.surah = surah if surah is not None else SurahInfo.intern()
+        self.ayah = ayah
+        self.arabic = arabic
+        self.translation = translation
+        self.audio_url = audio_url
+
+    @property
+    def reference(self):
+        """
+        The "surah:ayah" reference, or None if the verse location is unknown.
+
+        Returns:
+            str: The reference.
+        """
+        if self.surah.number is None and self.ayah is None:
+            return None
+        return f"{self.surah.number}:{self.ayah}"
+
+    @property
+    def text(self):
+        """Dict-like view of the Arabic text and translation."""
+        return _TextView(self)
+
+    @property
+    def audio(self):
+        """Dict-like view of the audio URL."""
+        return _AudioView(self)
+
+    @classmethod
+    def from_api(cls, verse_data):
+        """
+        Build a verse from API verse data.
+
+        Args:
+            verse_data (list): Per-edition ayah entries; the quran-uthmani
+                               entry (or another Quran text served in its
+                               place) provides the Arabic text and location,
+                               any other edition the translation.
+
+        Returns:
+            Verse: The verse.
+        """
+        verse = cls()
+
+        for entry in verse_data:
+            edition_info = entry.get("edition", {})
+            identifier = edition_info.get("identifier")
+
+            if identifier == "quran-uthmani" or edition_info.get("type") == "quran":
+                verse.arabic = entry.get("text")
+                surah = entry.get("surah", {})
+                verse.surah = SurahInfo.intern(
+                    surah.get("number"), surah.get("name"), surah.get("englishName")
+                )
+                verse.ayah = entry.get("numberInSurah")
+                verse.number = entry.get("number")
+
+            elif identifier:
+                verse.translation = entry.get("text")
+
+            if entry.get("audio"):
+                verse.audio_url = entry["audio"]
+
+        return verse
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a verse from the nested dict form (e.g. Verse.to_dict output).
+
+        Args:
+            data (dict): Formatted verse dict.
+
+        Returns:
+            Verse: The verse.
+        """
+        surah = data.get("surah") or {}
+        reference = data.get("reference")
+        ayah = None
+        if reference:
+            ayah = reference.partition(":")[2]
+            ayah = int(ayah) if ayah.isdigit() else None
+
+        return cls(
+            number=data.get("number"),
+            surah=SurahInfo.intern(surah.get("number"), surah.get("name"), surah.get("englishName")),
+            ayah=ayah,
+            arabic=(data.get("text") or {}).get("arabic"),
+            translation=(data.get("text") or {}).get("translation"),
+            audio_url=(data.get("audio") or {}).get("url")
+        )
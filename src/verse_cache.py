@@ -0,0 +1,193 @@
+"""
+Verse Cache for Qur'anic Verse Application
+
+This module provides a bounded in-memory LRU cache for API responses.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+
+def estimate_size(value):
+    """
+    Estimate the memory used by a JSON-like value.
+
+    Args:
+        value: A value made of dicts, lists, strings and scalars.
+
+    Returns:
+        int: Approximate size in bytes.
+    """
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key) + estimate_size(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += estimate_size(item)
+
+    return size
+
+
+class VerseCache:
+    """
+    Least-recently-used cache bounded by entry count and estimated bytes.
+
+    An optional backing cache (such as PersistentCache) acts as a slower
+    second tier: misses fall through to it and writes go to both tiers.
+    """
+
+    def __init__(self, max_entries=1000, max_bytes=8 * 1024 * 1024, backing=None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of cached entries.
+            max_bytes (int): Maximum estimated size of all entries in bytes.
+            backing (PersistentCache, optional): Second cache tier.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.backing = backing
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Get a cached value and mark it as recently used.
+
+        Args:
+            key: The cache key.
+            default: Value returned when the key is not cached.
+
+        Returns:
+            The cached value or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            self.misses += 1
+
+        if self.backing is not None:
+            value = self.backing.get(key)
+            if value is not None:
+                self._store(key, value)
+                return value
+
+        return default
+
+    def get_stale(self, key, default=None):
+        """
+        Get a cached value, including entries that expired in the backing tier.
+
+        Args:
+            key: The cache key.
+            default: Value returned when the key is not cached at all.
+
+        Returns:
+            The cached value or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry[0]
+
+        if self.backing is not None:
+            return self.backing.get_stale(key, default)
+
+        return default
+
+    def put(self, key, value, ttl=None):
+        """
+        Add or replace a cached value, evicting old entries if needed.
+
+        Values larger than the whole byte budget are not kept in memory.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+            ttl (float, optional): Time-to-live in the backing tier.
+        """
+        self._store(key, value)
+
+        if self.backing is not None:
+            self.backing.put(key, value, ttl=ttl)
+
+    def _store(self, key, value):
+        """
+        Add a value to the in-memory tier only.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+        """
+        size = estimate_size(value)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        """Remove all entries from both tiers. The hit/miss counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+        if self.backing is not None:
+            self.backing.clear()
+
+    def stats(self):
+        """
+        Get the cache statistics.
+
+        Returns:
+            dict: Entry count, estimated bytes, hits, misses, evictions and hit
+                  rate of the memory tier, plus the backing tier's stats if any.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+        if self.backing is not None:
+            stats["backing"] = self.backing.stats()
+        return stats
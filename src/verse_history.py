@@ -0,0 +1,264 @@
+"""
+Verse History for Qur'anic Verse Application
+
+This module keeps the verses shown to the user, with back/forward
+navigation, and persists them across sessions.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+
+from src.verse import Verse
+
+
+class VerseHistory:
+    """
+    Bounded history of shown verses backed by an append-only log.
+
+    Verses are kept in a ``deque(maxlen=max_size)``, so adding one is O(1)
+    and the oldest entries fall off automatically. Each added verse is also
+    appended as one JSON line to the log file; once the log holds
+    ``compact_ratio`` times more lines than the history, it is rewritten
+    with just the current entries. Loading reads the log into the deque,
+    which keeps only the newest ``max_size`` entries.
+    """
+
+    def __init__(self, max_size=50, log_path=None, compact_ratio=2.0):
+        """
+        Initialize the history and load it from the log.
+
+        Args:
+            max_size (int): Maximum number of verses kept.
+            log_path (str, optional): Path of the log file. Without one the
+                                      history only lives in memory.
+            compact_ratio (float): Log lines per kept entry that trigger a
+                                   compaction.
+        """
+        self.max_size = max(1, int(max_size))
+        self.log_path = log_path
+        self.compact_ratio = compact_ratio
+        self._entries = deque(maxlen=self.max_size)
+        self._cursor = None
+        self._log = None
+        self._log_lines = 0
+        self._lock = threading.RLock()
+        self.compactions = 0
+
+        if log_path is not None:
+            self.load()
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Create a history sized and stored as configured by the user.
+
+        Args:
+            config (dict): Application configuration.
+
+        Returns:
+            VerseHistory: The loaded history.
+        """
+        log_path = None
+        if config.get("persistentHistory", True):
+            log_path = os.path.join(config.get("dataDirectory", "data"), "history.jsonl")
+        return cls(config.get("maxHistorySize", 50), log_path)
+
+    def load(self):
+        """
+        Replace the in-memory entries with the ones in the log.
+
+        Lines that cannot be parsed, such as one cut off by a crash, are skipped.
+
+        Returns:
+            int: Number of entries loaded.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._cursor = None
+            self._log_lines = 0
+
+            if not os.path.exists(self.log_path):
+                return 0
+
+            try:
+                with open(self.log_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        self._log_lines += 1
+                        try:
+                            self._entries.append(Verse.from_dict(json.loads(line)))
+                        except (ValueError, AttributeError):
+                            continue
+            except OSError as e:
+                print(f"Error loading history: {str(e)}")
+
+            return len(self._entries)
+
+    def add(self, verse):
+        """
+        Add a verse as the newest entry and move the cursor to it.
+
+        Args:
+            verse (Verse): The formatted verse.
+        """
+        with self._lock:
+            self._entries.append(verse)
+            self._cursor = None
+
+            if self.log_path is not None:
+                self._append_to_log(verse)
+
+    def _append_to_log(self, verse):
+        """
+        Append one entry to the log, compacting it when it has grown too long.
+
+        Args:
+            verse (Verse): The formatted verse.
+        """
+        if self._log_lines >= self.max_size * self.compact_ratio:
+            self.compact()
+            return
+
+        try:
+            if self._log is None:
+                directory = os.path.dirname(self.log_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._log = open(self.log_path, 'a', encoding='utf-8')
+
+            self._log.write(json.dumps(verse.to_dict(), ensure_ascii=False) + "\n")
+            self._log.flush()
+            self._log_lines += 1
+        except OSError as e:
+            print(f"Error saving history: {str(e)}")
+
+    def compact(self):
+        """
+        Rewrite the log with only the current entries.
+
+        Returns:
+            bool: True if the log was rewritten, False otherwise.
+        """
+        with self._lock:
+            if self.log_path is None:
+                return False
+
+            self._close_log()
+            temp_path = f"{self.log_path}.tmp"
+            try:
+                directory = os.path.dirname(self.log_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    for verse in self._entries:
+                        f.write(json.dumps(verse.to_dict(), ensure_ascii=False) + "\n")
+                os.replace(temp_path, self.log_path)
+            except OSError as e:
+                print(f"Error compacting history: {str(e)}")
+                return False
+
+            self._log_lines = len(self._entries)
+            self.compactions += 1
+            return True
+
+    def back(self):
+        """
+        Move the cursor to the previous (older) entry.
+
+        Returns:
+            Verse: The entry, or None if there is no older entry.
+        """
+        with self._lock:
+            position = len(self._entries) - 1 if self._cursor is None else self._cursor
+            if position <= 0:
+                return None
+            self._cursor = position - 1
+            return self._entries[self._cursor]
+
+    def forward(self):
+        """
+        Move the cursor to the next (newer) entry.
+
+        Returns:
+            Verse: The entry, or None if the cursor is at the newest entry.
+        """
+        with self._lock:
+            if self._cursor is None or self._cursor >= len(self._entries) - 1:
+                return None
+            self._cursor += 1
+            if self._cursor == len(self._entries) - 1:
+                entry = self._entries[self._cursor]
+                self._cursor = None
+                return entry
+            return self._entries[self._cursor]
+
+    def can_go_back(self):
+        """
+        Check whether back() would return an entry.
+
+        Returns:
+            bool: True if there is an older entry.
+        """
+        with self._lock:
+            position = len(self._entries) - 1 if self._cursor is None else self._cursor
+            return position > 0
+
+    def can_go_forward(self):
+        """
+        Check whether forward() would return an entry.
+
+        Returns:
+            bool: True if there is a newer entry.
+        """
+        with self._lock:
+            return self._cursor is not None
+
+    def current(self):
+        """
+        Get the entry at the cursor.
+
+        Returns:
+            Verse: The entry, or None if the history is empty.
+        """
+        with self._lock:
+            if not self._entries:
+                return None
+            return self._entries[-1 if self._cursor is None else self._cursor]
+
+    def to_list(self):
+        """
+        Get the entries, oldest first.
+
+        Returns:
+            list: The verses.
+        """
+        with self._lock:
+            return list(self._entries)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def clear(self):
+        """Remove all entries from memory and the log."""
+        with self._lock:
+            self._entries.clear()
+            self._cursor = None
+            if self.log_path is not None:
+                self.compact()
+
+    def _close_log(self):
+        """Close the log file handle if it is open."""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def close(self):
+        """Close the log file."""
+        with self._lock:
+            self._close_log()
@@ -0,0 +1,131 @@
+"""
+Verse Keys for Qur'anic Verse Application
+
+This module maps between "surah:ayah" references and global ayah numbers
+without any API call.
+"""
+
+from array import array
+
+TOTAL_SURAHS = 114
+TOTAL_VERSES = 6236
+
+# Number of ayahs in each surah (Hafs numbering, as used by the API)
+SURAH_LENGTHS = (
+    7, 286, 200, 176, 120, 165, 206, 75, 129, 109, 123, 111, 43, 52, 99, 128,
+    111, 110, 98, 135, 112, 78, 118, 64, 77, 227, 93, 88, 69, 60, 34, 30, 73,
+    54, 45, 83, 182, 88, 75, 85, 54, 53, 89, 59, 37, 35, 38, 29, 18, 45, 60,
+    49, 62, 55, 78, 96, 29, 22, 24, 13, 14, 11, 11, 18, 12, 12, 30, 52, 52,
+    44, 28, 28, 20, 56, 40, 31, 50, 40, 46, 42, 29, 19, 36, 25, 22, 17, 19,
+    26, 30, 20, 15, 21, 11, 8, 8, 19, 5, 8, 8, 11, 11, 8, 3, 9, 5, 4, 7, 3,
+    6, 3, 5, 4, 5, 6
+)
+
+# SURAH_OFFSETS[s - 1] is the number of ayahs before surah s
+SURAH_OFFSETS = array("H", [0])
+for _length in SURAH_LENGTHS:
+    SURAH_OFFSETS.append(SURAH_OFFSETS[-1] + _length)
+
+# VERSE_SURAHS[n] is the surah containing global ayah n (index 0 is unused)
+VERSE_SURAHS = array("B", [0])
+for _surah, _length in enumerate(SURAH_LENGTHS, start=1):
+    VERSE_SURAHS.extend([_surah] * _length)
+
+del _surah, _length
+
+
+def verse_id(surah, ayah):
+    """
+    Get the global ayah number of a verse.
+
+    Args:
+        surah (int): The surah number (1-114).
+        ayah (int): The ayah number within the surah.
+
+    Returns:
+        int: The global ayah number (1-6236), or None if the verse does not exist.
+    """
+    if not 1 <= surah <= TOTAL_SURAHS or not 1 <= ayah <= SURAH_LENGTHS[surah - 1]:
+        return None
+    return SURAH_OFFSETS[surah - 1] + ayah
+
+
+def verse_key(number):
+    """
+    Get the surah and ayah of a global ayah number.
+
+    Args:
+        number (int): The global ayah number (1-6236).
+
+    Returns:
+        tuple: (surah, ayah), or None if the number is out of range.
+    """
+    if not 1 <= number <= TOTAL_VERSES:
+        return None
+    surah = VERSE_SURAHS[number]
+    return surah, number - SURAH_OFFSETS[surah - 1]
+
+
+def parse_reference(reference):
+    """
+    Normalize a verse reference to its global ayah number.
+
+    Accepts global numbers (262 or "262") and "surah:ayah" references
+    ("2:255"), ignoring surrounding whitespace.
+
+    Args:
+        reference (int or str): The verse reference.
+
+    Returns:
+        int: The global ayah number, or None if the reference is invalid.
+    """
+    if isinstance(reference, bool):
+        return None
+
+    if isinstance(reference, int):
+        return reference if 1 <= reference <= TOTAL_VERSES else None
+
+    reference = str(reference).strip()
+
+    if ":" in reference:
+        surah, _, ayah = reference.partition(":")
+        surah, ayah = surah.strip(), ayah.strip()
+        if not (surah.isdecimal() and ayah.isdecimal()):
+            return None
+        return verse_id(int(surah), int(ayah))
+
+    if reference.isdecimal():
+        return parse_reference(int(reference))
+
+    return None
+
+
+def format_reference(number):
+    """
+    Format a global ayah number as a "surah:ayah" reference.
+
+    Args:
+        number (int): The global ayah number (1-6236).
+
+    Returns:
+        str: The reference, e.g. "2:255", or None if the number is out of range.
+    """
+    key = verse_key(number)
+    if key is None:
+        return None
+    return f"{key[0]}:{key[1]}"
+
+
+def surah_verses(surah):
+    """
+    Get the global ayah numbers of a surah.
+
+    Args:
+        surah (int): The surah number (1-114).
+
+    Returns:
+        range: The surah's global ayah numbers (empty if the surah does not exist).
+    """
+    if not 1 <= surah <= TOTAL_SURAHS:
+        return range(0)
+    return range(SURAH_OFFSETS[surah - 1] + 1, SURAH_OFFSETS[surah] + 1)
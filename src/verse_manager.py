@@ -4,63 +4,379 @@ Verse Manager for Qur'anic Verse Application
 This module manages verse retrieval, formatting, and caching.
 """
 
+import hashlib
+import os
+
 from src.api_service import APIService
+from src.async_api_service import AsyncAPIService
+from src.quran_metadata import QuranMetadata
+from src.resilience import Deadline
+from src.search_index import NGramIndex, SearchIndex
+from src.tanzil_importer import import_edition, make_edition
+from src.verse import Verse
+from src.verse_history import VerseHistory
+from src.verse_keys import TOTAL_VERSES
+from src.verse_sampler import VerseSampler, scope_verses
 
 class VerseManager:
     """
     Manager for handling Qur'anic verses.
     """
 
-    def __init__(self):
-        """Initialize the verse manager."""
-        self.api_service = APIService()
-        self.current_verse = None
-        self.history = []
-        self.max_history = 50
+    def __init__(self, api_service=None, metadata=None, history=None, request_budget=None):
+        """
+        Initialize the verse manager.
 
-    def get_random_verse(self, translation="en.asad"):
+        Args:
+            api_service (APIService, optional): The API service to use.
+                                                Defaults to a new APIService.
+            metadata (QuranMetadata, optional): Index of the Quran's divisions.
+                                                Loaded through the API service
+                                                on first use by default.
+            history (VerseHistory, optional): History of shown verses.
+                                              Defaults to an in-memory history
+                                              of 50 verses.
+            request_budget (float, optional): Default seconds a verse fetch may
+                                              take. Defaults to no limit.
+        """
+        self.api_service = api_service if api_service is not None else APIService()
+        self._async_api_service = None
+        self._metadata = metadata
+        self.request_budget = request_budget
+        self._scoped_samplers = {}
+        self.search_index = SearchIndex()
+        self.arabic_index = NGramIndex()
+        self.history = history if history is not None else VerseHistory()
+        self.current_verse = self.history.current()
+
+    def get_random_verse(self, translation="en.asad", scope=None, budget=None):
         """
         Get a random verse with the specified translation.
         
         Args:
             translation (str): The translation identifier.
+            scope (tuple, optional): Scope to pick from, e.g. ("juz", 30) or
+                                     ("surahs", [112, 113, 114]); see
+                                     scope_verses. Defaults to the whole Quran.
+            budget (float, optional): Seconds the fetch may take. Defaults to
+                                      request_budget.
         
         Returns:
             dict: Formatted verse data.
         """
+        formatted_verse = self.fetch_random_verse(translation, scope, budget)
+
+        if formatted_verse:
+            self.set_current_verse(formatted_verse)
+
+        return formatted_verse
+
+    def fetch_random_verse(self, translation="en.asad", scope=None, budget=None):
+        """
+        Fetch and format a random verse without making it the current verse.
+
+        Args:
+            translation (str): The translation identifier.
+            scope (tuple, optional): Scope to pick from, e.g. ("juz", 30) or
+                                     ("surahs", [112, 113, 114]); see
+                                     scope_verses. Defaults to the whole Quran.
+            budget (float, optional): Seconds the fetch may take. Defaults to
+                                      request_budget.
+
+        Returns:
+            dict: Formatted verse data, or None if an error occurred.
+        """
+        if scope is not None:
+            sampler = self._sampler_for(scope)
+            if sampler is None:
+                print(f"Unknown verse scope: {scope}")
+                return None
+            return self.fetch_specific_verse(sampler.next(), translation, budget)
+
         editions = f"quran-uthmani,{translation}"
-        verse_data = self.api_service.get_random_verse(editions)
+        verse_data = self.api_service.get_random_verse(editions, deadline=self._deadline(budget))
 
         if verse_data:
-            formatted_verse = self._format_verse(verse_data)
-            self.current_verse = formatted_verse
-            self._add_to_history(formatted_verse)
-            return formatted_verse
+            return self._format_verse(verse_data)
 
         return None
 
-    def get_specific_verse(self, reference, translation="en.asad"):
+    def _deadline(self, budget):
+        """
+        Start the deadline of a verse fetch.
+
+        Args:
+            budget (float): Seconds the fetch may take, or None for request_budget.
+
+        Returns:
+            Deadline: The deadline, or None if the fetch has no time limit.
+        """
+        if budget is None:
+            budget = self.request_budget
+        return Deadline(budget) if budget is not None else None
+
+    def _sampler_for(self, scope):
+        """
+        Get the shuffle bag for a verse scope, creating it on first use.
+
+        Scoped samplers share the seed of the API service's sampler and,
+        if it is saved, keep their position in a file next to its state,
+        named after the scope.
+
+        Args:
+            scope (tuple): The scope description.
+
+        Returns:
+            VerseSampler: The sampler, or None if the scope cannot be resolved.
+        """
+        key = repr(scope)
+        if key not in self._scoped_samplers:
+            # Only division scopes need the (possibly remote) metadata
+            needs_metadata = scope != "all" and scope[0] not in ("surahs", "length")
+            metadata = self.metadata if needs_metadata else None
+            verses = scope_verses(scope, metadata, self.api_service.corpus_store)
+            if not verses:
+                return None
+
+            base = self.api_service.sampler
+            state_path = None
+            if base.state_path is not None:
+                digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+                state_path = os.path.join(os.path.dirname(base.state_path), f"sampler-{digest}.json")
+            self._scoped_samplers[key] = VerseSampler(verses, seed=base.seed, state_path=state_path)
+        return self._scoped_samplers[key]
+
+    def close(self):
+        """Save the position of the random verse samplers."""
+        self.api_service.sampler.close()
+        for sampler in list(self._scoped_samplers.values()):
+            sampler.close()
+
+    def set_current_verse(self, verse):
+        """
+        Make a formatted verse the current verse and add it to the history.
+
+        Args:
+            verse (dict): Formatted verse data.
+        """
+        self.current_verse = verse
+        self._add_to_history(verse)
+
+    def get_specific_verse(self, reference, translation="en.asad", budget=None):
         """
         Get a specific verse with the specified translation.
         
         Args:
             reference (str): Verse reference (number or surah:ayah format).
             translation (str): The translation identifier.
+            budget (float, optional): Seconds the fetch may take. Defaults to
+                                      request_budget.
         
         Returns:
             dict: Formatted verse data.
         """
+        formatted_verse = self.fetch_specific_verse(reference, translation, budget)
+
+        if formatted_verse:
+            self.set_current_verse(formatted_verse)
+
+        return formatted_verse
+
+    def fetch_specific_verse(self, reference, translation="en.asad", budget=None):
+        """
+        Fetch and format a specific verse without making it the current verse.
+
+        Args:
+            reference (str): Verse reference (number or surah:ayah format).
+            translation (str): The translation identifier.
+            budget (float, optional): Seconds the fetch may take. Defaults to
+                                      request_budget.
+
+        Returns:
+            dict: Formatted verse data, or None if an error occurred.
+        """
         editions = f"quran-uthmani,{translation}"
-        verse_data = self.api_service.get_specific_verse(reference, editions)
+        verse_data = self.api_service.get_specific_verse(reference, editions,
+                                                         deadline=self._deadline(budget))
+
+        if verse_data:
+            return self._format_verse(verse_data)
+
+        return None
+
+    def get_surah_verses(self, number, translation="en.asad"):
+        """
+        Get all verses of a surah, fetched in one request.
+
+        The verses are not added to the history.
+
+        Args:
+            number (int): The surah number.
+            translation (str): The translation identifier.
+
+        Returns:
+            list: Formatted verses in order, or an empty list on error.
+        """
+        editions = f"quran-uthmani,{translation}"
+        ayahs = self.api_service.get_surah(number, editions)
+        return [self._format_verse(verse_data) for verse_data in ayahs or []]
+
+    def get_page_verses(self, number, translation="en.asad"):
+        """
+        Get all verses on a mushaf page.
+
+        The verses are not added to the history.
+
+        Args:
+            number (int): The page number.
+            translation (str): The translation identifier.
+
+        Returns:
+            list: Formatted verses in order, or an empty list on error.
+        """
+        editions = f"quran-uthmani,{translation}"
+        ayahs = self.api_service.get_page(number, editions)
+        return [self._format_verse(verse_data) for verse_data in ayahs or []]
+
+    def get_division_verses(self, division, number, translation="en.asad"):
+        """
+        Get all verses of a juz, hizb, manzil, ruku or hizb quarter.
+
+        The verses are not added to the history.
+
+        Args:
+            division (str): The division name, e.g. "juz".
+            number (int): The part number.
+            translation (str): The translation identifier.
+
+        Returns:
+            list: Formatted verses in order, or an empty list on error.
+        """
+        if division == "surah":
+            return self.get_surah_verses(number, translation)
+
+        if division == "hizb":
+            # The API serves hizb quarters; a hizb is four of them
+            verses = []
+            for quarter in range(4 * number - 3, 4 * number + 1):
+                part = self.get_division_verses("hizbQuarter", quarter, translation)
+                if not part:
+                    return []
+                verses.extend(part)
+            return verses
+
+        editions = f"quran-uthmani,{translation}"
+        ayahs = self.api_service.get_division(division, number, editions)
+        return [self._format_verse(verse_data) for verse_data in ayahs or []]
+
+    @property
+    def metadata(self):
+        """
+        The index of the Quran's divisions.
+
+        Returns:
+            QuranMetadata: The loaded index, or the built-in surah, juz and
+                           manzil tables while it cannot be loaded.
+        """
+        if self._metadata is None:
+            metadata = self.api_service.get_metadata()
+            if metadata is None:
+                return QuranMetadata()
+            self._metadata = metadata
+        return self._metadata
+
+    def get_verse_location(self, reference):
+        """
+        Find the surah, juz, hizb, page, manzil and ruku of a verse.
+
+        Args:
+            reference (int or str): Verse reference (number or surah:ayah format).
+
+        Returns:
+            dict: Division name mapped to part number, or None if the
+                  reference is invalid.
+        """
+        return self.metadata.locate(reference)
+
+    @property
+    def async_api_service(self):
+        """
+        The asyncio client sharing this manager's API service.
+
+        Returns:
+            AsyncAPIService: The async client, created on first use.
+        """
+        if self._async_api_service is None:
+            self._async_api_service = AsyncAPIService(self.api_service)
+        return self._async_api_service
+
+    async def get_random_verse_async(self, translation="en.asad"):
+        """
+        Async counterpart of get_random_verse.
+
+        Args:
+            translation (str): The translation identifier.
+
+        Returns:
+            dict: Formatted verse data.
+        """
+        editions = f"quran-uthmani,{translation}"
+        verse_data = await self.async_api_service.get_random_verse(editions)
+
+        if verse_data:
+            formatted_verse = self._format_verse(verse_data)
+            self.set_current_verse(formatted_verse)
+            return formatted_verse
+
+        return None
+
+    async def get_specific_verse_async(self, reference, translation="en.asad"):
+        """
+        Async counterpart of get_specific_verse.
+
+        Args:
+            reference (str): Verse reference (number or surah:ayah format).
+            translation (str): The translation identifier.
+
+        Returns:
+            dict: Formatted verse data.
+        """
+        editions = f"quran-uthmani,{translation}"
+        verse_data = await self.async_api_service.get_specific_verse(reference, editions)
 
         if verse_data:
             formatted_verse = self._format_verse(verse_data)
-            self.current_verse = formatted_verse
-            self._add_to_history(formatted_verse)
+            self.set_current_verse(formatted_verse)
             return formatted_verse
 
         return None
 
+    async def get_verses_async(self, references, translation="en.asad"):
+        """
+        Fetch and format several verses concurrently.
+
+        The verses are not added to the history.
+
+        Args:
+            references (list): Verse references.
+            translation (str): The translation identifier.
+
+        Returns:
+            list: Formatted verses in the order of the references (None for failures).
+        """
+        editions = f"quran-uthmani,{translation}"
+        results = await self.async_api_service.get_verses(references, editions)
+        return [self._format_verse(verse_data) if verse_data else None for verse_data in results]
+
+    async def get_available_translations_async(self):
+        """
+        Async counterpart of get_available_translations.
+
+        Returns:
+            list: List of translation editions.
+        """
+        return self._translation_list(await self.async_api_service.get_available_editions())
+
     def _format_verse(self, verse_data):
         """
         Format the verse data into a standardized structure.
@@ -69,48 +385,104 @@ class VerseManager:
             verse_data (dict or list): Raw verse data from the API.
 
         Returns:
-            dict: Formatted verse data.
+            Verse: Formatted verse data, readable like the nested dict form.
         """
         if not isinstance(verse_data, list):
             verse_data = [verse_data]
 
-        formatted_verse = {
-            "number": None,
-            "surah": {
-                "number": None,
-                "name": None,
-                "englishName": None
-            },
-            "text": {
-                "arabic": None,
-                "translation": None
-            },
-            "audio": {
-                "url": None
-            },
-            "reference": None
-        }
-
-        for entry in verse_data:
-            edition_info = entry.get("edition", {})
-            identifier = edition_info.get("identifier")
-
-            if identifier == "quran-uthmani":
-                formatted_verse["text"]["arabic"] = entry.get("text")
-                surah = entry.get("surah", {})
-                formatted_verse["surah"]["number"] = surah.get("number")
-                formatted_verse["surah"]["name"] = surah.get("name")
-                formatted_verse["surah"]["englishName"] = surah.get("englishName")
-                formatted_verse["reference"] = f"{surah.get('number')}:{entry.get('numberInSurah')}"
-                formatted_verse["number"] = entry.get("number")
-
-            elif identifier:
-                formatted_verse["text"]["translation"] = entry.get("text")
-
-            if entry.get("audio"):
-                formatted_verse["audio"]["url"] = entry["audio"]
+        # Every fetched text becomes searchable
+        self.search_index.add_verse_data(verse_data)
+        self.arabic_index.add_verse_data(verse_data)
 
-        return formatted_verse
+        return Verse.from_api(verse_data)
+
+    def search(self, query, translation=None, surahs=None, juz=None, limit=20):
+        """
+        Search the verses seen so far and all installed editions.
+
+        Installed editions that are not indexed yet are indexed first.
+
+        Args:
+            query (str): Search terms; phrases in double quotes must match exactly.
+            translation (str, optional): Only search the Arabic text and this
+                                         translation. Defaults to all editions.
+            surahs (iterable, optional): Only return verses of these surahs.
+            juz (iterable, optional): Only return verses of these juz.
+            limit (int): Maximum number of results.
+
+        Returns:
+            list: Global ayah numbers, best match first.
+        """
+        self.index_installed_editions()
+
+        editions = ["quran-uthmani", translation] if translation else None
+        results = self.search_index.search(query, editions, surahs, juz, limit)
+        return [verse for verse, _ in results]
+
+    def search_arabic(self, query, fuzzy=False, limit=20):
+        """
+        Search the Arabic text ignoring diacritics and spelling variants.
+
+        Args:
+            query (str): Arabic text, with or without tashkeel.
+            fuzzy (bool): Also match verses that differ by a letter or two.
+            limit (int): Maximum number of results.
+
+        Returns:
+            list: Global ayah numbers; best match first when fuzzy,
+                  otherwise in Quran order.
+        """
+        self.index_installed_editions()
+
+        if fuzzy:
+            return [verse for verse, _ in self.arabic_index.search(query, limit=limit)]
+        return self.arabic_index.find(query, limit)
+
+    def index_installed_editions(self):
+        """
+        Add installed editions that are not fully indexed to the search indexes.
+
+        Returns:
+            int: Number of texts added.
+        """
+        corpus_store = self.api_service.corpus_store
+        if corpus_store is None:
+            return 0
+
+        added = 0
+        for edition in corpus_store.list_editions():
+            identifier = edition["identifier"]
+            if not self.search_index.has_edition(identifier):
+                added += self.search_index.add_texts(identifier, corpus_store.get_texts(identifier) or [])
+            if identifier == "quran-uthmani" and len(self.arabic_index) < TOTAL_VERSES:
+                self.arabic_index.add_texts(corpus_store.get_texts(identifier) or [])
+        return added
+
+    def import_edition(self, path, identifier, metadata_path=None):
+        """
+        Install an edition from a Tanzil text or XML file, indexing it for search.
+
+        Args:
+            path (str): Path to the Tanzil file.
+            identifier (str): Identifier to install the edition as.
+            metadata_path (str, optional): Path to Tanzil's quran-data.xml.
+
+        Returns:
+            bool: True if the edition was imported, False otherwise.
+        """
+        corpus_store = self.api_service.corpus_store
+        if corpus_store is None:
+            print("No offline corpus store configured")
+            return False
+
+        arabic_index = self.arabic_index if identifier == "quran-uthmani" else None
+        try:
+            import_edition(corpus_store, path, make_edition(identifier), metadata_path,
+                           self.search_index, arabic_index)
+        except (OSError, SyntaxError, ValueError) as e:
+            print(f"Error importing {path}: {str(e)}")
+            return False
+        return True
 
     def _add_to_history(self, verse):
         """
@@ -119,10 +491,7 @@ class VerseManager:
         Args:
             verse (dict): Formatted verse data.
         """
-        self.history.append(verse)
-
-        if len(self.history) > self.max_history:
-            self.history.pop(0)
+        self.history.add(verse)
 
     def get_available_translations(self):
         """
@@ -131,8 +500,18 @@ class VerseManager:
         Returns:
             list: List of translation editions.
         """
-        editions = self.api_service.get_available_editions()
+        return self._translation_list(self.api_service.get_available_editions())
+
+    def _translation_list(self, editions):
+        """
+        Extract the text translations from the editions catalog.
 
+        Args:
+            editions (list): Editions as returned by the API, or None.
+
+        Returns:
+            list: List of translation editions.
+        """
         if editions:
             translations = [
                 {
@@ -177,13 +556,37 @@ class VerseManager:
         Get the verse history.
         
         Returns:
-            list: List of verses in the history.
+            list: List of verses in the history, oldest first.
         """
-        return self.history
+        return self.history.to_list()
 
     def clear_history(self):
         """Clear the verse history."""
-        self.history = []
+        self.history.clear()
+
+    def previous_verse(self):
+        """
+        Go back to the verse shown before the current one.
+
+        Returns:
+            Verse: The previous verse, now current, or None at the oldest entry.
+        """
+        verse = self.history.back()
+        if verse is not None:
+            self.current_verse = verse
+        return verse
+
+    def next_verse(self):
+        """
+        Go forward again after previous_verse.
+
+        Returns:
+            Verse: The next verse, now current, or None at the newest entry.
+        """
+        verse = self.history.forward()
+        if verse is not None:
+            self.current_verse = verse
+        return verse
 
     def get_formatted_verse_text(self, verse=None, include_reference=True):
         """
@@ -206,7 +609,8 @@ class VerseManager:
         translation = verse["text"]["translation"]
 
         if include_reference:
-            surah_name = verse["surah"]["englishName"]
+            # Editions imported without metadata have no transliterated names
+            surah_name = verse["surah"]["englishName"] or verse["surah"]["name"] or verse["surah"]["number"]
             reference = verse["reference"]
             return f"﴾ {arabic} ﴿\n\n{translation}\n\n— Surah {surah_name} ({reference})"
         else:
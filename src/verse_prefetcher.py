@@ -0,0 +1,147 @@
+"""
+Verse Prefetcher for Qur'anic Verse Application
+
+This module keeps a buffer of ready-to-show random verses that is refilled
+in the background.
+"""
+
+import threading
+from collections import deque
+
+
+class VersePrefetcher:
+    """
+    Background producer of formatted random verses for one translation.
+
+    A worker thread keeps up to ``size`` verses buffered. Fetches go
+    through the verse manager's API service and therefore its rate limit.
+    Changing the translation refetches the buffered verses in the new
+    translation: their numbers were already drawn from the shuffle bag, so
+    dropping them would skip them for the rest of the cycle.
+    """
+
+    RETRY_DELAY = 5.0
+
+    def __init__(self, verse_manager, translation="en.asad", size=5):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            verse_manager (VerseManager): Used to fetch and format verses.
+            translation (str): The translation identifier to prefetch.
+            size (int): Number of verses to keep buffered.
+        """
+        self.verse_manager = verse_manager
+        self.translation = translation
+        self.size = size
+        self._buffer = deque()
+        # Numbers of drawn verses still to be fetched in the current translation
+        self._refetch = deque()
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._running = False
+        self._thread = None
+        self.served = 0
+        self.misses = 0
+
+    def start(self):
+        """Start the background worker."""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+
+        self._thread = threading.Thread(target=self._run, name="verse-prefetcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background worker."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def get(self):
+        """
+        Take a buffered verse.
+
+        Returns:
+            dict: A formatted verse, or None if the buffer is empty.
+        """
+        with self._condition:
+            if not self._buffer:
+                self.misses += 1
+                return None
+
+            verse = self._buffer.popleft()
+            self.served += 1
+            self._condition.notify_all()
+            return verse
+
+    def set_translation(self, translation):
+        """
+        Switch to another translation, refetching buffered verses in it.
+
+        Args:
+            translation (str): The new translation identifier.
+        """
+        with self._condition:
+            if translation == self.translation:
+                return
+
+            self.translation = translation
+            self._generation += 1
+            self._refetch.extend(verse["number"] for verse in self._buffer)
+            self._buffer.clear()
+            self._condition.notify_all()
+
+    def _run(self):
+        """Refill the buffer until stopped."""
+        while True:
+            with self._condition:
+                while self._running and len(self._buffer) >= self.size:
+                    self._condition.wait()
+
+                if not self._running:
+                    return
+
+                generation = self._generation
+                translation = self.translation
+                number = self._refetch.popleft() if self._refetch else None
+
+            if number is not None:
+                verse = self.verse_manager.fetch_specific_verse(number, translation)
+            else:
+                verse = self.verse_manager.fetch_random_verse(translation)
+
+            with self._condition:
+                if verse and generation == self._generation:
+                    self._buffer.append(verse)
+                    continue
+
+                # A verse fetched for a translation that is no longer current
+                # is fetched again rather than lost from the cycle
+                if verse:
+                    self._refetch.append(verse["number"])
+                elif number is not None:
+                    self._refetch.appendleft(number)
+                if not verse:
+                    self._condition.wait(self.RETRY_DELAY)
+
+    def stats(self):
+        """
+        Get the prefetcher statistics.
+
+        Returns:
+            dict: Buffered verse count, verses served and empty-buffer misses.
+        """
+        with self._condition:
+            return {
+                "buffered": len(self._buffer),
+                "size": self.size,
+                "served": self.served,
+                "misses": self.misses
+            }
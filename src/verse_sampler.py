@@ -0,0 +1,254 @@
+"""
+Verse Sampler for Qur'anic Verse Application
+
+This module picks random verses without repeats until every verse in the
+chosen scope has been shown.
+"""
+
+import base64
+import json
+import os
+import random
+import tempfile
+import threading
+from array import array
+
+from src.verse_keys import TOTAL_VERSES, surah_verses
+
+
+def scope_verses(scope, metadata=None, corpus_store=None):
+    """
+    List the verses of a sampling scope.
+
+    Supported scopes:
+        None or "all"                      every verse
+        ("surahs", [1, 112, 113, 114])     the verses of some surahs
+        ("juz", 30), ("page", 1), ...      one part of a division (needs metadata)
+        ("length", 1, 80)                  verses whose Uthmani text has 1-80
+                                           characters (needs an installed corpus)
+        ("length", 1, 80, "en.asad")       the same for another installed edition
+
+    Args:
+        scope: The scope description.
+        metadata (QuranMetadata, optional): Division index for division scopes.
+        corpus_store (CorpusStore, optional): Corpus for length scopes.
+
+    Returns:
+        list: Ascending global ayah numbers, or None if the scope is unknown
+              or cannot be resolved.
+    """
+    if scope is None or scope == "all":
+        return list(range(1, TOTAL_VERSES + 1))
+
+    kind = scope[0]
+
+    if kind == "surahs":
+        return sorted({number for surah in scope[1] for number in surah_verses(surah)}) or None
+
+    if kind == "length":
+        if corpus_store is None:
+            return None
+        edition = scope[3] if len(scope) > 3 else "quran-uthmani"
+        return corpus_store.verses_by_length(edition, scope[1], scope[2])
+
+    if metadata is not None and len(scope) == 2:
+        return list(metadata.verse_range(kind, scope[1])) or None
+
+    return None
+
+
+class VerseSampler:
+    """
+    Shuffle bag over a set of verses.
+
+    The bag is an ``array('H')`` shuffled lazily: each draw swaps a random
+    remaining verse to the end of the undrawn region (one Fisher-Yates step),
+    so drawing is O(1) and no verse repeats until the bag is exhausted, at
+    which point a new cycle starts. The bag, its position and the random
+    generator state can be saved to a file and restored after a restart.
+
+    The state file is rewritten every ``save_interval`` draws rather than
+    after each one; call close() on shutdown to save the rest.
+    """
+
+    STATE_VERSION = 1
+    SAVE_INTERVAL = 20
+
+    def __init__(self, verses=None, seed=None, state_path=None, save_interval=SAVE_INTERVAL):
+        """
+        Initialize the sampler.
+
+        Args:
+            verses (iterable, optional): Global ayah numbers to draw from.
+                                         Defaults to the whole Quran.
+            seed (int, optional): Seed for a reproducible order.
+            state_path (str, optional): File the position is saved to and
+                                        restored from.
+            save_interval (int): Number of draws between saves.
+        """
+        if verses is None:
+            verses = range(1, TOTAL_VERSES + 1)
+
+        self._bag = array("H", verses)
+        self._remaining = len(self._bag)
+        self._random = random.Random(seed)
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._unsaved = 0
+        self.state_path = state_path
+        self.save_interval = max(1, save_interval)
+        self.cycles = 0
+
+        if state_path is not None:
+            self.load()
+
+    def __len__(self):
+        return len(self._bag)
+
+    def next(self):
+        """
+        Draw the next verse.
+
+        Returns:
+            int: A global ayah number, or None if the sampler is empty.
+        """
+        with self._lock:
+            if not self._bag:
+                return None
+
+            if self._remaining == 0:
+                self._remaining = len(self._bag)
+                self.cycles += 1
+
+            index = self._random.randrange(self._remaining)
+            self._remaining -= 1
+            bag = self._bag
+            bag[index], bag[self._remaining] = bag[self._remaining], bag[index]
+            number = bag[self._remaining]
+
+            self._unsaved += 1
+            save = self.state_path is not None and self._unsaved >= self.save_interval
+            if save:
+                self._unsaved = 0
+
+        if save:
+            self.save()
+        return number
+
+    def remaining(self):
+        """
+        Get the number of verses left in the current cycle.
+
+        Returns:
+            int: Verses that can be drawn before a repeat.
+        """
+        with self._lock:
+            return self._remaining
+
+    def save(self):
+        """
+        Save the bag and position to the state file.
+
+        Saves are serialized and each one snapshots the state after taking
+        its turn, so the file never ends up behind an earlier snapshot. The
+        state is written to a unique temporary file and moved into place.
+
+        Returns:
+            bool: True if the state was saved, False otherwise.
+        """
+        with self._save_lock:
+            with self._lock:
+                state = {
+                    "version": self.STATE_VERSION,
+                    "bag": base64.b64encode(self._bag.tobytes()).decode("ascii"),
+                    "remaining": self._remaining,
+                    "cycles": self.cycles,
+                    "random": self._random.getstate()
+                }
+                self._unsaved = 0
+
+            temp_path = None
+            try:
+                directory = os.path.dirname(os.path.abspath(self.state_path))
+                os.makedirs(directory, exist_ok=True)
+
+                fd, temp_path = tempfile.mkstemp(
+                    prefix=f".{os.path.basename(self.state_path)}.", suffix=".tmp", dir=directory
+                )
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(state, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.state_path)
+                return True
+            except Exception as e:
+                print(f"Error saving sampler state: {str(e)}")
+                return False
+            finally:
+                if temp_path is not None and os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+    def close(self):
+        """
+        Save any draws made since the last save.
+
+        Returns:
+            bool: True if nothing was pending or the state was saved.
+        """
+        with self._lock:
+            pending = self.state_path is not None and self._unsaved > 0
+        return self.save() if pending else True
+
+    def load(self):
+        """
+        Restore the bag and position from the state file.
+
+        The saved state is ignored if it was made for a different set of
+        verses.
+
+        Returns:
+            bool: True if the state was restored, False otherwise.
+        """
+        if not os.path.exists(self.state_path):
+            return False
+
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+
+            if state.get("version") != self.STATE_VERSION:
+                return False
+
+            bag = array("H")
+            bag.frombytes(base64.b64decode(state["bag"]))
+            remaining = state["remaining"]
+            random_state = state["random"]
+            random_state = (random_state[0], tuple(random_state[1]), random_state[2])
+        except Exception as e:
+            print(f"Error loading sampler state: {str(e)}")
+            return False
+
+        with self._lock:
+            if sorted(bag) != sorted(self._bag) or not 0 <= remaining <= len(bag):
+                return False
+
+            self._bag = bag
+            self._remaining = remaining
+            self.cycles = state.get("cycles", 0)
+            self._random.setstate(random_state)
+        return True
+
+    def stats(self):
+        """
+        Get the sampler statistics.
+
+        Returns:
+            dict: Scope size, verses left in the current cycle and completed cycles.
+        """
+        with self._lock:
+            return {
+                "size": len(self._bag),
+                "remaining": self._remaining,
+                "cycles": self.cycles
+            }
@@ -9,6 +9,12 @@ import tkinter as tk
 from unittest.mock import MagicMock, patch
 import sys
 import os
+import tempfile
+import time
+import threading
+import asyncio
+import json
+import requests
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,6 +22,69 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.api_service import APIService
 from src.verse_manager import VerseManager
 from src.config_manager import ConfigurationManager
+from src.corpus_store import CorpusStore
+from src.http_transport import HTTPTransport
+from src.json_stream import iter_json
+from src.verse_cache import VerseCache, estimate_size
+from src.persistent_cache import PersistentCache
+from src.providers import ProviderRouter, QuranComProvider, VerseProvider
+from src.verse_prefetcher import VersePrefetcher
+from src.ui_tasks import UITaskRunner
+from src.rate_limiter import TokenBucketRateLimiter, parse_retry_after
+from src.latency_tracker import LatencyTracker
+from src.resilience import CircuitBreaker, Deadline, RetryPolicy
+from src.async_api_service import AsyncAPIService
+from src.single_flight import SingleFlight
+from src.quran_metadata import QuranMetadata
+from src.search_index import NGramIndex, SearchIndex, tokenize
+from src.tanzil_importer import import_edition, make_edition
+from src.arabic_text import normalize_arabic
+from src.verse_sampler import VerseSampler, scope_verses
+from src.verse import SurahInfo, Verse
+from src.verse_history import VerseHistory
+from src.verse_keys import SURAH_LENGTHS, TOTAL_VERSES, format_reference, parse_reference, verse_key
+
+
+def make_edition_surahs(identifier, surah_lengths=None):
+    """Build a synthetic full edition in the API's /quran response shape."""
+    if surah_lengths is None:
+        surah_lengths = [7, 286] + [53] * 111 + [60]
+    surahs = []
+    number = 1
+    for surah_number, length in enumerate(surah_lengths, start=1):
+        ayahs = []
+        for ayah_number in range(1, length + 1):
+            ayahs.append({
+                "number": number,
+                "text": f"{identifier} {surah_number}:{ayah_number}",
+                "numberInSurah": ayah_number,
+                "juz": 1,
+                "manzil": 1,
+                "page": 1,
+                "ruku": 1,
+                "hizbQuarter": 1,
+                "sajda": False
+            })
+            number += 1
+        surahs.append({
+            "number": surah_number,
+            "name": f"Surah {surah_number}",
+            "englishName": f"Surah-{surah_number}",
+            "englishNameTranslation": "",
+            "revelationType": "Meccan",
+            "ayahs": ayahs
+        })
+    edition = {
+        "identifier": identifier,
+        "language": "ar" if identifier == "quran-uthmani" else "en",
+        "name": identifier,
+        "englishName": identifier,
+        "format": "text",
+        "type": "quran" if identifier == "quran-uthmani" else "translation",
+        "direction": "rtl" if identifier == "quran-uthmani" else "ltr"
+    }
+    return edition, surahs
+
 
 class TestAPIService(unittest.TestCase):
     """Test cases for the API Service."""
@@ -24,7 +93,7 @@ class TestAPIService(unittest.TestCase):
         """Set up test environment."""
         self.api_service = APIService()
     
-    @patch('src.api_service.requests.get')
+    @patch('src.http_transport.requests.Session.get')
     def test_get_random_verse(self, mock_get):
         """Test getting a random verse."""
         # Mock response
@@ -71,7 +140,7 @@ class TestAPIService(unittest.TestCase):
         mock_get.assert_called_once()
         self.assertIn("ayah", mock_get.call_args[0][0])
     
-    @patch('src.api_service.requests.get')
+    @patch('src.http_transport.requests.Session.get')
     def test_get_specific_verse(self, mock_get):
         """Test getting a specific verse."""
         # Mock response
@@ -117,7 +186,7 @@ class TestAPIService(unittest.TestCase):
         mock_get.assert_called_once()
         self.assertIn("1:1", mock_get.call_args[0][0])
     
-    @patch('src.api_service.requests.get')
+    @patch('src.http_transport.requests.Session.get')
     def test_error_handling(self, mock_get):
         """Test error handling."""
         # Mock error response
@@ -132,6 +201,873 @@ class TestAPIService(unittest.TestCase):
         self.assertIsNone(verse)
 
 
+class TestVerseKeys(unittest.TestCase):
+    """Test cases for local verse reference resolution."""
+    
+    def test_round_trip(self):
+        """Test that every ayah maps to a reference and back."""
+        self.assertEqual(sum(SURAH_LENGTHS), TOTAL_VERSES)
+        for number in range(1, TOTAL_VERSES + 1):
+            self.assertEqual(parse_reference(format_reference(number)), number)
+        self.assertEqual(verse_key(262), (2, 255))
+        self.assertEqual(verse_key(6236), (114, 6))
+    
+    def test_parse_reference(self):
+        """Test that aliases normalize to one id and invalid references are rejected."""
+        self.assertEqual(parse_reference("1:1"), 1)
+        self.assertEqual(parse_reference(" 2:255 "), 262)
+        self.assertEqual(parse_reference("262"), 262)
+        self.assertEqual(parse_reference(262), 262)
+        for invalid in ("0", "6237", "1:8", "115:1", "2:", "abc", "1:-1", True, None):
+            self.assertIsNone(parse_reference(invalid))
+
+
+class TestBulkFetch(unittest.TestCase):
+    """Test cases for whole-surah and page fetching."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.api_service = APIService(rate_limiter=TokenBucketRateLimiter(rate=1000.0, burst=10))
+    
+    def _mock_response(self, data):
+        """Build a successful API response."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"code": 200, "status": "OK", "data": data}
+        return mock_response
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_surah_fills_per_ayah_cache(self, mock_get):
+        """Test that a surah is fetched once and its ayahs are reused."""
+        surahs = []
+        for identifier in ("quran-uthmani", "en.asad"):
+            surahs.append({
+                "number": 1,
+                "englishName": "Al-Faatiha",
+                "numberOfAyahs": 7,
+                "edition": {"identifier": identifier},
+                "ayahs": [{"number": n, "numberInSurah": n, "text": f"{identifier} {n}"}
+                          for n in range(1, 8)]
+            })
+        mock_get.return_value = self._mock_response(surahs)
+        
+        ayahs = self.api_service.get_surah(1)
+        
+        self.assertEqual(len(ayahs), 7)
+        self.assertEqual(ayahs[0][1]["text"], "en.asad 1")
+        self.assertEqual(ayahs[0][0]["surah"]["englishName"], "Al-Faatiha")
+        self.assertIn("/surah/1/editions/", mock_get.call_args[0][0])
+        self.assertEqual(self.api_service.get_specific_verse("1:3")[0]["text"], "quran-uthmani 3")
+        self.assertEqual(self.api_service.get_specific_verse(7)[1]["text"], "en.asad 7")
+        mock_get.assert_called_once()
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_translation_switch_fetches_only_new_edition(self, mock_get):
+        """Test that cached editions are reused when the translation changes."""
+        def ayah(identifier):
+            return {"number": 262, "text": identifier, "edition": {"identifier": identifier}}
+        
+        mock_get.return_value = self._mock_response([ayah("quran-uthmani"), ayah("en.asad")])
+        self.api_service.get_specific_verse(262, "quran-uthmani,en.asad")
+        
+        mock_get.return_value = self._mock_response([ayah("en.sahih")])
+        verse = self.api_service.get_specific_verse(262, "quran-uthmani,en.sahih")
+        
+        self.assertEqual([entry["text"] for entry in verse], ["quran-uthmani", "en.sahih"])
+        self.assertTrue(mock_get.call_args[0][0].endswith("/ayah/2:255/editions/en.sahih"))
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(self.api_service.find_verse(262, "en.asad,quran-uthmani")[0]["text"], "en.asad")
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_reference_aliases_share_cache_entries(self, mock_get):
+        """Test that equivalent references hit the same entry and invalid ones skip the API."""
+        mock_get.return_value = self._mock_response([
+            {"number": 1, "text": identifier, "edition": {"identifier": identifier}}
+            for identifier in ("quran-uthmani", "en.asad")
+        ])
+        
+        self.api_service.get_specific_verse("1:1")
+        self.assertEqual(self.api_service.get_specific_verse("1")[1]["text"], "en.asad")
+        self.assertIsNotNone(self.api_service.get_specific_verse(1))
+        self.assertIsNone(self.api_service.get_specific_verse("1:8"))
+        
+        mock_get.assert_called_once()
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_page_fetches_each_edition(self, mock_get):
+        """Test that a page combines one request per edition."""
+        mock_get.side_effect = [
+            self._mock_response({
+                "number": 604,
+                "edition": {"identifier": identifier},
+                "ayahs": [{"number": n, "numberInSurah": n - 6230, "text": f"{identifier} {n}",
+                           "surah": {"number": 114, "englishName": "An-Naas"}}
+                          for n in range(6231, 6237)]
+            })
+            for identifier in ("quran-uthmani", "en.asad")
+        ]
+        verse_manager = VerseManager(self.api_service)
+        
+        verses = verse_manager.get_page_verses(604)
+        
+        self.assertEqual(len(verses), 6)
+        self.assertEqual(verses[-1]["reference"], "114:6")
+        self.assertEqual(verses[-1]["text"]["translation"], "en.asad 6236")
+        self.assertEqual(mock_get.call_count, 2)
+    
+    def test_invalid_surah(self):
+        """Test that out-of-range surahs are rejected without a request."""
+        self.assertIsNone(self.api_service.get_surah(115))
+
+
+class TestJSONStream(unittest.TestCase):
+    """Test cases for the incremental JSON parser."""
+    
+    def test_chunk_boundaries_do_not_matter(self):
+        """Test that any chunking of a document yields the same values."""
+        document = {"status": "OK", "data": {"surahs": [
+            {"number": 1, "name": "الفاتحة", "ayahs": [{"number": 1, "text": "بِسْمِ \"ٱللَّهِ\""}]},
+            {"number": 2, "ayahs": []}
+        ], "edition": {"identifier": "quran-uthmani", "size": -12.5e3}}, "flags": [True, None, {}]}
+        body = json.dumps(document, ensure_ascii=False).encode("utf-8")
+        materialize = ("data.surahs.item.ayahs.item", "data.edition")
+        
+        expected = [
+            ("status", "OK"),
+            ("data.surahs.item.number", 1),
+            ("data.surahs.item.name", "الفاتحة"),
+            ("data.surahs.item.ayahs.item", {"number": 1, "text": "بِسْمِ \"ٱللَّهِ\""}),
+            ("data.surahs.item.number", 2),
+            ("data.edition", {"identifier": "quran-uthmani", "size": -12500.0}),
+            ("flags.item", True),
+            ("flags.item", None)
+        ]
+        for size in (1, 3, 64, len(body)):
+            chunks = [body[i:i + size] for i in range(0, len(body), size)]
+            self.assertEqual(list(iter_json(chunks, materialize)), expected)
+    
+    def test_invalid_documents_rejected(self):
+        """Test that truncated or malformed documents raise ValueError."""
+        for body in (b'{"data": [1, 2', b'{"data" 1}', b'[1,]', b'{} {}', b""):
+            with self.assertRaises(ValueError):
+                list(iter_json([body]))
+
+
+class TestHTTPTransport(unittest.TestCase):
+    """Test cases for the pooled HTTP transport."""
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_requests_use_timeouts_and_record_stats(self, mock_get):
+        """Test that requests carry timeouts and are counted."""
+        mock_response = MagicMock()
+        mock_response.headers = {"Content-Length": "120"}
+        mock_get.return_value = mock_response
+        transport = HTTPTransport(connect_timeout=2.0, read_timeout=7.0)
+        
+        transport.get("http://example.invalid/v1/edition")
+        transport.get("http://example.invalid/v1/edition")
+        
+        self.assertEqual(mock_get.call_args[1]["timeout"], (2.0, 7.0))
+        stats = transport.stats()
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["errors"], 0)
+        self.assertEqual(stats["bytes_received"], 240)
+        self.assertIn("gzip", transport.session.headers["Accept-Encoding"])
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_failed_request_is_counted(self, mock_get):
+        """Test that transport errors are counted and re-raised."""
+        mock_get.side_effect = requests.ConnectionError("unreachable")
+        transport = HTTPTransport()
+        
+        with self.assertRaises(requests.ConnectionError):
+            transport.get("http://example.invalid/v1/edition")
+        self.assertEqual(transport.stats()["errors"], 1)
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_stale_catalog_is_revalidated(self, mock_get):
+        """Test that a stale editions catalog is refreshed with a conditional request."""
+        full = MagicMock()
+        full.status_code = 200
+        full.headers = {"ETag": '"v1"', "Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT",
+                        "Content-Length": "40000"}
+        full.json.return_value = {"code": 200, "status": "OK", "data": [{"identifier": "en.asad"}]}
+        not_modified = MagicMock()
+        not_modified.status_code = 304
+        not_modified.headers = {"ETag": '"v1"', "Content-Length": "0"}
+        mock_get.side_effect = [full, not_modified]
+        api_service = APIService(rate_limiter=TokenBucketRateLimiter(rate=1000.0, burst=10))
+        
+        self.assertEqual(api_service.get_available_editions(), [{"identifier": "en.asad"}])
+        self.assertEqual(api_service.get_available_editions(), [{"identifier": "en.asad"}])
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertIsNone(mock_get.call_args[1]["headers"])
+        
+        # Age the cached copy past its TTL
+        record = api_service.cache.get("editions")
+        api_service.cache.put("editions", dict(record, fetched_at=record["fetched_at"] - APIService.EDITIONS_TTL))
+        
+        # The stale copy is served while it is revalidated in the background
+        self.assertEqual(api_service.get_available_editions(), [{"identifier": "en.asad"}])
+        api_service.wait_for_refreshes(timeout=5)
+        self.assertEqual(mock_get.call_args[1]["headers"], {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 05 Oct 2026 10:00:00 GMT"
+        })
+        self.assertEqual(api_service.get_revalidation_stats(), {
+            "revalidations": 1, "not_modified": 1, "bytes_saved": 40000
+        })
+        self.assertIsNotNone(api_service.find_available_editions())
+
+
+class TestVerseCache(unittest.TestCase):
+    """Test cases for the bounded verse cache."""
+    
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = VerseCache(max_entries=2)
+        cache.put("a", {"text": "a"})
+        cache.put("b", {"text": "b"})
+        cache.get("a")
+        cache.put("c", {"text": "c"})
+        
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.stats()["evictions"], 1)
+    
+    def test_byte_budget(self):
+        """Test that the estimated byte budget is never exceeded."""
+        value = {"text": "x" * 1000}
+        cache = VerseCache(max_entries=100, max_bytes=estimate_size(value) * 3)
+        for i in range(10):
+            cache.put(i, dict(value))
+        
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 3)
+        self.assertLessEqual(stats["bytes"], stats["max_bytes"])
+    
+    def test_hit_and_miss_counters(self):
+        """Test the hit/miss statistics."""
+        cache = VerseCache()
+        cache.put("editions", [])
+        cache.get("editions")
+        cache.get("missing")
+        
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+
+class TestPersistentCache(unittest.TestCase):
+    """Test cases for the on-disk cache tier."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "cache.db")
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        self.temp_dir.cleanup()
+    
+    def test_entries_survive_restart(self):
+        """Test that a new cache instance serves entries written by an old one."""
+        cache = VerseCache(backing=PersistentCache(self.db_path))
+        cache.put("262_quran-uthmani,en.asad", [{"number": 262}])
+        cache.backing.close()
+        
+        restarted = VerseCache(backing=PersistentCache(self.db_path))
+        self.assertEqual(restarted.get("262_quran-uthmani,en.asad"), [{"number": 262}])
+        self.assertEqual(len(restarted), 1)
+        restarted.backing.close()
+    
+    def test_expired_entries_are_ignored_and_compacted(self):
+        """Test TTL invalidation and compaction."""
+        cache = PersistentCache(self.db_path)
+        cache.put("editions", [], ttl=-1)
+        cache.put("1_quran-uthmani", [{"number": 1}])
+        
+        self.assertIsNone(cache.get("editions"))
+        self.assertEqual(cache.compact(), 1)
+        self.assertEqual(cache.stats()["entries"], 1)
+        cache.close()
+    
+    def test_version_change_discards_entries(self):
+        """Test that a data format version change invalidates the cache."""
+        cache = PersistentCache(self.db_path, version=1)
+        cache.put("editions", [])
+        cache.close()
+        
+        cache = PersistentCache(self.db_path, version=2)
+        self.assertIsNone(cache.get("editions"))
+        cache.close()
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for the token bucket rate limiter."""
+    
+    def test_burst_then_rate(self):
+        """Test that a burst passes immediately and later requests wait."""
+        limiter = TokenBucketRateLimiter(rate=20.0, burst=3)
+        waits = [limiter.acquire() for _ in range(4)]
+        
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 0.05, delta=0.02)
+        self.assertEqual(limiter.stats()["delayed"], 1)
+    
+    def test_concurrent_callers_are_spaced(self):
+        """Test that threads sharing the limiter do not exceed the rate."""
+        limiter = TokenBucketRateLimiter(rate=50.0, burst=1)
+        start = time.monotonic()
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertGreaterEqual(time.monotonic() - start, 5 / 50.0 - 0.01)
+        self.assertEqual(limiter.stats()["acquired"], 6)
+    
+    def test_throttling_backs_off(self):
+        """Test that a 429 halves the rate and honors Retry-After."""
+        limiter = TokenBucketRateLimiter(rate=10.0, burst=5)
+        limiter.record_throttled(retry_after=0.1)
+        
+        self.assertEqual(limiter.rate, 5.0)
+        self.assertGreater(limiter.acquire(), 0.05)
+        limiter.record_success()
+        self.assertGreater(limiter.rate, 5.0)
+    
+    def test_parse_retry_after(self):
+        """Test parsing of Retry-After header values."""
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_rate_limit_wait_respects_deadline(self, mock_get):
+        """Test that a request gives up instead of waiting past its deadline."""
+        limiter = TokenBucketRateLimiter(rate=100.0, burst=2)
+        limiter.record_throttled(retry_after=3.0)
+        api_service = APIService(rate_limiter=limiter)
+        
+        start = time.monotonic()
+        response = api_service._get_response("/ayah/1/editions/en.asad", "verse", deadline=Deadline(0.2))
+        
+        self.assertIsNone(response)
+        self.assertLess(time.monotonic() - start, 0.5)
+        mock_get.assert_not_called()
+        self.assertEqual(api_service.get_latency_stats()["deadlines_exceeded"], 1)
+        self.assertIsNone(limiter.acquire(max_wait=0.1))
+        self.assertEqual(limiter.stats()["acquired"], 0)
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_api_service_honors_429(self, mock_get):
+        """Test that APIService reports 429 responses to the limiter."""
+        mock_response = MagicMock()
+        mock_response.status_code = 429
+        mock_response.headers = {"Retry-After": "0.01"}
+        mock_get.return_value = mock_response
+        limiter = TokenBucketRateLimiter(rate=100.0, burst=2)
+        api_service = APIService(rate_limiter=limiter)
+        
+        self.assertIsNone(api_service.get_specific_verse("1:1"))
+        self.assertEqual(limiter.stats()["throttled"], 1)
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_server_errors_do_not_restore_the_rate(self, mock_get):
+        """Test that only answered requests let the adaptive back-off recover."""
+        unavailable = MagicMock()
+        unavailable.status_code = 503
+        ok = MagicMock()
+        ok.status_code = 200
+        mock_get.side_effect = [unavailable, unavailable, ok]
+        limiter = TokenBucketRateLimiter(rate=100.0, burst=10)
+        limiter.record_throttled(retry_after=0.0)
+        api_service = APIService(rate_limiter=limiter,
+                                 retry_policy=RetryPolicy(max_attempts=3, base_delay=0.001))
+        
+        self.assertIs(api_service._get_response("/edition", "editions"), ok)
+        self.assertAlmostEqual(limiter.stats()["rate"], 60.0)
+
+
+class TestResilience(unittest.TestCase):
+    """Test cases for retries, circuit breaking and stale fallbacks."""
+    
+    def _api_service(self, **kwargs):
+        return APIService(
+            rate_limiter=TokenBucketRateLimiter(rate=1000.0, burst=10),
+            retry_policy=RetryPolicy(max_attempts=3, base_delay=0.001),
+            **kwargs
+        )
+    
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that retry delays stay below the exponential ceiling."""
+        policy = RetryPolicy(base_delay=0.5, max_delay=2.0)
+        
+        for retry, ceiling in ((1, 0.5), (2, 1.0), (3, 2.0), (6, 2.0)):
+            delays = [policy.delay(retry) for _ in range(50)]
+            self.assertTrue(all(0.0 <= delay <= ceiling for delay in delays))
+            self.assertGreater(len(set(delays)), 1)
+    
+    def test_breaker_opens_and_recovers(self):
+        """Test the closed, open and half-open breaker states."""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, clock=lambda: now[0])
+        
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+        
+        # After the timeout a single trial request is let through
+        now[0] = 10.0
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        
+        now[0] = 20.0
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.stats(), {"state": "closed", "failures": 0, "trips": 2, "rejected": 3})
+    
+    def test_only_the_trial_releases_the_probe(self):
+        """Test that a request admitted before the breaker opened cannot free the trial slot."""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0, clock=lambda: now[0])
+        
+        earlier = breaker.allow()
+        breaker.record_failure()
+        now[0] = 10.0
+        trial = breaker.allow()
+        self.assertTrue(trial)
+        
+        # The earlier request ends without a verdict (429, deadline) while the trial is out
+        breaker.release(earlier)
+        self.assertFalse(breaker.allow())
+        
+        breaker.release(trial)
+        self.assertTrue(breaker.allow())
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_server_errors_are_retried(self, mock_get):
+        """Test that connection errors and 5xx responses are retried."""
+        unavailable = MagicMock()
+        unavailable.status_code = 503
+        ok = MagicMock()
+        ok.status_code = 200
+        ok.json.return_value = {"code": 200, "status": "OK", "data": [{"identifier": "en.asad"}]}
+        mock_get.side_effect = [requests.ConnectionError("reset"), unavailable, ok]
+        api_service = self._api_service()
+        
+        self.assertEqual(api_service.get_available_editions(), [{"identifier": "en.asad"}])
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(api_service.get_resilience_stats()["retries"], 2)
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_open_breaker_skips_the_network(self, mock_get):
+        """Test that a failing endpoint stops receiving requests."""
+        mock_get.side_effect = requests.ConnectionError("unreachable")
+        api_service = self._api_service(
+            breaker_factory=lambda: CircuitBreaker(failure_threshold=3, reset_timeout=60.0)
+        )
+        
+        self.assertIsNone(api_service.get_specific_verse("1:1"))
+        self.assertIsNone(api_service.get_specific_verse("1:2"))
+        
+        self.assertEqual(mock_get.call_count, 3)
+        breaker = api_service.get_resilience_stats()["breakers"]["ayah"]
+        self.assertEqual(breaker["state"], "open")
+        self.assertEqual(breaker["rejected"], 1)
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_half_open_trial_is_always_settled(self, mock_get):
+        """Test that a throttled or timed-out trial does not block the endpoint."""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0, clock=lambda: now[0])
+        api_service = self._api_service(breaker_factory=lambda: breaker)
+        api_service.retry_policy = RetryPolicy(max_attempts=1)
+        throttled = MagicMock()
+        throttled.status_code = 429
+        throttled.headers = {}
+        ok = MagicMock()
+        ok.status_code = 200
+        mock_get.side_effect = [requests.ConnectionError("down"), throttled, ok]
+        path = "/ayah/1/editions/en.asad"
+        
+        self.assertIsNone(api_service._get_response(path, "verse"))
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        
+        now[0] = 10.0
+        self.assertIsNone(api_service._get_response(path, "verse", deadline=Deadline(0.0)))
+        self.assertIsNone(api_service._get_response(path, "verse"))
+        self.assertIs(api_service._get_response(path, "verse"), ok)
+        
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(mock_get.call_count, 3)
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_deadline_expiry_is_not_an_endpoint_failure(self, mock_get):
+        """Test that running out of the caller's budget does not open the breaker."""
+        breaker = CircuitBreaker(failure_threshold=1)
+        api_service = self._api_service(breaker_factory=lambda: breaker)
+        ok = MagicMock()
+        ok.status_code = 200
+        
+        def slow(*args, **kwargs):
+            time.sleep(0.1)
+            return ok
+        mock_get.side_effect = slow
+        
+        self.assertIsNone(api_service._get_response("/ayah/1/editions/en.asad", "verse",
+                                                    deadline=Deadline(0.02)))
+        
+        # A request timeout cut short by the deadline
+        now = [0.0]
+        
+        def timed_out(*args, **kwargs):
+            now[0] = 1.0
+            raise requests.Timeout("read timed out")
+        api_service._hedged_get = lambda path, url, headers, deadline: timed_out()
+        self.assertIsNone(api_service._get_response("/ayah/1/editions/en.asad", "verse",
+                                                    deadline=Deadline(1.0, clock=lambda: now[0])))
+        
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(api_service.get_latency_stats()["deadlines_exceeded"], 2)
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_expired_verses_are_served_offline(self, mock_get):
+        """Test that expired cache entries are used when the API is unreachable."""
+        mock_get.side_effect = requests.ConnectionError("unreachable")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            backing = PersistentCache(os.path.join(temp_dir, "cache.db"))
+            for identifier in ("quran-uthmani", "en.asad"):
+                backing.put((1, identifier), {"number": 1, "edition": {"identifier": identifier}}, ttl=-1)
+            api_service = self._api_service(cache=VerseCache(backing=backing))
+            
+            verse = api_service.get_specific_verse("1:1")
+            backing.close()
+        
+        self.assertEqual([entry["edition"]["identifier"] for entry in verse], ["quran-uthmani", "en.asad"])
+        self.assertEqual(api_service.get_resilience_stats()["stale_served"], 1)
+
+
+class TestTailLatency(unittest.TestCase):
+    """Test cases for deadlines and hedged requests."""
+    
+    def _response(self, delay, data):
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {"code": 200, "status": "OK", "data": data}
+        return lambda: time.sleep(delay) or response
+    
+    def _api_service(self):
+        api_service = APIService(rate_limiter=TokenBucketRateLimiter(rate=1000.0, burst=10),
+                                 retry_policy=RetryPolicy(max_attempts=1))
+        # A known latency history: p95 of 20 ms
+        tracker = api_service._latency_tracker("/ayah")
+        for _ in range(40):
+            tracker.record(0.02)
+        return api_service
+    
+    def test_latency_percentiles(self):
+        """Test the tracker's percentiles and its warm-up period."""
+        tracker = LatencyTracker(window=100, min_samples=10)
+        for ms in range(1, 10):
+            tracker.record(ms / 1000)
+        self.assertIsNone(tracker.hedge_delay())
+        
+        for ms in range(10, 201):
+            tracker.record(ms / 1000)
+        stats = tracker.stats()
+        self.assertEqual((stats["recorded"], stats["window"]), (200, 100))
+        self.assertAlmostEqual(tracker.hedge_delay(), 0.196)
+        self.assertAlmostEqual(stats["p50"], 0.151)
+    
+    def test_deadline_limits_timeouts(self):
+        """Test that request timeouts are cut to the remaining budget."""
+        now = [0.0]
+        deadline = Deadline(2.0, clock=lambda: now[0])
+        now[0] = 0.5
+        
+        self.assertEqual(deadline.timeout((5.0, 15.0)), (1.5, 1.5))
+        self.assertEqual(deadline.timeout(1.0), 1.0)
+        now[0] = 3.0
+        self.assertTrue(deadline.expired())
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_slow_request_is_hedged(self, mock_get):
+        """Test that a request slower than p95 is duplicated and the faster copy wins."""
+        slow = self._response(1.0, [{"number": 1, "edition": {"identifier": "quran-uthmani"}}])
+        fast = self._response(0.0, [{"number": 1, "edition": {"identifier": "quran-uthmani"}}])
+        calls = [slow, fast]
+        mock_get.side_effect = lambda *args, **kwargs: calls.pop(0)()
+        api_service = self._api_service()
+        
+        start = time.perf_counter()
+        verse = api_service.get_specific_verse("1:1", "quran-uthmani")
+        
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(verse[0]["number"], 1)
+        stats = api_service.get_latency_stats()
+        self.assertEqual((stats["hedges"], stats["hedge_wins"]), (1, 1))
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_deadline_is_propagated(self, mock_get):
+        """Test that VerseManager budgets bound the whole fetch."""
+        mock_get.side_effect = lambda *args, **kwargs: self._response(1.0, [])()
+        api_service = self._api_service()
+        api_service.hedge_requests = False
+        verse_manager = VerseManager(api_service, request_budget=0.1)
+        
+        start = time.perf_counter()
+        self.assertIsNone(verse_manager.fetch_specific_verse("1:1"))
+        
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertLessEqual(mock_get.call_args[1]["timeout"][1], 0.1)
+        self.assertEqual(api_service.get_latency_stats()["deadlines_exceeded"], 1)
+
+
+class FakeProvider(VerseProvider):
+    """Provider answering verse requests after a fixed delay."""
+    
+    KINDS = ("verse",)
+    
+    def __init__(self, name, delay=0.0, fails=False):
+        self.name = name
+        self.delay = delay
+        self.fails = fails
+        self.calls = 0
+    
+    def get_verse(self, number, identifiers, deadline=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fails:
+            return None
+        return [{"number": number, "text": self.name, "edition": {"identifier": identifier}}
+                for identifier in identifiers]
+
+
+class TestProviders(unittest.TestCase):
+    """Test cases for verse providers and latency-based routing."""
+    
+    def test_router_prefers_fast_reliable_providers(self):
+        """Test that the router ranks providers by latency and errors."""
+        slow, fast, broken = FakeProvider("slow", 0.02), FakeProvider("fast"), FakeProvider("broken", fails=True)
+        router = ProviderRouter([slow, broken, fast], explore=0.0)
+        
+        for number in range(1, 11):
+            self.assertIsNotNone(router.fetch("verse", number, ["en.asad"]))
+        
+        self.assertEqual(router.candidates("verse", ["en.asad"]), [fast, slow, broken])
+        self.assertEqual(broken.calls, 1)
+        self.assertEqual(slow.calls, 1)
+        self.assertEqual(router.stats()["providers"]["broken"]["verse"]["failures"], 1)
+        self.assertEqual(router.candidates("surah", ["en.asad"]), [])
+    
+    def test_router_fails_over(self):
+        """Test that a failed provider is skipped for the next one."""
+        broken, backup = FakeProvider("broken", fails=True), FakeProvider("backup")
+        router = ProviderRouter([broken, backup], explore=0.0)
+        
+        verse = router.fetch("verse", 262, ["quran-uthmani"])
+        
+        self.assertEqual(verse[0]["text"], "backup")
+        self.assertEqual(router.stats()["failovers"], 1)
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_quran_com_is_normalized(self, mock_get):
+        """Test that Quran.com verses are converted to AlQuran.cloud entries under their own Arabic edition."""
+        chapters = {"chapters": [{"id": number, "name_simple": f"Surah {number}", "name_arabic": "سورة",
+                                  "verses_count": length, "revelation_place": "madinah",
+                                  "translated_name": {"name": "Chapter"}}
+                                 for number, length in enumerate(SURAH_LENGTHS, start=1)]}
+        verse = {"verse": {"id": 262, "verse_number": 255, "verse_key": "2:255", "juz_number": 3,
+                           "page_number": 42, "text_uthmani": "ٱللَّهُ لَآ إِلَٰهَ إِلَّا هُوَ",
+                           "translations": [{"resource_id": 20, "text": "Allah<sup foot_note=1>1</sup> - there is no deity"}]}}
+        
+        def respond(url, **kwargs):
+            if not url.startswith(QuranComProvider.BASE_URL):
+                raise requests.ConnectionError("unreachable")
+            response = MagicMock()
+            response.status_code = 200
+            response.json.return_value = chapters if url.endswith("/chapters") else verse
+            return response
+        mock_get.side_effect = respond
+        provider = QuranComProvider(rate_limiter=TokenBucketRateLimiter(rate=1000.0, burst=10))
+        
+        self.assertTrue(provider.supports("verse", ["quran-uthmani", "en.sahih"]))
+        self.assertFalse(provider.supports("verse", ["quran-uthmani", "en.asad"]))
+        entries = provider.get_verse(262, ["quran-uthmani", "en.sahih"])
+        
+        self.assertIn("/verses/by_key/2:255?fields=text_uthmani&translations=20",
+                      mock_get.call_args_list[0][0][0])
+        self.assertEqual(entries[0]["edition"]["identifier"], "qurancom-uthmani")
+        formatted = Verse.from_api(entries)
+        self.assertEqual(formatted.reference, "2:255")
+        self.assertEqual(formatted.arabic, "ٱللَّهُ لَآ إِلَٰهَ إِلَّا هُوَ")
+        self.assertEqual(formatted["surah"]["englishName"], "Surah 2")
+        self.assertEqual(formatted.translation, "Allah - there is no deity")
+        
+        # Served in place of quran-uthmani, but never cached as it
+        api_service = APIService(rate_limiter=TokenBucketRateLimiter(rate=1000.0, burst=10),
+                                 retry_policy=RetryPolicy(max_attempts=1), providers=[provider])
+        api_service.router.explore = 0.0
+        verse_data = api_service.get_specific_verse("2:255", "quran-uthmani,en.sahih")
+        
+        self.assertEqual(verse_data[0]["edition"]["identifier"], "qurancom-uthmani")
+        self.assertIsNone(api_service.cache.get((262, "quran-uthmani")))
+        self.assertEqual(api_service.cache.get((262, "qurancom-uthmani"))["text"], formatted.arabic)
+        self.assertEqual(api_service.cache.get((262, "en.sahih"))["text"], formatted.translation)
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_api_service_fails_over_to_another_provider(self, mock_get):
+        """Test that verses come from another provider when AlQuran.cloud is down."""
+        mock_get.side_effect = requests.ConnectionError("unreachable")
+        backup = FakeProvider("backup")
+        api_service = APIService(rate_limiter=TokenBucketRateLimiter(rate=1000.0, burst=10),
+                                 retry_policy=RetryPolicy(max_attempts=1), providers=[backup])
+        api_service.router.explore = 0.0
+        
+        verse = api_service.get_specific_verse("2:255", "quran-uthmani,en.asad")
+        
+        self.assertEqual([entry["text"] for entry in verse], ["backup", "backup"])
+        self.assertEqual(api_service.cache.get((262, "en.asad"))["text"], "backup")
+        self.assertEqual(api_service.get_provider_stats()["providers"]["alquran.cloud"]["verse"]["failures"], 1)
+
+
+class TestAsyncAPIService(unittest.TestCase):
+    """Test cases for the asyncio API client."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.api_service = APIService(rate_limiter=TokenBucketRateLimiter(rate=1000.0, burst=10))
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        
+        def fetch_verse(reference, editions, description="specific verse"):
+            with self.lock:
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+            time.sleep(0.02)
+            with self.lock:
+                self.in_flight -= 1
+            return [{"number": int(reference)}]
+        
+        self.api_service.fetch_verse = fetch_verse
+    
+    def test_concurrency_is_capped(self):
+        """Test that bulk fetches overlap but never exceed the cap."""
+        async_api = AsyncAPIService(self.api_service, max_concurrency=3)
+        
+        results = asyncio.run(async_api.get_verses(range(1, 10)))
+        async_api.close()
+        
+        self.assertEqual([result[0]["number"] for result in results], list(range(1, 10)))
+        self.assertEqual(self.peak, 3)
+    
+    def test_client_works_across_event_loops(self):
+        """Test that one client can be used by successive asyncio.run calls."""
+        async_api = AsyncAPIService(self.api_service, max_concurrency=2)
+        
+        first = asyncio.run(async_api.get_verses(range(1, 6)))
+        second = asyncio.run(async_api.get_verses(range(6, 11)))
+        async_api.close()
+        
+        self.assertEqual([result[0]["number"] for result in first + second], list(range(1, 11)))
+        self.assertEqual(self.peak, 2)
+    
+    def test_cached_verses_skip_the_network(self):
+        """Test that cached verses are answered without a request."""
+        self.api_service.cache.put((7, "quran-uthmani"), {"number": 7})
+        self.api_service.cache.put((7, "en.asad"), {"number": 7})
+        self.api_service.fetch_verse = MagicMock()
+        async_api = AsyncAPIService(self.api_service)
+        
+        verse = asyncio.run(async_api.get_specific_verse(7))
+        async_api.close()
+        
+        self.assertEqual(verse, [{"number": 7}, {"number": 7}])
+        self.api_service.fetch_verse.assert_not_called()
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for request coalescing."""
+    
+    def _run_concurrently(self, func, count=5):
+        """Call a function from several threads at once."""
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(func())) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+    
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that duplicate calls wait for the first one."""
+        group = SingleFlight()
+        calls = []
+        
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return "editions"
+        
+        results = self._run_concurrently(lambda: group.do("editions", slow))
+        
+        self.assertEqual(results, ["editions"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(group.stats()["suppressed"], 4)
+    
+    def test_errors_are_shared(self):
+        """Test that waiters receive the leader's exception."""
+        group = SingleFlight()
+        started = threading.Event()
+        
+        def failing():
+            started.set()
+            time.sleep(0.05)
+            raise ValueError("boom")
+        
+        errors = []
+        
+        def call():
+            try:
+                group.do("key", failing)
+            except ValueError as e:
+                errors.append(e)
+        
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait()
+        call()
+        leader.join()
+        
+        self.assertEqual(len(errors), 2)
+        self.assertIs(errors[0], errors[1])
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_api_service_coalesces_editions(self, mock_get):
+        """Test that concurrent editions loads issue one HTTP request."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"code": 200, "status": "OK", "data": [{"identifier": "en.asad"}]}
+        mock_get.side_effect = lambda *args, **kwargs: time.sleep(0.1) or mock_response
+        api_service = APIService(rate_limiter=TokenBucketRateLimiter(rate=1000.0, burst=10))
+        
+        results = self._run_concurrently(api_service.get_available_editions, count=3)
+        
+        self.assertEqual(results, [[{"identifier": "en.asad"}]] * 3)
+        mock_get.assert_called_once()
+        self.assertEqual(api_service.single_flight.stats()["suppressed"], 2)
+
+
 class TestVerseManager(unittest.TestCase):
     """Test cases for the Verse Manager."""
     
@@ -210,6 +1146,739 @@ class TestVerseManager(unittest.TestCase):
         self.assertIn("1:1", formatted_text)
 
 
+class TestQuranMetadata(unittest.TestCase):
+    """Test cases for the division index."""
+    
+    def test_builtin_divisions(self):
+        """Test juz and surah lookups without loaded metadata."""
+        metadata = QuranMetadata()
+        
+        self.assertEqual(metadata.division_of("juz", "2:141"), 1)
+        self.assertEqual(metadata.division_of("juz", "2:142"), 2)
+        self.assertEqual(metadata.division_of("juz", 6236), 30)
+        self.assertEqual(metadata.division_of("manzil", "114:1"), 7)
+        self.assertEqual(metadata.locate("2:255")["surah"], 2)
+        self.assertEqual(metadata.verse_range("juz", 30), range(parse_reference("78:1"), 6237))
+        self.assertEqual(metadata.verse_range("surah", 1), range(1, 8))
+        self.assertIsNone(metadata.division_of("page", 1))
+        self.assertEqual(metadata.verse_range("juz", 31), range(0))
+    
+    def test_from_meta(self):
+        """Test building pages and hizbs from the /meta response."""
+        meta = {
+            "pages": {"references": [{"surah": 1, "ayah": 1}, {"surah": 2, "ayah": 1},
+                                     {"surah": 2, "ayah": 6}]},
+            "hizbQuarters": {"references": [{"surah": 1, "ayah": 1}, {"surah": 2, "ayah": 26},
+                                            {"surah": 2, "ayah": 44}, {"surah": 2, "ayah": 60},
+                                            {"surah": 2, "ayah": 75}]},
+            "rukus": {"references": [{"surah": 2, "ayah": 1}]}
+        }
+        metadata = QuranMetadata.from_meta(meta)
+        
+        self.assertEqual(metadata.division_of("page", "2:5"), 2)
+        self.assertEqual(metadata.verse_range("page", 2), range(8, 13))
+        self.assertEqual(metadata.count("hizb"), 2)
+        self.assertEqual(metadata.division_of("hizb", "2:75"), 2)
+        self.assertFalse(metadata.has_division("ruku"))
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_metadata_is_fetched_once(self, mock_get):
+        """Test that /meta is requested once and scoped random verses stay in scope."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"code": 200, "status": "OK", "data": {
+            "juzs": {"references": [{"surah": surah, "ayah": ayah} for surah, ayah in
+                                    ((1, 1), (2, 142))]}
+        }}
+        mock_get.return_value = mock_response
+        api_service = APIService(rate_limiter=TokenBucketRateLimiter(rate=1000.0, burst=10))
+        api_service.get_specific_verse = MagicMock(return_value=None)
+        verse_manager = VerseManager(api_service)
+        
+        for _ in range(20):
+            verse_manager.fetch_random_verse(scope=("juz", 1))
+            self.assertLess(api_service.get_specific_verse.call_args[0][0], 149)
+        self.assertEqual(verse_manager.get_verse_location("2:142")["juz"], 2)
+        
+        mock_get.assert_called_once()
+        self.assertTrue(mock_get.call_args[0][0].endswith("/meta"))
+
+
+class TestVerseSampler(unittest.TestCase):
+    """Test cases for the shuffle-bag verse sampler."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.temp_dir.name, "sampler.json")
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        self.temp_dir.cleanup()
+    
+    def test_no_repeats_within_a_cycle(self):
+        """Test that every verse is drawn once before any repeats."""
+        sampler = VerseSampler()
+        drawn = [sampler.next() for _ in range(TOTAL_VERSES)]
+        
+        self.assertEqual(sorted(drawn), list(range(1, TOTAL_VERSES + 1)))
+        self.assertEqual(sampler.remaining(), 0)
+        self.assertIn(sampler.next(), range(1, TOTAL_VERSES + 1))
+        self.assertEqual(sampler.stats()["cycles"], 1)
+    
+    def test_seed_is_reproducible(self):
+        """Test that the same seed gives the same order."""
+        first = VerseSampler(seed=7)
+        second = VerseSampler(seed=7)
+        
+        self.assertEqual([first.next() for _ in range(50)], [second.next() for _ in range(50)])
+    
+    def test_resume_mid_cycle(self):
+        """Test that verses drawn before a restart are not repeated after it."""
+        verses = list(range(100, 130))
+        sampler = VerseSampler(verses, state_path=self.state_path)
+        before = [sampler.next() for _ in range(10)]
+        sampler.close()
+        
+        restarted = VerseSampler(verses, state_path=self.state_path)
+        after = [restarted.next() for _ in range(20)]
+        
+        self.assertEqual(sorted(before + after), verses)
+        
+        other_scope = VerseSampler(range(1, 10), state_path=self.state_path)
+        self.assertEqual(other_scope.remaining(), 9)
+    
+    def test_concurrent_draws_save_latest_position(self):
+        """Test that concurrent draws save cleanly and the saved position is current."""
+        sampler = VerseSampler(state_path=self.state_path, save_interval=5)
+        drawn = []
+        
+        def draw():
+            numbers = [sampler.next() for _ in range(200)]
+            with lock:
+                drawn.extend(numbers)
+        
+        lock = threading.Lock()
+        with patch('builtins.print') as mock_print:
+            threads = [threading.Thread(target=draw) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertTrue(sampler.close())
+        
+        mock_print.assert_not_called()
+        self.assertEqual(len(set(drawn)), 600)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["sampler.json"])
+        
+        restarted = VerseSampler(state_path=self.state_path)
+        self.assertEqual(restarted.remaining(), sampler.remaining())
+        self.assertEqual(restarted.next(), sampler.next())
+    
+    def test_scoped_sampler_resumes_after_restart(self):
+        """Test that a scoped sampler keeps the seed and its position across restarts."""
+        def draw(count):
+            api_service = APIService(sampler=VerseSampler(seed=3, state_path=self.state_path))
+            api_service.get_specific_verse = MagicMock(return_value=None)
+            verse_manager = VerseManager(api_service)
+            for _ in range(count):
+                verse_manager.fetch_random_verse(scope=("surahs", [1]))
+            verse_manager.close()
+            return [call[0][0] for call in api_service.get_specific_verse.call_args_list]
+        
+        before = draw(3)
+        after = draw(4)
+        
+        self.assertEqual(sorted(before + after), list(range(1, 8)))
+        self.assertEqual([name[:8] for name in os.listdir(self.temp_dir.name)], ["sampler-"])
+        self.assertEqual(VerseSampler(range(1, 8), seed=3).next(), before[0])
+    
+    def test_scopes(self):
+        """Test resolving sampling scopes."""
+        self.assertEqual(scope_verses(("surahs", [1, 114])), list(range(1, 8)) + list(range(6231, 6237)))
+        self.assertEqual(scope_verses(("juz", 30), QuranMetadata())[0], parse_reference("78:1"))
+        self.assertIsNone(scope_verses(("length", 1, 50)))
+        self.assertEqual(len(scope_verses("all")), TOTAL_VERSES)
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test cases for full-text search."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.index = SearchIndex()
+        self.index.add_texts("en.asad", [
+            (1, "In the name of God, the Most Gracious, the Dispenser of Grace"),
+            (2, "All praise is due to God alone, the Sustainer of all the worlds"),
+            (262, "God - there is no deity save Him, the Ever-Living"),
+            (2869, "God is the Light of the heavens and the earth. Light upon light!"),
+            (6236, "from all temptation to evil by invisible forces and men")
+        ])
+    
+    def test_ranking(self):
+        """Test that rarer and more frequent terms rank higher."""
+        results = self.index.search("light god")
+        
+        self.assertEqual(results[0][0], 2869)
+        self.assertEqual({verse for verse, _ in results}, {1, 2, 262, 2869})
+        self.assertEqual(self.index.search("GRACE")[0][0], 1)
+        self.assertEqual(self.index.search("unknown"), [])
+    
+    def test_phrase_query(self):
+        """Test that quoted phrases must match consecutively."""
+        self.assertEqual([verse for verse, _ in self.index.search('"light upon light"')], [2869])
+        self.assertEqual(self.index.search('"light god"'), [])
+        self.assertEqual([verse for verse, _ in self.index.search('all "the worlds"')], [2])
+    
+    def test_filters(self):
+        """Test surah and juz filters."""
+        self.assertEqual({verse for verse, _ in self.index.search("god", surahs=[1])}, {1, 2})
+        self.assertEqual([verse for verse, _ in self.index.search("all", juz=[30])], [6236])
+    
+    def test_incremental_editions(self):
+        """Test that editions are added without duplicates and searched together."""
+        self.assertFalse(self.index.add(1, "en.asad", "again"))
+        self.index.add_verse_data([{"number": 1, "text": "بِسْمِ ٱللَّهِ", "edition": {"identifier": "quran-uthmani"}}])
+        
+        self.assertEqual(self.index.search("بسم")[0][0], 1)
+        self.assertEqual(self.index.search("بسم", editions=["en.asad"]), [])
+        self.assertEqual(self.index.stats()["editions"], {"en.asad": 5, "quran-uthmani": 1})
+        self.assertEqual(tokenize("Éden, ٱللَّهِ!"), ["eden", "الله"])
+    
+    def test_verse_manager_indexes_installed_editions(self):
+        """Test that VerseManager searches installed editions."""
+        with tempfile.TemporaryDirectory() as directory:
+            store = CorpusStore(os.path.join(directory, "corpus.db"))
+            store.add_edition(*make_edition_surahs("en.asad"))
+            verse_manager = VerseManager(APIService(corpus_store=store))
+            
+            self.assertEqual(verse_manager.search('"2:255"'), [262])
+            self.assertTrue(verse_manager.search_index.has_edition("en.asad"))
+            store.close()
+
+
+class TestArabicSearch(unittest.TestCase):
+    """Test cases for diacritic-insensitive Arabic search."""
+    
+    TEXTS = [
+        (1, "بِسْمِ ٱللَّهِ ٱلرَّحْمَٰنِ ٱلرَّحِيمِ"),
+        (2, "ٱلْحَمْدُ لِلَّهِ رَبِّ ٱلْعَٰلَمِينَ"),
+        (5, "إِيَّاكَ نَعْبُدُ وَإِيَّاكَ نَسْتَعِينُ"),
+        (8, "ذَٰلِكَ ٱلْكِتَٰبُ لَا رَيْبَ ۛ فِيهِ ۛ هُدًى لِّلْمُتَّقِينَ"),
+        (10, "ٱلَّذِينَ يُؤْمِنُونَ بِٱلْغَيْبِ وَيُقِيمُونَ ٱلصَّلَوٰةَ")
+    ]
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.index = NGramIndex()
+        self.index.add_texts(self.TEXTS)
+    
+    def test_normalize(self):
+        """Test that tashkeel, Uthmani marks and letter variants are normalized."""
+        self.assertEqual(normalize_arabic("بِسْمِ ٱللَّهِ ٱلرَّحْمَٰنِ"), "بسم الله الرحمن")
+        self.assertEqual(normalize_arabic("لَا رَيْبَ ۛ فِيهِ"), "ل ريب فيه")
+        self.assertEqual(normalize_arabic("إِيَّاكَ هُدًى ٱلصَّلَوٰةَ"), "ايك هدي الصله")
+        for uthmani, standard in (("رَبِّ ٱلْعَٰلَمِينَ", "رب العالمين"), ("ٱلصَّلَوٰةَ", "الصلاة"),
+                                  ("مُوسَىٰ", "موسى"), ("ٱلتَّوْرَىٰةَ", "التوراة")):
+            self.assertEqual(normalize_arabic(uthmani), normalize_arabic(standard))
+        self.assertEqual(normalize_arabic("Mercy"), "Mercy")
+    
+    def test_substring(self):
+        """Test substring queries with and without tashkeel or Uthmani spelling."""
+        self.assertEqual(self.index.find("الرحمن الرحيم"), [1])
+        self.assertEqual(self.index.find("ٱلرَّحِيمِ"), [1])
+        self.assertEqual(self.index.find("اياك"), [5])
+        self.assertEqual(self.index.find("ال"), [1, 2, 8, 10])
+        self.assertEqual(self.index.find("الصلاة"), [10])
+        self.assertEqual(self.index.find("رب العالمين"), [2])
+        self.assertEqual(self.index.find("ذلك الكتاب"), [8])
+        self.assertEqual(self.index.find("بالغيب"), [10])
+    
+    def test_fuzzy(self):
+        """Test that a query differing by a letter still matches."""
+        self.assertEqual(self.index.search("رب العالمين")[0][0], 2)
+        self.assertEqual(self.index.search("يقيمون الصلاه")[0][0], 10)
+        self.assertEqual(self.index.search("كلمة غريبة"), [])
+    
+    def test_verse_manager_search(self):
+        """Test that VerseManager indexes fetched Arabic text."""
+        verse_manager = VerseManager(MagicMock(corpus_store=None))
+        verse_manager._format_verse([{"number": 1, "text": self.TEXTS[0][1],
+                                      "edition": {"identifier": "quran-uthmani"}}])
+        
+        self.assertEqual(verse_manager.search_arabic("بسم الله"), [1])
+        self.assertEqual(verse_manager.search_arabic("بسم اللة", fuzzy=True), [1])
+        self.assertEqual(verse_manager.search("الله"), [1])
+        self.assertEqual(verse_manager.search("الرحمان"), [1])
+
+
+class TestVerse(unittest.TestCase):
+    """Test cases for the compact verse type."""
+    
+    def _verse_data(self, number, ayah):
+        """Build API verse data for an ayah of Al-Baqarah."""
+        surah = {"number": 2, "name": "سورة البقرة", "englishName": "Al-Baqarah"}
+        return [
+            {"number": number, "text": f"arabic {ayah}", "numberInSurah": ayah,
+             "surah": dict(surah), "edition": {"identifier": "quran-uthmani"}},
+            {"number": number, "text": f"translation {ayah}", "numberInSurah": ayah,
+             "surah": dict(surah), "edition": {"identifier": "en.asad"}}
+        ]
+    
+    def test_dict_compatible(self):
+        """Test that a Verse reads like the nested dict form."""
+        verse = Verse.from_api(self._verse_data(262, 255))
+        
+        self.assertEqual(verse["text"]["arabic"], "arabic 255")
+        self.assertEqual(verse["text"]["translation"], "translation 255")
+        self.assertEqual(verse["surah"]["englishName"], "Al-Baqarah")
+        self.assertEqual(verse["reference"], "2:255")
+        self.assertIsNone(verse["audio"]["url"])
+        self.assertEqual(verse.get("missing", "default"), "default")
+        self.assertEqual(set(verse.keys()), {"number", "surah", "text", "audio", "reference"})
+        self.assertEqual(Verse.from_dict(verse.to_dict()), verse)
+        self.assertFalse(hasattr(verse, "__dict__"))
+    
+    def test_surah_info_is_shared(self):
+        """Test that verses of one surah share a single surah record."""
+        first = Verse.from_api(self._verse_data(262, 255))
+        second = Verse.from_api(self._verse_data(263, 256))
+        
+        self.assertIs(first.surah, second.surah)
+        self.assertIs(SurahInfo.intern(2, "سورة البقرة", "Al-Baqarah"), first.surah)
+    
+    def test_formatted_text(self):
+        """Test that VerseManager formats Verse objects."""
+        verse_manager = VerseManager(MagicMock(corpus_store=None))
+        verse = verse_manager._format_verse(self._verse_data(262, 255))
+        
+        self.assertIsInstance(verse, Verse)
+        self.assertEqual(verse_manager.get_formatted_verse_text(verse),
+                         "﴾ arabic 255 ﴿\n\ntranslation 255\n\n— Surah Al-Baqarah (2:255)")
+
+
+class TestVerseHistory(unittest.TestCase):
+    """Test cases for the persistent verse history."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.temp_dir.name, "history.jsonl")
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        self.temp_dir.cleanup()
+    
+    def _verse(self, number):
+        """Build a formatted verse."""
+        return Verse(number, SurahInfo.intern(2, "سورة البقرة", "Al-Baqarah"), number - 7,
+                     f"arabic {number}", f"translation {number}")
+    
+    def test_bounded(self):
+        """Test that only the newest entries are kept."""
+        history = VerseHistory(max_size=3)
+        for number in range(10, 15):
+            history.add(self._verse(number))
+        
+        self.assertEqual([verse.number for verse in history], [12, 13, 14])
+    
+    def test_navigation(self):
+        """Test moving back and forward through the history."""
+        history = VerseHistory(max_size=10)
+        for number in range(10, 13):
+            history.add(self._verse(number))
+        
+        self.assertIsNone(history.forward())
+        self.assertEqual(history.back().number, 11)
+        self.assertEqual(history.back().number, 10)
+        self.assertIsNone(history.back())
+        self.assertEqual(history.forward().number, 11)
+        self.assertTrue(history.can_go_forward())
+        self.assertEqual(history.forward().number, 12)
+        self.assertFalse(history.can_go_forward())
+        
+        history.back()
+        history.add(self._verse(13))
+        self.assertEqual(history.current().number, 13)
+        self.assertFalse(history.can_go_forward())
+    
+    def test_persistence_and_compaction(self):
+        """Test that the log survives restarts and is compacted."""
+        history = VerseHistory(max_size=5, log_path=self.log_path)
+        for number in range(10, 30):
+            history.add(self._verse(number))
+        history.close()
+        
+        with open(self.log_path, encoding="utf-8") as f:
+            self.assertLessEqual(len(f.readlines()), 10)
+        self.assertGreater(history.compactions, 0)
+        
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write('{"number": 30, "surah"')
+        
+        restored = VerseHistory(max_size=5, log_path=self.log_path)
+        self.assertEqual([verse.number for verse in restored], [25, 26, 27, 28, 29])
+        self.assertEqual(restored.current()["reference"], "2:22")
+        self.assertEqual(restored.current()["text"]["arabic"], "arabic 29")
+        restored.close()
+    
+    def test_verse_manager_navigation(self):
+        """Test that VerseManager navigation changes the current verse without recording it."""
+        verse_manager = VerseManager(MagicMock(corpus_store=None), history=VerseHistory(max_size=10))
+        for number in range(10, 13):
+            verse_manager.set_current_verse(self._verse(number))
+        
+        self.assertEqual(verse_manager.previous_verse().number, 11)
+        self.assertEqual(verse_manager.current_verse.number, 11)
+        self.assertEqual(verse_manager.next_verse().number, 12)
+        self.assertEqual(len(verse_manager.get_verse_history()), 3)
+        
+        verse_manager.clear_history()
+        self.assertEqual(verse_manager.get_verse_history(), [])
+
+
+class TestCorpusStore(unittest.TestCase):
+    """Test cases for the offline Corpus Store."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = CorpusStore(os.path.join(self.temp_dir.name, "corpus.db"))
+        for identifier in ("quran-uthmani", "en.asad"):
+            self.store.add_edition(*make_edition_surahs(identifier))
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        self.store.close()
+        self.temp_dir.cleanup()
+    
+    def test_list_and_remove_editions(self):
+        """Test listing and removing installed editions."""
+        identifiers = {edition["identifier"] for edition in self.store.list_editions()}
+        self.assertEqual(identifiers, {"quran-uthmani", "en.asad"})
+        
+        self.assertTrue(self.store.remove_edition("en.asad"))
+        self.assertFalse(self.store.has_edition("en.asad"))
+        self.assertFalse(self.store.remove_edition("en.asad"))
+    
+    def test_incomplete_edition_rejected(self):
+        """Test that an edition with missing ayahs is rejected."""
+        edition, surahs = make_edition_surahs("en.sahih", [7, 286])
+        with self.assertRaises(ValueError):
+            self.store.add_edition(edition, surahs)
+        self.assertFalse(self.store.has_edition("en.sahih"))
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_api_service_serves_installed_editions(self, mock_get):
+        """Test that installed editions are served without network access."""
+        api_service = APIService(corpus_store=self.store)
+        
+        verse = api_service.get_specific_verse("2:255", "quran-uthmani,en.asad")
+        
+        self.assertEqual(verse[0]["number"], 262)
+        self.assertEqual(verse[0]["text"], "quran-uthmani 2:255")
+        self.assertEqual(verse[1]["edition"]["identifier"], "en.asad")
+        self.assertEqual(verse[0]["surah"]["numberOfAyahs"], 286)
+        self.assertEqual(api_service.get_specific_verse("262", "quran-uthmani,en.asad"), verse)
+        mock_get.assert_not_called()
+    
+    def test_lookups_do_not_wait_for_a_slow_install(self):
+        """Test that reads are served while an edition is still being written."""
+        edition, surahs = make_edition_surahs("en.sahih")
+        halfway = threading.Event()
+        resume = threading.Event()
+        
+        def slow_records():
+            for surah in surahs:
+                if surah["number"] == 57:
+                    halfway.set()
+                    resume.wait(5)
+                for ayah in surah["ayahs"]:
+                    yield surah, ayah
+        
+        installer = threading.Thread(target=self.store.add_ayahs, args=(edition, slow_records()))
+        installer.start()
+        self.assertTrue(halfway.wait(5))
+        
+        start = time.monotonic()
+        self.assertFalse(self.store.has_edition("en.sahih"))
+        self.assertEqual(self.store.get_ayah("1:1", ["en.asad"])[0]["text"], "en.asad 1:1")
+        self.assertLess(time.monotonic() - start, 1.0)
+        
+        resume.set()
+        installer.join(5)
+        self.assertTrue(self.store.has_edition("en.sahih"))
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_install_edition_streams_response(self, mock_get):
+        """Test that a downloaded edition is parsed and stored while it streams."""
+        edition, surahs = make_edition_surahs("en.sahih")
+        body = json.dumps({"code": 200, "status": "OK",
+                           "data": {"surahs": surahs, "edition": edition}}).encode("utf-8")
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Length": str(len(body))}
+        mock_response.iter_content.return_value = (body[i:i + 4096] for i in range(0, len(body), 4096))
+        mock_get.return_value = mock_response
+        api_service = APIService(corpus_store=self.store)
+        api_service._rate_limit = lambda deadline=None: True
+        
+        self.assertTrue(api_service.install_edition("en.sahih"))
+        
+        self.assertTrue(mock_get.call_args.kwargs["stream"])
+        mock_response.json.assert_not_called()
+        mock_response.close.assert_called_once()
+        self.assertEqual(self.store.get_ayah("2:255", ["en.sahih"])[0]["text"], "en.sahih 2:255")
+        self.assertEqual(self.store.list_editions()[-1]["direction"], "ltr")
+
+
+class TestTanzilImporter(unittest.TestCase):
+    """Test cases for importing Tanzil files into the Corpus Store."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = CorpusStore(os.path.join(self.temp_dir.name, "corpus.db"))
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        self.store.close()
+        self.temp_dir.cleanup()
+    
+    def write_file(self, name, content):
+        """Write a file into the temporary directory and return its path."""
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+    
+    def write_xml(self, skip=None):
+        """Write a Tanzil XML edition, optionally leaving out one ayah."""
+        lines = ['<?xml version="1.0" encoding="utf-8" ?>', "<quran>"]
+        for surah, length in enumerate(SURAH_LENGTHS, start=1):
+            lines.append(f'<sura index="{surah}" name="سورة {surah}">')
+            lines.extend(f'<aya index="{ayah}" text="آية {surah}:{ayah}" />'
+                         for ayah in range(1, length + 1) if (surah, ayah) != skip)
+            lines.append("</sura>")
+        lines.append("</quran>")
+        return self.write_file("quran-simple.xml", "\n".join(lines))
+    
+    def test_import_text_file(self):
+        """Test importing a numbered text file and indexing it."""
+        lines = [f"{surah}|{ayah}|verse {surah} {ayah} patience"
+                 for surah, length in enumerate(SURAH_LENGTHS, start=1)
+                 for ayah in range(1, length + 1)]
+        path = self.write_file("en.sahih.txt", "\n".join(lines) + "\n\n# License footer\n")
+        search_index = SearchIndex()
+        
+        count = import_edition(self.store, path, make_edition("en.sahih"), search_index=search_index)
+        
+        self.assertEqual(count, TOTAL_VERSES)
+        ayah = self.store.get_ayah("2:255", ["en.sahih"])[0]
+        self.assertEqual(ayah["number"], 262)
+        self.assertEqual(ayah["text"], "verse 2 255 patience")
+        self.assertEqual(ayah["juz"], 3)
+        self.assertEqual(ayah["edition"]["direction"], "ltr")
+        self.assertTrue(search_index.has_edition("en.sahih"))
+    
+    def test_incomplete_file_rejected(self):
+        """Test that a file with a missing ayah leaves the store unchanged."""
+        path = self.write_xml(skip=(2, 10))
+        
+        with self.assertRaises(ValueError):
+            import_edition(self.store, path, make_edition("quran-simple"))
+        self.assertFalse(self.store.has_edition("quran-simple"))
+        self.assertIsNone(self.store.get_division_starts())
+    
+    def test_failed_import_leaves_indexes_untouched(self):
+        """Test that only a committed import is added to the search indexes."""
+        search_index = SearchIndex()
+        arabic_index = NGramIndex()
+        
+        with self.assertRaises(ValueError):
+            import_edition(self.store, self.write_xml(skip=(2, 10)), make_edition("quran-simple"),
+                           search_index=search_index, arabic_index=arabic_index)
+        self.assertFalse(search_index.has_edition("quran-simple", complete=False))
+        self.assertEqual(arabic_index.stats()["verses"], 0)
+        
+        lines = [f"{surah}|{ayah}|fixed {surah} {ayah}"
+                 for surah, length in enumerate(SURAH_LENGTHS, start=1)
+                 for ayah in range(1, length + 1)]
+        path = self.write_file("quran-simple.txt", "\n".join(lines))
+        import_edition(self.store, path, make_edition("quran-simple"),
+                       search_index=search_index, arabic_index=arabic_index)
+        
+        self.assertTrue(search_index.has_edition("quran-simple"))
+        self.assertEqual(search_index.search("fixed", limit=1)[0][0], 1)
+        self.assertEqual(arabic_index.stats()["verses"], TOTAL_VERSES)
+        self.assertEqual(arabic_index.find("آية"), [])
+    
+    @patch('src.http_transport.requests.Session.get')
+    def test_missing_divisions_are_fetched(self, mock_get):
+        """Test that divisions an import lacks are completed from /meta and stored."""
+        import_edition(self.store, self.write_xml(), make_edition("quran-simple"))
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"code": 200, "status": "OK", "data": {
+            "pages": {"references": [{"surah": 1, "ayah": 1}, {"surah": 2, "ayah": 1}]}
+        }}
+        mock_get.return_value = mock_response
+        api_service = APIService(corpus_store=self.store,
+                                 rate_limiter=TokenBucketRateLimiter(rate=1000.0, burst=10))
+        
+        self.assertEqual(api_service.get_metadata().division_of("page", "2:5"), 2)
+        mock_get.assert_called_once()
+        self.assertTrue(mock_get.call_args[0][0].endswith("/meta"))
+        self.assertEqual(self.store.get_division_starts()["page"], [1, 8])
+        self.assertEqual(self.store.get_ayah("2:5", ["quran-simple"])[0]["page"], 2)
+    
+    def test_import_xml_with_metadata(self):
+        """Test importing an XML file with Tanzil's surah and division data."""
+        metadata_path = self.write_file("quran-data.xml", "\n".join([
+            "<quran>", "<suras>",
+            *(f'<sura index="{surah}" ayas="{length}" name="سورة {surah}" tname="Surah-{surah}" '
+              f'ename="Chapter {surah}" type="Meccan" />'
+              for surah, length in enumerate(SURAH_LENGTHS, start=1)),
+            "</suras>",
+            '<pages><page index="1" sura="1" aya="1" /><page index="2" sura="2" aya="1" /></pages>',
+            '<sajdas><sajda index="1" sura="7" aya="206" type="recommended" /></sajdas>',
+            "</quran>"
+        ]))
+        
+        import_edition(self.store, self.write_xml(), make_edition("quran-simple"), metadata_path)
+        
+        ayah = self.store.get_ayah("7:206", ["quran-simple"])[0]
+        self.assertEqual(ayah["text"], "آية 7:206")
+        self.assertEqual(ayah["surah"]["englishName"], "Surah-7")
+        self.assertEqual(ayah["page"], 2)
+        self.assertTrue(ayah["sajda"])
+        self.assertEqual(self.store.get_division_starts()["page"], [1, 8])
+        
+        # Installing an API edition fills in missing data without replacing it
+        self.store.add_edition(*make_edition_surahs("en.asad"))
+        ayah = self.store.get_ayah("7:206", ["quran-simple"])[0]
+        self.assertEqual(ayah["page"], 2)
+        self.assertEqual(ayah["ruku"], 1)
+
+
+class TestVersePrefetcher(unittest.TestCase):
+    """Test cases for the background verse prefetcher."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.verse_manager = MagicMock()
+        self.drawn = []
+        
+        def fetch_random_verse(translation):
+            self.drawn.append(len(self.drawn) + 1)
+            return {"number": self.drawn[-1], "translation": translation}
+        
+        self.verse_manager.fetch_random_verse.side_effect = fetch_random_verse
+        self.verse_manager.fetch_specific_verse.side_effect = (
+            lambda number, translation: {"number": number, "translation": translation}
+        )
+        self.prefetcher = VersePrefetcher(self.verse_manager, "en.asad", size=3)
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        self.prefetcher.stop()
+    
+    def _wait_until_full(self):
+        """Wait for the worker to fill the buffer."""
+        deadline = time.time() + 2
+        while self.prefetcher.stats()["buffered"] < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.prefetcher.stats()["buffered"], 3)
+    
+    def test_buffer_is_filled_and_served(self):
+        """Test that verses are buffered in the background and served."""
+        self.assertIsNone(self.prefetcher.get())
+        self.prefetcher.start()
+        self._wait_until_full()
+        
+        self.assertEqual(self.prefetcher.get(), {"number": 1, "translation": "en.asad"})
+        self.assertEqual(self.prefetcher.stats()["served"], 1)
+    
+    def test_translation_change_rebuilds_buffer(self):
+        """Test that changing the translation refetches the drawn verses in it."""
+        self.prefetcher.start()
+        self._wait_until_full()
+        
+        self.prefetcher.set_translation("en.sahih")
+        self._wait_until_full()
+        
+        verses = [self.prefetcher.get() for _ in range(3)]
+        self.assertEqual([verse["translation"] for verse in verses], ["en.sahih"] * 3)
+        self.assertEqual(sorted(verse["number"] for verse in verses), [1, 2, 3])
+
+
+class FakeRoot:
+    """Stand-in for tk.Tk that runs after() callbacks on demand."""
+    
+    def __init__(self):
+        self.callbacks = []
+    
+    def after(self, delay, callback):
+        self.callbacks.append(callback)
+    
+    def run_until_idle(self, timeout=2.0):
+        """Run scheduled callbacks until none are left."""
+        deadline = time.time() + timeout
+        while self.callbacks and time.time() < deadline:
+            callback = self.callbacks.pop(0)
+            callback()
+            time.sleep(0.005)
+
+
+class TestUITaskRunner(unittest.TestCase):
+    """Test cases for the UI task runner."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.root = FakeRoot()
+        self.pending_states = []
+        self.runner = UITaskRunner(self.root, on_pending_changed=self.pending_states.append)
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        self.runner.shutdown()
+    
+    def test_result_delivered_through_after(self):
+        """Test that results reach the callback via the Tk event loop."""
+        results = []
+        self.runner.submit("verse", lambda: "verse 1", results.append)
+        
+        self.assertEqual(results, [])
+        self.root.run_until_idle()
+        
+        self.assertEqual(results, ["verse 1"])
+        self.assertEqual(self.pending_states, [True, False])
+        self.assertEqual(self.runner.latency_stats("verse")["count"], 1)
+    
+    def test_newer_task_supersedes_older(self):
+        """Test that only the latest task on a channel is rendered."""
+        release = threading.Event()
+        results = []
+        self.runner.submit("verse", lambda: release.wait(2) and "old", results.append)
+        self.runner.submit("verse", lambda: "new", results.append)
+        release.set()
+        
+        self.root.run_until_idle()
+        time.sleep(0.05)
+        self.root.run_until_idle()
+        
+        self.assertEqual(results, ["new"])
+        self.assertEqual(self.runner.cancelled_tasks, 1)
+    
+    def test_errors_go_to_error_callback(self):
+        """Test that worker exceptions are delivered to on_error."""
+        errors = []
+        self.runner.submit("verse", lambda: 1 / 0, None, on_error=errors.append)
+        self.root.run_until_idle()
+        
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+
+
 class TestConfigManager(unittest.TestCase):
     """Test cases for the Configuration Manager."""
     
@@ -221,6 +1890,7 @@ class TestConfigManager(unittest.TestCase):
     def tearDown(self):
         """Clean up after tests."""
         # Remove test config file
+        self.config_manager.close()
         if os.path.exists("test_config.json"):
             os.remove("test_config.json")
     
@@ -268,6 +1938,40 @@ class TestConfigManager(unittest.TestCase):
         # Disable advanced mode
         self.assertTrue(self.config_manager.disable_advanced_mode())
         self.assertFalse(self.config_manager.is_advanced_mode_enabled())
+    
+    def test_saves_are_coalesced(self):
+        """Test that a burst of updates is written to disk once."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "config.json")
+            manager = ConfigurationManager(path, save_delay=0.05)
+            
+            for size in ("small", "medium", "large"):
+                self.assertTrue(manager.update_config({"fontSize": size}))
+            
+            self.assertFalse(os.path.exists(path))
+            time.sleep(0.3)
+            
+            stats = manager.get_persistence_stats()
+            self.assertEqual(stats["save_requests"], 3)
+            self.assertEqual(stats["disk_writes"], 1)
+            self.assertEqual(stats["writes_avoided"], 2)
+            self.assertFalse(stats["pending"])
+            self.assertEqual(ConfigurationManager(path).get_config()["fontSize"], "large")
+    
+    def test_close_flushes_atomically(self):
+        """Test that close writes pending changes without leaving temp files."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "config.json")
+            manager = ConfigurationManager(path, save_delay=60)
+            manager.update_config({"theme": "dark"})
+            
+            self.assertTrue(manager.close())
+            self.assertEqual(os.listdir(temp_dir), ["config.json"])
+            self.assertEqual(ConfigurationManager(path).get_config()["theme"], "dark")
+            
+            # Nothing pending, so closing again does not write
+            manager.close()
+            self.assertEqual(manager.get_persistence_stats()["disk_writes"], 1)
 
 
 def run_tests():